@@ -0,0 +1,327 @@
+import argparse
+import json
+import math
+import os
+import struct
+import subprocess
+import sys
+import time
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from decimal import localcontext
+from functools import lru_cache
+
+import numba
+import numpy as np
+
+from deep_zoom import DEEP_ZOOM_THRESHOLD, FRACTAL_KINDS, deep_precision, render_deep, to_decimal
+# O gerador só carrega o matplotlib ao abrir a interface
+from precision import choose_precision, render_tiered
+from scriptSuperOtimizado import (antialias_turbo, build_colormap, colormap_to_uint8,
+                                  distance_turbo, interior_turbo, iterations_for_zoom,
+                                  smooth_color_turbo)
+
+# Extensões entregues ao ffmpeg como vídeo; qualquer outro caminho vira pasta de PNGs
+VIDEO_EXTENSIONS = ('.mp4', '.mkv', '.webm', '.mov', '.avi')
+
+
+def load_keyframes(path):
+    """Lê o caminho de keyframes de um JSON
+
+    Formato: {"fractal_type": ..., "color_scheme": ..., "julia_c": [re, im],
+    "keyframes": [{"center": ["-0.74", "0.13"], "zoom": 1.0, "t": 0.0}, ...]}.
+    Centros podem ser strings para zoom profundo; fractal_type e color_scheme
+    podem ser redefinidos por keyframe e valem até o keyframe seguinte. "t"
+    (opcional, em segundos) posiciona os keyframes; sem ele ficam equidistantes.
+    """
+    with open(path) as f:
+        spec = json.load(f)
+
+    keyframes = spec['keyframes']
+    if len(keyframes) < 2:
+        raise ValueError("O caminho precisa de ao menos dois keyframes")
+
+    fractal_type = spec.get('fractal_type', 'mandelbrot')
+    color_scheme = spec.get('color_scheme', 0)
+    path_keys = []
+    for i, key in enumerate(keyframes):
+        fractal_type = key.get('fractal_type', fractal_type)
+        color_scheme = key.get('color_scheme', color_scheme)
+        if fractal_type not in FRACTAL_KINDS:
+            raise ValueError(f"Tipo de fractal desconhecido: {fractal_type}")
+        path_keys.append({
+            'center': (to_decimal(key['center'][0]), to_decimal(key['center'][1])),
+            'zoom': float(key['zoom']),
+            't': float(key.get('t', i)),
+            'fractal_type': fractal_type,
+            'color_scheme': int(color_scheme),
+        })
+
+    t0, t1 = path_keys[0]['t'], path_keys[-1]['t']
+    if any(b['t'] <= a['t'] for a, b in zip(path_keys, path_keys[1:])):
+        raise ValueError("Os tempos dos keyframes precisam ser crescentes")
+    for key in path_keys:
+        key['t'] = (key['t'] - t0) / (t1 - t0)
+
+    return path_keys, tuple(spec.get('julia_c', (-0.8, 0.156)))
+
+
+def interpolate_path(keyframes, position):
+    """Centro, zoom e keyframe de origem na posição [0, 1] do caminho
+
+    O zoom é interpolado em escala logarítmica; o centro anda na mesma
+    proporção em que a janela encolhe, então o alvo fica parado na tela.
+    """
+    seg = 0
+    while seg < len(keyframes) - 2 and position > keyframes[seg + 1]['t']:
+        seg += 1
+    a, b = keyframes[seg], keyframes[seg + 1]
+    t = min(1.0, max(0.0, (position - a['t']) / (b['t'] - a['t'])))
+
+    zoom = a['zoom'] * (b['zoom'] / a['zoom']) ** t
+    if a['zoom'] == b['zoom']:
+        u = t
+    else:
+        u = (1.0 - a['zoom'] / zoom) / (1.0 - a['zoom'] / b['zoom'])
+
+    with localcontext() as ctx:
+        ctx.prec = deep_precision(max(a['zoom'], b['zoom']))
+        weight = to_decimal(u)
+        cx = a['center'][0] + (b['center'][0] - a['center'][0]) * weight
+        cy = a['center'][1] + (b['center'][1] - a['center'][1]) * weight
+    return (cx, cy), zoom, a
+
+
+def plan_frames(keyframes, n_frames, julia_c, width, height, max_iter=None, interior=False,
+                antialias=False):
+    """Gera os pedidos de render (um por frame), em ordem"""
+    for index in range(n_frames):
+        position = index / (n_frames - 1) if n_frames > 1 else 0.0
+        (cx, cy), zoom, key = interpolate_path(keyframes, position)
+        yield {
+            'index': index,
+            'fractal_type': key['fractal_type'],
+            'color_scheme': key['color_scheme'],
+            'julia_c': julia_c,
+            'center': (str(cx), str(cy)),
+            'zoom': zoom,
+            'max_iter': max_iter or iterations_for_zoom(zoom),
+            'width': width,
+            'height': height,
+            'interior': interior,
+            'antialias': antialias,
+        }
+
+
+@lru_cache(maxsize=None)
+def _colormap(color_scheme):
+    """Colormap do gerador em float (kernel suave) e em uint8 (contagens inteiras)"""
+    colormap = build_colormap(color_scheme)
+    return colormap, colormap_to_uint8(colormap)
+
+
+# Buffer RGB reaproveitado entre os frames de cada worker
+_frame_buffers = {}
+
+
+def _frame_bounds(job):
+    """(x_min, x_max, y_min, y_max) com pixels quadrados: 4/zoom na horizontal"""
+    cx, cy = job['center']
+    half_w = 2.0 / job['zoom']
+    half_h = half_w * job['height'] / job['width']
+    return float(cx) - half_w, float(cx) + half_w, float(cy) - half_h, float(cy) + half_h
+
+
+def render_iterations(job):
+    """Iterações de um frame com pixels quadrados (deep zoom quando preciso)"""
+    fractal_type = job['fractal_type']
+    h, w, max_iter, zoom = job['height'], job['width'], job['max_iter'], job['zoom']
+    cx, cy = job['center']
+    cr, ci = job['julia_c'] if fractal_type == 'julia' else (0.0, 0.0)
+
+    if zoom >= DEEP_ZOOM_THRESHOLD:
+        iterations, _ = render_deep(fractal_type, h, w, max_iter, cx, cy, zoom,
+                                    julia_c=(cr, ci), square_pixels=True)
+        return iterations
+
+    # 'tier' fixa a aritmética (partes de uma imagem maior usam a mesma)
+    tier = job.get('tier') or choose_precision(4.0 / zoom / w, max(abs(float(cx)), abs(float(cy))))
+    if job['interior'] and tier == 'float64':
+        # A detecção de interior é float64: além dele fica o double-double
+        iterations, _ = interior_turbo(h, w, max_iter, *_frame_bounds(job),
+                                       FRACTAL_KINDS[fractal_type], cr, ci)
+        return iterations
+    iterations, _ = render_tiered(h, w, max_iter, cx, cy, zoom, FRACTAL_KINDS[fractal_type],
+                                  cr, ci, square_pixels=True, tier=tier)
+    return iterations
+
+
+def render_frame_rgb(job):
+    """Frame colorido em uint8 (altura x largura x 3)
+
+    Fora do zoom profundo e do double-double, a coloração suave (ou o
+    antialias por distância) é fundida ao kernel e escreve direto no buffer
+    do worker; a detecção de interior fica no caminho das contagens.
+    """
+    colormap, colormap_rgb = _colormap(job['color_scheme'])
+    h, w, zoom = job['height'], job['width'], job['zoom']
+    cx, cy = job['center']
+    # Os kernels fundidos são float64: além deles fica o caminho double-double
+    fused_precision = choose_precision(4.0 / zoom / w, max(abs(float(cx)), abs(float(cy))))
+    fused = zoom < DEEP_ZOOM_THRESHOLD and fused_precision != 'double-double'
+    if fused and (job['antialias'] or not job['interior']):
+        out = _frame_buffers.get((h, w))
+        if out is None:
+            out = _frame_buffers[(h, w)] = np.empty((h, w, 3), dtype=np.uint8)
+        cr, ci = job['julia_c'] if job['fractal_type'] == 'julia' else (0.0, 0.0)
+        kind = FRACTAL_KINDS[job['fractal_type']]
+        if job['antialias']:
+            mu, distance = distance_turbo(h, w, job['max_iter'], *_frame_bounds(job), kind, cr, ci)
+            antialias_turbo(out, mu, distance, job['max_iter'], *_frame_bounds(job), kind,
+                            colormap, cr, ci)
+        else:
+            smooth_color_turbo(out, job['max_iter'], *_frame_bounds(job), kind, colormap, cr, ci)
+        return out
+
+    iterations = render_iterations(job)
+    normalized = np.clip((iterations * (255.0 / job['max_iter'])).astype(np.int32), 0, 255)
+    return colormap_rgb[normalized]
+
+
+def png_chunk(tag, data):
+    """Chunk PNG: tamanho, tipo, dados e CRC"""
+    return (struct.pack('>I', len(data)) + tag + data
+            + struct.pack('>I', zlib.crc32(tag + data) & 0xFFFFFFFF))
+
+
+def png_header(width, height):
+    """Assinatura e IHDR de um PNG RGB de 8 bits"""
+    return b'\x89PNG\r\n\x1a\n' + png_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+
+
+def png_rows(rgb):
+    """Linhas RGB com o byte de filtro 0 na frente (dados do IDAT antes do zlib)"""
+    h, w, _ = rgb.shape
+    rows = np.zeros((h, 1 + w * 3), dtype=np.uint8)
+    rows[:, 1:] = rgb.reshape(h, w * 3)
+    return rows.tobytes()
+
+
+def encode_png(rgb):
+    """PNG RGB de 8 bits sem dependências além do zlib"""
+    h, w, _ = rgb.shape
+    return (png_header(w, h)
+            + png_chunk(b'IDAT', zlib.compress(png_rows(rgb), 6))
+            + png_chunk(b'IEND', b''))
+
+
+def _render_job(job, png):
+    """Executado nos workers: devolve (índice, frame já codificado em PNG ou RGB cru)"""
+    rgb = render_frame_rgb(job)
+    return job['index'], encode_png(rgb) if png else rgb.tobytes()
+
+
+def _init_worker(numba_threads):
+    """Limita as threads do numba por processo para não disputar os núcleos"""
+    numba.set_num_threads(max(1, min(numba_threads, numba.config.NUMBA_NUM_THREADS)))
+
+
+def _open_sink(output, width, height, fps):
+    """Destino dos frames: pasta de PNGs, stdout em RGB cru ou ffmpeg"""
+    if output == '-':
+        return 'raw', sys.stdout.buffer, None
+    if output.lower().endswith(VIDEO_EXTENSIONS):
+        process = subprocess.Popen(
+            ['ffmpeg', '-y', '-loglevel', 'error',
+             '-f', 'rawvideo', '-pix_fmt', 'rgb24', '-s', f'{width}x{height}', '-r', str(fps),
+             '-i', '-', '-pix_fmt', 'yuv420p', output],
+            stdin=subprocess.PIPE)
+        return 'raw', process.stdin, process
+    os.makedirs(output, exist_ok=True)
+    return 'png', output, None
+
+
+def render_batch(jobs, output, width, height, fps=30, workers=None, numba_threads=1):
+    """Renderiza os frames num pool de processos e grava em ordem
+
+    No máximo 2 frames por worker ficam em voo, então a memória não cresce
+    com o tamanho do vídeo. Retorna (frames, segundos).
+    """
+    workers = workers or os.cpu_count() or 1
+    mode, sink, process = _open_sink(output, width, height, fps)
+    png = mode == 'png'
+    pending = deque()
+    frames = 0
+    start = time.time()
+
+    def write(future):
+        nonlocal frames
+        index, data = future.result()
+        if png:
+            with open(os.path.join(sink, f'frame_{index:06d}.png'), 'wb') as f:
+                f.write(data)
+        else:
+            sink.write(data)
+        frames += 1
+        if frames % 10 == 0:
+            elapsed = time.time() - start
+            print(f"🎞️ {frames} frames | {frames / elapsed:.2f} frames/s", file=sys.stderr)
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(numba_threads,)) as pool:
+            for job in jobs:
+                pending.append(pool.submit(_render_job, job, png))
+                if len(pending) >= 2 * workers:
+                    write(pending.popleft())
+            while pending:
+                write(pending.popleft())
+    finally:
+        if process is not None:
+            sink.close()
+            process.wait()
+        elif not png:
+            sink.flush()
+
+    return frames, time.time() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Render em lote (headless) de vídeos de zoom a partir de keyframes")
+    parser.add_argument('keyframes', help="JSON com o caminho de keyframes")
+    parser.add_argument('-o', '--output', default='frames',
+                        help="pasta de PNGs, arquivo de vídeo (via ffmpeg) ou '-' para RGB cru no stdout")
+    parser.add_argument('-n', '--frames', type=int, default=None,
+                        help="total de frames (padrão: duração x fps)")
+    parser.add_argument('--seconds', type=float, default=10.0, help="duração do vídeo")
+    parser.add_argument('--fps', type=int, default=30)
+    parser.add_argument('--size', default='1920x1080', help="LARGURAxALTURA")
+    parser.add_argument('--max-iter', type=int, default=None,
+                        help="iterações fixas (padrão: cresce com o zoom)")
+    parser.add_argument('--interior', action='store_true',
+                        help="detecção de interior (cardioide/bulbo + ciclos)")
+    parser.add_argument('--antialias', action='store_true',
+                        help="superamostra os pixels de borda (estimativa de distância)")
+    parser.add_argument('-j', '--workers', type=int, default=None, help="processos de render")
+    parser.add_argument('--numba-threads', type=int, default=1,
+                        help="threads do numba por processo")
+    args = parser.parse_args(argv)
+
+    width, height = (int(v) for v in args.size.lower().split('x'))
+    n_frames = args.frames or max(1, round(args.seconds * args.fps))
+    keyframes, julia_c = load_keyframes(args.keyframes)
+    jobs = plan_frames(keyframes, n_frames, julia_c, width, height,
+                       max_iter=args.max_iter, interior=args.interior,
+                       antialias=args.antialias)
+
+    print(f"🎬 {n_frames} frames {width}x{height} -> {args.output}", file=sys.stderr)
+    frames, elapsed = render_batch(jobs, args.output, width, height, fps=args.fps,
+                                   workers=args.workers, numba_threads=args.numba_threads)
+    rate = frames / elapsed if elapsed > 0 else math.inf
+    print(f"✅ {frames} frames em {elapsed:.1f}s ({rate:.2f} frames/s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,467 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+# Os scripts importam matplotlib no topo; sem janela o backend Agg basta
+os.environ.setdefault('MPLBACKEND', 'Agg')
+
+import numba
+import numpy as np
+
+import numpy_engine
+import scriptOptimizado
+import scriptSuperOtimizado
+from deep_zoom import FRACTAL_KINDS
+from formulas import FORMULAS, MULTIBROT_DEGREE, escape_kernel
+from precision import TIER_MARGIN, render_tiered
+from script import FractalGenerator
+from symmetry import SYMMETRY, mirror_tiles, tile_mirror_plan
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_baseline.json')
+
+# Locais fixos: (centro x, centro y, zoom, parâmetro c do Julia)
+LOCATIONS = {
+    'home': (-0.5, 0.0, 1.0, (-0.8, 0.156)),
+    'seahorse': (-0.7453, 0.1127, 200.0, (-0.8, 0.156)),
+    'spiral': (-0.7269, 0.1889, 1000.0, (0.285, 0.01)),
+}
+RESOLUTIONS = (200, 400)
+MAX_ITERS = (100, 500)
+
+# Regressão de desempenho: queda de Mpixels/s acima desta fração falha
+DEFAULT_THRESHOLD = 0.2
+# Conferência com a referência (script.py): pixels com diferença acima de
+# ITER_TOLERANCE iterações podem ser no máximo PIXEL_TOLERANCE do frame
+ITER_TOLERANCE = 1
+PIXEL_TOLERANCE = 0.01
+CHECK_SIZE = 48
+CHECK_MAX_ITER = 100  # Da ordem do que o gerador usa no zoom raso
+# Julia com interior (coelho de Douady, ciclo atrator de período 3): o c dos
+# LOCATIONS fica fora do conjunto de Mandelbrot e o Julia dele não tem interior
+INTERIOR_JULIA_C = (-0.123, 0.745)
+
+
+def _bounds(location):
+    """(x_min, x_max, y_min, y_max) do local, janela quadrada de 4/zoom"""
+    cx, cy, zoom, _ = LOCATIONS[location]
+    return cx - 2.0 / zoom, cx + 2.0 / zoom, cy - 2.0 / zoom, cy + 2.0 / zoom
+
+
+def _tiered(tier):
+    """Kernel de precision.py com a aritmética fixa"""
+    def run(h, w, max_iter, x_min, x_max, y_min, y_max, kind, cr, ci):
+        zoom = 4.0 / (x_max - x_min)
+        return render_tiered(h, w, max_iter, (x_min + x_max) / 2, (y_min + y_max) / 2, zoom,
+                             kind, cr, ci, tier=tier)[0]
+    return run
+
+
+def _optimizado(h, w, max_iter, x_min, x_max, y_min, y_max, kind, cr, ci):
+    """Kernels numba seriais de scriptOptimizado.py"""
+    so = scriptOptimizado
+    if kind == 1:
+        return so.julia_set(h, w, max_iter, x_min, x_max, y_min, y_max, cr, ci)
+    kernel = {0: so.mandelbrot_set, 2: so.burning_ship_set, 3: so.tricorn_set}[kind]
+    return kernel(h, w, max_iter, x_min, x_max, y_min, y_max)
+
+
+def _turbo(h, w, max_iter, x_min, x_max, y_min, y_max, kind, cr, ci):
+    """Kernels paralelos com fastmath de scriptSuperOtimizado.py"""
+    ss = scriptSuperOtimizado
+    if kind == 1:
+        return ss.julia_turbo(h, w, max_iter, x_min, x_max, y_min, y_max, cr, ci)
+    kernel = {0: ss.mandelbrot_turbo, 2: ss.burning_ship_turbo, 3: ss.tricorn_turbo}[kind]
+    return kernel(h, w, max_iter, x_min, x_max, y_min, y_max)
+
+
+def _turbo_interior(h, w, max_iter, x_min, x_max, y_min, y_max, kind, cr, ci):
+    """Kernel com detecção de interior de scriptSuperOtimizado.py"""
+    return scriptSuperOtimizado.interior_turbo(h, w, max_iter, x_min, x_max, y_min, y_max,
+                                               kind, cr, ci)[0]
+
+
+def _generic(h, w, max_iter, x_min, x_max, y_min, y_max, kind, cr, ci):
+    """Família única de formulas.py: um kernel especializado por fórmula"""
+    formula = {value: name for name, value in FORMULAS.items()}[kind]
+    return escape_kernel(formula)(h, w, max_iter, x_min, x_max, y_min, y_max, cr, ci)
+
+
+def _escape(step, c, max_iter):
+    """Escape-time em Python puro para as fórmulas que script.py não tem"""
+    z = 0
+    for n in range(max_iter):
+        if abs(z) > 2:
+            return n
+        z = step(z) + c
+    return max_iter
+
+
+def reference_iterations(h, w, max_iter, x_min, x_max, y_min, y_max, kind, cr, ci):
+    """Referência em Python puro: os métodos por pixel de script.py na grade dos kernels"""
+    gen = FractalGenerator.__new__(FractalGenerator)  # Sem a aleatoriedade do __init__
+    gen.max_iter = max_iter
+    gen.julia_c = complex(cr, ci)
+    method = {
+        0: gen.mandelbrot, 1: gen.julia, 2: gen.burning_ship, 3: gen.tricorn,
+        4: lambda c: _escape(lambda z: complex(abs(z.real**2 - z.imag**2), 2 * z.real * z.imag),
+                             c, max_iter),
+        5: lambda c: _escape(lambda z: z**MULTIBROT_DEGREE, c, max_iter),
+    }[kind]
+    result = np.zeros((h, w), dtype=np.int32)
+    for i in range(h):
+        y = y_min + (y_max - y_min) * i / h
+        for j in range(w):
+            result[i, j] = method(complex(x_min + (x_max - x_min) * j / w, y))
+    return result
+
+
+# nome -> (kernel, maior frame medido); None mede todos os tamanhos
+KERNELS = {
+    'script.reference': (reference_iterations, 64 * 64),
+    'optimizado.numba': (_optimizado, None),
+    'optimizado.numpy': (numpy_engine.escape_time, None),
+    'super.turbo': (_turbo, None),
+    'super.interior': (_turbo_interior, None),
+    'precision.float64': (_tiered('float64'), None),
+    'precision.double-double': (_tiered('double-double'), 200 * 200),
+    'formulas.generic': (_generic, None),
+}
+
+# Tipos que cada kernel sabe calcular; os demais ficam nos quatro clássicos
+KERNEL_TYPES = {
+    'script.reference': tuple(FORMULAS),
+    'formulas.generic': tuple(FORMULAS),
+}
+
+
+def kernel_types(name):
+    """Tipos de fractal medidos e conferidos para o kernel"""
+    return KERNEL_TYPES.get(name, tuple(FRACTAL_KINDS))
+
+
+def benchmark_cases(quick=False):
+    """Casos medidos: todos os locais no Mandelbrot e os outros tipos em 'home'"""
+    resolutions = RESOLUTIONS[:1] if quick else RESOLUTIONS
+    max_iters = MAX_ITERS[:1] if quick else MAX_ITERS
+    cases = []
+    for size in resolutions:
+        for max_iter in max_iters:
+            for location in LOCATIONS:
+                cases.append(('mandelbrot', location, size, max_iter))
+            for fractal_type in FORMULAS:
+                if fractal_type != 'mandelbrot':
+                    cases.append((fractal_type, 'home', size, max_iter))
+    return cases
+
+
+def _call(kernel, fractal_type, location, size, max_iter):
+    """Executa um kernel num caso e devolve as iterações"""
+    cr, ci = LOCATIONS[location][3] if fractal_type == 'julia' else (0.0, 0.0)
+    return kernel(size, size, max_iter, *_bounds(location),
+                  FORMULAS[fractal_type], cr, ci)
+
+
+def compile_time(name):
+    """Primeira chamada de cada tipo num frame mínimo: quase só a compilação JIT
+
+    Só faz sentido antes de qualquer outro uso do kernel no processo.
+    Retorna (segundos, {'hits', 'misses'}): assinaturas carregadas do cache
+    em disco e compiladas do zero nessa primeira chamada.
+    """
+    kernel, _ = KERNELS[name]
+    hits, misses = scriptSuperOtimizado.kernel_cache_stats()
+    start = time.perf_counter()
+    for fractal_type in kernel_types(name):
+        kernel(8, 8, 1, *_bounds('home'), FORMULAS[fractal_type], 0.0, 0.0)
+    seconds = time.perf_counter() - start
+    new_hits, new_misses = scriptSuperOtimizado.kernel_cache_stats()
+    return seconds, {'hits': new_hits - hits, 'misses': new_misses - misses}
+
+
+def measure(name, fractal_type, location, size, max_iter, repeats=3):
+    """Mpixels/s, iterações/s e pico de memória de um caso"""
+    kernel, _ = KERNELS[name]
+
+    best = float('inf')
+    tracemalloc.start()
+    for _ in range(repeats):
+        start = time.perf_counter()
+        iterations = _call(kernel, fractal_type, location, size, max_iter)
+        best = min(best, time.perf_counter() - start)
+    # Pico das alocações rastreadas (NumPy/Python); arrays do numba contam
+    # pelo resultado devolvido
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    peak = max(peak, iterations.nbytes)
+
+    return {
+        'mpixels_s': size * size / best / 1e6,
+        'iterations_s': float(np.sum(iterations, dtype=np.int64)) / best,
+        'seconds': best,
+        'peak_mb': peak / 1024**2,
+    }
+
+
+def measure_display(size=400, frames=60):
+    """Custo só de apresentação (frame já pronto): redesenho completo x blitting
+
+    Figura no layout da interface do gerador (14x10 pol., imagem bilinear,
+    botões e textos). O caminho clássico é medido sem o sleep do plt.pause,
+    que soma mais 10ms por frame na interface.
+    """
+    import matplotlib.pyplot as plt
+    from matplotlib.widgets import Button
+    from display import BlitPresenter
+
+    rgb = np.random.default_rng(0).integers(0, 256, (4, size, size, 3), dtype=np.uint8)
+    results = {}
+    for mode in ('full', 'blit'):
+        fig, ax = plt.subplots(figsize=(14, 10))
+        im = ax.imshow(rgb[0], extent=[0, size, 0, size], interpolation='bilinear')
+        buttons = [Button(plt.axes([0.02, 0.88 - i*0.06, 0.08, 0.04]), f'B{i}') for i in range(5)]
+        for i in range(19):
+            fig.text(0.02, 0.59 - i*0.032, f'linha {i}')
+        fps = fig.text(0.55, 0.02, 'FPS')
+        presenter = BlitPresenter(fig, ax, im, overlays=[fps], blit=mode == 'blit')
+        fig.canvas.draw()
+
+        times = []
+        for n in range(frames):
+            start = time.perf_counter()
+            presenter.present(rgb[n % len(rgb)], pause=0)  # Agg: draw_idle desenha na hora
+            times.append(time.perf_counter() - start)
+        plt.close(fig)
+        del buttons
+        results[mode] = {'p50_ms': float(np.median(times)) * 1000.0,
+                         'mean_ms': float(np.mean(times)) * 1000.0}
+    return results
+
+
+def check_against_reference():
+    """Compara as iterações de cada kernel com script.py; devolve as falhas"""
+    failures = []
+    for fractal_type in FORMULAS:
+        for location in ('home', 'seahorse'):
+            expected = _call(reference_iterations, fractal_type, location, CHECK_SIZE, CHECK_MAX_ITER)
+            for name, (kernel, _) in KERNELS.items():
+                if name == 'script.reference' or fractal_type not in kernel_types(name):
+                    continue
+                got = _call(kernel, fractal_type, location, CHECK_SIZE, CHECK_MAX_ITER)
+                off = np.mean(np.abs(got.astype(np.int64) - expected) > ITER_TOLERANCE)
+                if off > PIXEL_TOLERANCE:
+                    failures.append(f"{name} {fractal_type}@{location}: {off:.1%} dos pixels divergem")
+    return failures
+
+
+def check_precision_transitions(size=200, max_iter=150):
+    """Na troca de tier os dois lados devem concordar (sem artefatos visíveis)"""
+    failures = []
+    # Zoom exato em que o espaçamento atinge o limite de cada troca
+    switches = (
+        ('float64', 'double-double', 4.0 / (TIER_MARGIN * np.finfo(np.float64).eps * 2.0) / size),
+    )
+    for low, high, zoom in switches:
+        for kind in range(4):
+            cx, cy, _, (cr, ci) = LOCATIONS['seahorse']
+            a, _ = render_tiered(size, size, max_iter, cx, cy, zoom, kind, cr, ci, tier=low)
+            b, _ = render_tiered(size, size, max_iter, cx, cy, zoom, kind, cr, ci, tier=high)
+            off = np.mean(np.abs(a.astype(np.int64) - b) > ITER_TOLERANCE)
+            if off > PIXEL_TOLERANCE:
+                failures.append(f"{low}->{high} tipo {kind}: {off:.1%} dos pixels divergem")
+    return failures
+
+
+def _tile_canvas(kind, tiles, tile, max_iter, mask, cr, ci, interior, smooth, state=None):
+    """Canvas de tiles x tiles tiles da janela 'home', centrado no eixo real
+
+    No Julia as colunas também ficam centradas na origem (simetria de ponto).
+    """
+    cx, _, zoom, _ = LOCATIONS['home']
+    spacing = 4.0 / zoom / (tiles * tile)
+    col0 = (0 if kind == 1 else round(cx / spacing)) - tiles * tile // 2
+    row0 = -tiles * tile // 2
+    canvas = np.zeros((tiles * tile, tiles * tile), dtype=np.int32)
+    ss = scriptSuperOtimizado
+    ss.tile_pass_turbo(canvas, mask, tile, col0, row0, spacing, max_iter, kind, cr, ci, 1, 0,
+                       interior=interior, smooth=smooth, state=state)
+    return canvas, row0, col0
+
+
+def check_symmetry(tiles=6, tile=32, max_iter=CHECK_MAX_ITER):
+    """Tiles espelhados (symmetry.py) idênticos, bit a bit, aos renderizados
+
+    Cobre contagens e contagem suave, com e sem interior, e o estado
+    retomável: continuar o estado espelhado com o dobro de iterações dá o
+    mesmo canvas que o render do zero.
+    """
+    failures = []
+    everything = np.ones((tiles, tiles), dtype=np.bool_)
+    for fractal_type, kind in FRACTAL_KINDS.items():
+        cr, ci = LOCATIONS['home'][3] if fractal_type == 'julia' else (0.0, 0.0)
+        for interior in (False, True):
+            for smooth in (False, True):
+                label = f"simetria {fractal_type} (interior={interior}, suave={smooth})"
+                full, row0, col0 = _tile_canvas(kind, tiles, tile, max_iter, everything, cr, ci,
+                                                interior, smooth)
+                plan = tile_mirror_plan(kind, everything, tile, row0, col0)
+                if (plan is None) != (kind not in SYMMETRY):
+                    failures.append(f"{label}: plano {plan} inesperado")
+                    continue
+                if plan is None:
+                    continue
+                state = np.empty((tiles * tile, tiles * tile, 3))
+                state[:, :, 2] = scriptSuperOtimizado.RESUME_FRESH
+                mirrored, _, _ = _tile_canvas(kind, tiles, tile, max_iter, everything & ~plan,
+                                              cr, ci, interior, smooth, state)
+                mirror_tiles(mirrored, plan, tile, row0, col0, kind, state)
+                if not np.array_equal(mirrored, full):
+                    off = np.mean(mirrored != full)
+                    failures.append(f"{label}: {off:.2%} dos pixels divergem do render")
+                resumed, _, _ = _tile_canvas(kind, tiles, tile, 2 * max_iter, everything, cr, ci,
+                                             interior, smooth, state)
+                fresh, _, _ = _tile_canvas(kind, tiles, tile, 2 * max_iter, everything, cr, ci,
+                                           interior, smooth)
+                if not np.array_equal(resumed, fresh):
+                    failures.append(f"{label}: estado espelhado retomado diverge")
+    return failures
+
+
+def check_interior(size=200, max_iter=CHECK_MAX_ITER):
+    """Detecção de interior: iterações idênticas às do kernel sem ela
+
+    A janela 'home' tem interior nos quatro tipos (no Julia, com
+    INTERIOR_JULIA_C), então lá a detecção também precisa economizar
+    iterações.
+    """
+    failures = []
+    for location in LOCATIONS:
+        bounds = _bounds(location)
+        views = [(fractal_type, kind, LOCATIONS[location][3] if kind == 1 else (0.0, 0.0))
+                 for fractal_type, kind in FRACTAL_KINDS.items()]
+        if location == 'home':
+            views.append(('julia', FRACTAL_KINDS['julia'], INTERIOR_JULIA_C))
+        for fractal_type, kind, (cr, ci) in views:
+            expected = escape_kernel(fractal_type)(size, size, max_iter, *bounds, cr, ci)
+            got, saved = scriptSuperOtimizado.interior_turbo(size, size, max_iter, *bounds, kind, cr, ci)
+            name = f"interior {fractal_type}@{location}" + (f" c={cr}{ci:+}i" if kind == 1 else "")
+            if not np.array_equal(got, expected):
+                failures.append(f"{name}: {np.mean(got != expected):.1%} dos pixels divergem")
+            has_interior = kind != 1 or (cr, ci) == INTERIOR_JULIA_C
+            if location == 'home' and has_interior and saved <= 0:
+                failures.append(f"{name}: nenhuma iteração economizada")
+        expected = scriptOptimizado.mandelbrot_set(size, size, max_iter, *bounds)
+        got, saved = scriptOptimizado.mandelbrot_set_interior(size, size, max_iter, *bounds)
+        if not np.array_equal(got, expected):
+            failures.append(f"interior scriptOptimizado@{location}: "
+                            f"{np.mean(got != expected):.1%} dos pixels divergem")
+        if location == 'home' and saved <= 0:
+            failures.append(f"interior scriptOptimizado@{location}: nenhuma iteração economizada")
+    return failures
+
+
+def run_benchmarks(quick=False, kernels=None):
+    """Mede todos os kernels em todos os casos
+
+    Retorna (resultados por caso, compilação JIT por kernel, cache em disco
+    por kernel).
+    """
+    results = {}
+    compile_s = {}
+    compile_cache = {}
+    for name in kernels or KERNELS:
+        _, max_pixels = KERNELS[name]
+        compile_s[name], compile_cache[name] = compile_time(name)
+        print(f"🛠️ {name}: JIT {compile_s[name]:.2f}s | cache em disco: "
+              f"{compile_cache[name]['hits']} carregados, {compile_cache[name]['misses']} compilados")
+        for fractal_type, location, size, max_iter in benchmark_cases(quick):
+            if fractal_type not in kernel_types(name):
+                continue
+            if max_pixels is not None and size * size > max_pixels:
+                size = int(max_pixels ** 0.5)  # Kernels lentos: frame reduzido
+            key = f"{name}/{fractal_type}@{location}/{size}px/{max_iter}it"
+            if key in results:
+                continue
+            results[key] = measure(name, fractal_type, location, size, max_iter)
+            r = results[key]
+            print(f"{key:62s} {r['mpixels_s']:8.2f} Mpx/s {r['iterations_s']/1e6:9.1f} Mit/s "
+                  f"{r['peak_mb']:6.1f} MB")
+    return results, compile_s, compile_cache
+
+
+def compare(results, baseline, threshold):
+    """Casos cujo Mpixels/s caiu mais que `threshold` em relação à base"""
+    regressions = []
+    for key, old in baseline.get('results', {}).items():
+        new = results.get(key)
+        if new is None:
+            continue
+        change = new['mpixels_s'] / old['mpixels_s'] - 1.0
+        if change < -threshold:
+            regressions.append(f"{key}: {old['mpixels_s']:.2f} -> {new['mpixels_s']:.2f} Mpx/s ({change:+.0%})")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark e regressão dos kernels de script.py, scriptOptimizado.py e scriptSuperOtimizado.py")
+    parser.add_argument('--baseline', default=BASELINE_PATH, help="arquivo JSON de base")
+    parser.add_argument('--update', action='store_true', help="grava os resultados como nova base")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="queda máxima aceita de Mpixels/s (fração)")
+    parser.add_argument('--quick', action='store_true', help="só a menor resolução e max_iter")
+    parser.add_argument('-k', '--kernel', action='append', choices=list(KERNELS),
+                        help="mede só estes kernels (repetível)")
+    parser.add_argument('--display', action='store_true',
+                        help="mede também o custo de apresentação (sem cálculo)")
+    args = parser.parse_args(argv)
+
+    # Mede antes das conferências: a compilação só é medida a frio
+    print("⏱️ Medindo kernels...")
+    results, compile_s, compile_cache = run_benchmarks(args.quick, args.kernel)
+
+    if args.display:
+        display = measure_display()
+        full, blit = display['full']['p50_ms'], display['blit']['p50_ms']
+        print(f"📺 Apresentação 400x400: redesenho completo {full:.1f}ms, "
+              f"blitting {blit:.1f}ms ({full / blit:.1f}x)")
+
+    print("🔎 Conferindo iterações contra script.py...")
+    failures = (check_against_reference() + check_precision_transitions() + check_symmetry()
+                + check_interior())
+    for failure in failures:
+        print(f"❌ {failure}")
+
+    if args.update:
+        with open(args.baseline, 'w') as f:
+            json.dump({
+                'machine': platform.machine(),
+                'python': platform.python_version(),
+                'numba': numba.__version__,
+                'numpy': np.__version__,
+                'compile_s': compile_s,
+                'compile_cache': compile_cache,
+                'results': results,
+            }, f, indent=2, sort_keys=True)
+        print(f"💾 Base gravada em {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for regression in regressions:
+            print(f"📉 {regression}")
+        failures += regressions
+    else:
+        print(f"ℹ️ Sem base em {args.baseline}; rode com --update para criar")
+
+    if failures:
+        print(f"❌ {len(failures)} falha(s)")
+        return 1
+    print("✅ Sem regressões")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
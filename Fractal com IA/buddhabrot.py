@@ -0,0 +1,344 @@
+import argparse
+import json
+import math
+import os
+import sys
+import time
+
+import numba
+import numpy as np
+from numba import jit, prange
+
+from batch_render import encode_png
+from formulas import FORMULAS, MULTIBROT_DEGREE, escape_kernel, formula_step
+from scriptSuperOtimizado import build_colormap, colormap_to_uint8
+
+# Canais (iteração mínima, máxima) de cada modo; órbitas que escapam dentro
+# do intervalo do canal somam nele. Nebulabrot: R, G, B
+BUDDHABROT_CHANNELS = ((20, 1000),)
+NEBULABROT_CHANNELS = ((20, 5000), (20, 500), (20, 50))
+
+# Grade do passe de escape-time que guia a amostragem, sobre [-2, 2]²
+# (fora do disco de raio 2 nenhuma órbita passa do primeiro passo)
+PRIOR_SIZE = 256
+SAMPLE_SPAN = 2.0
+
+# Órbitas por worker em cada lote. Os histogramas só entram no total com o
+# lote completo: a ordem das somas não depende de onde a execução parou
+BATCH_SAMPLES = 20000
+
+_MASK64 = (1 << 64) - 1
+
+
+@jit(nopython=True, nogil=True, cache=True, fastmath=True, inline='always')
+def _uniform(state):
+    """xorshift64*: (novo estado, número em [0, 1)); um estado por worker"""
+    state ^= state >> np.uint64(12)
+    state ^= state << np.uint64(25)
+    state ^= state >> np.uint64(27)
+    return state, ((state * np.uint64(2685821657736338717)) >> np.uint64(11)) * (1.0 / 9007199254740992.0)
+
+
+_kernels = {}
+
+
+def orbit_kernel(formula, degree=MULTIBROT_DEGREE):
+    """Kernel paralelo de densidade de órbitas especializado numa fórmula
+
+    kernel(hist, rng, samples, cdf, grid_w, cell, min_iters, max_iters,
+    x_min, y_min, dx, dy): cada worker t sorteia `samples` valores de c (uma
+    célula da grade pela distribuição acumulada cdf, depois uniforme dentro
+    dela), itera z -> f(z) + c com o mesmo formula_step do escape-time e,
+    se a órbita escapa, soma os pontos dela em hist[t, canal] com peso
+    1/(probabilidade da célula x células): a estimativa continua sendo a da
+    amostragem uniforme. Cada worker só escreve no próprio histograma.
+    """
+    key = (formula, degree if formula == 'multibrot' else 2)
+    if key in _kernels:
+        return _kernels[key]
+
+    kind = FORMULAS[formula]
+    power = key[1]
+
+    @jit(nopython=True, nogil=True, cache=True, parallel=True, fastmath=True)
+    def kernel(hist, rng, samples, cdf, grid_w, cell, min_iters, max_iters,
+               x_min, y_min, dx, dy):
+        workers, channels, h, w = hist.shape
+        cells = cdf.shape[0]
+        limit = max_iters.max()
+        escaped = 0
+        for t in prange(workers):
+            orbit_r = np.empty(limit)
+            orbit_i = np.empty(limit)
+            state = rng[t]
+            for _ in range(samples):
+                state, u = _uniform(state)
+                k = min(np.searchsorted(cdf, u * cdf[-1], side='right'), cells - 1)
+                p = cdf[k] - (cdf[k - 1] if k else 0.0)
+                weight = cdf[-1] / (p * cells)
+                state, u = _uniform(state)
+                cr = -SAMPLE_SPAN + (k % grid_w + u) * cell
+                state, u = _uniform(state)
+                ci = -SAMPLE_SPAN + (k // grid_w + u) * cell
+                if kind == 0:
+                    # Cardioide e bulbo principal nunca escapam: nem itera
+                    q = (cr - 0.25) ** 2 + ci * ci
+                    if q * (q + cr - 0.25) <= 0.25 * ci * ci or (cr + 1.0) ** 2 + ci * ci <= 0.0625:
+                        continue
+
+                zr, zi, zr2, zi2 = 0.0, 0.0, 0.0, 0.0
+                n = 0
+                while n < limit and zr2 + zi2 <= 4.0:
+                    zr, zi = formula_step(kind, zr, zi, zr2, zi2, cr, ci, power)
+                    zr2 = zr * zr
+                    zi2 = zi * zi
+                    orbit_r[n] = zr
+                    orbit_i[n] = zi
+                    n += 1
+                if zr2 + zi2 <= 4.0:
+                    continue  # Não escapou: não entra no Buddhabrot
+                escaped += 1
+
+                for channel in range(channels):
+                    if n < min_iters[channel] or n > max_iters[channel]:
+                        continue
+                    for m in range(n - 1):  # O ponto que escapou fica fora do disco
+                        col = (orbit_r[m] - x_min) / dx
+                        row = (orbit_i[m] - y_min) / dy
+                        if 0.0 <= col < w and 0.0 <= row < h:
+                            hist[t, channel, int(row), int(col)] += weight
+            rng[t] = state
+        return escaped
+
+    _kernels[key] = kernel
+    return kernel
+
+
+def _seeds(seed, count):
+    """Estados iniciais independentes (splitmix64) para os workers"""
+    states, x = [], seed & _MASK64
+    for _ in range(count):
+        x = (x + 0x9E3779B97F4A7C15) & _MASK64
+        z = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+        z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK64
+        states.append((z ^ (z >> 31)) or 1)
+    return np.array(states, dtype=np.uint64)
+
+
+def sampling_prior(formula, min_iter, max_iter, size=PRIOR_SIZE, degree=MULTIBROT_DEGREE):
+    """Pesos de amostragem das células de [-2, 2]² a partir de um passe de escape-time
+
+    Cada célula pesa as iterações em que escapou (órbitas longas somam mais
+    pontos); as abaixo de min_iter e o interior ficam só com o piso. O máximo
+    na vizinhança 3x3 puxa as células do interior coladas à borda, onde
+    estão as órbitas mais longas. O piso mantém toda célula sorteável, então
+    a estimativa não perde região nenhuma.
+    """
+    kernel = escape_kernel(formula, degree)
+    counts = kernel(size, size, max_iter, -SAMPLE_SPAN, SAMPLE_SPAN, -SAMPLE_SPAN, SAMPLE_SPAN)
+    weights = np.where((counts >= min_iter) & (counts < max_iter), counts, 0).astype(np.float64)
+    padded = np.pad(weights, 1)
+    dilated = np.max([padded[i:i + size, j:j + size] for i in range(3) for j in range(3)], axis=0)
+    floor = max(1.0, 0.01 * dilated.mean())
+    return dilated + floor
+
+
+class OrbitDensity:
+    """Acumulador de densidade de órbitas (Buddhabrot / Nebulabrot), retomável
+
+    A janela segue o batch_render: centro, zoom (4/zoom de largura) e pixels
+    quadrados. Os histogramas por worker (workers fatias) acumulam lotes de
+    BATCH_SAMPLES órbitas e só então são somados em `density`; um lote
+    incompleto (o resto de `samples`) fica neles e continua na próxima
+    chamada de run(). save() e load() gravam o estado inteiro, inclusive o
+    lote incompleto e o gerador aleatório de cada worker: a grade de lotes é
+    a mesma com ou sem interrupção, então uma execução retomada dá a mesma
+    densidade, bit a bit, que uma ininterrupta com o mesmo total.
+    """
+
+    def __init__(self, formula='mandelbrot', width=800, height=800, center=(-0.4, 0.0), zoom=1.25,
+                 channels=BUDDHABROT_CHANNELS, workers=None, seed=0, prior_size=PRIOR_SIZE,
+                 degree=MULTIBROT_DEGREE):
+        if formula not in FORMULAS or formula == 'julia':
+            raise ValueError(f"Fórmula sem Buddhabrot: {formula}")
+        self.formula = formula
+        self.degree = degree
+        self.width = width
+        self.height = height
+        self.center = (float(center[0]), float(center[1]))
+        self.zoom = float(zoom)
+        self.channels = tuple((int(lo), int(hi)) for lo, hi in channels)
+        self.workers = workers or numba.get_num_threads()
+        self.seed = seed
+        self.prior_size = prior_size
+        self.samples = 0
+        self.escaped = 0
+        self.density = np.zeros((len(self.channels), height, width), dtype=np.float64)
+        self.rng = _seeds(seed, self.workers)
+        self.batch_fill = 0  # Órbitas por worker já no lote incompleto
+        self._hist = np.zeros((self.workers,) + self.density.shape, dtype=np.float64)
+        self._cdf = None
+
+    def params(self):
+        """Parâmetros que definem a imagem (um checkpoint só retoma os mesmos)"""
+        return {
+            'formula': self.formula, 'degree': self.degree, 'width': self.width,
+            'height': self.height, 'center': list(self.center), 'zoom': self.zoom,
+            'channels': [list(c) for c in self.channels], 'workers': self.workers,
+            'seed': self.seed, 'prior_size': self.prior_size,
+        }
+
+    def _bounds(self):
+        half_w = 2.0 / self.zoom
+        half_h = half_w * self.height / self.width
+        return self.center[0] - half_w, self.center[1] - half_h, 2 * half_w / self.width, 2 * half_h / self.height
+
+    def run(self, samples, checkpoint=None, checkpoint_every=60.0, log=True):
+        """Acumula até `samples` órbitas no total (gravando checkpoints pelo caminho)"""
+        if self._cdf is None:
+            low = min(lo for lo, _ in self.channels)
+            high = max(hi for _, hi in self.channels)
+            prior = sampling_prior(self.formula, low, high, self.prior_size, self.degree)
+            self._cdf = np.cumsum(prior.ravel())
+        kernel = orbit_kernel(self.formula, self.degree)
+        min_iters = np.array([lo for lo, _ in self.channels], dtype=np.int64)
+        max_iters = np.array([hi for _, hi in self.channels], dtype=np.int64)
+        cell = 2 * SAMPLE_SPAN / self.prior_size
+
+        start = last_save = time.time()
+        done = 0
+        consistent = True
+        try:
+            while self.samples < samples:
+                # Completa o lote em andamento, sem passar do total pedido
+                batch = min(BATCH_SAMPLES - self.batch_fill,
+                            math.ceil((samples - self.samples) / self.workers))
+                consistent = False
+                self.escaped += kernel(self._hist, self.rng, batch, self._cdf, self.prior_size,
+                                       cell, min_iters, max_iters, *self._bounds())
+                self.batch_fill += batch
+                self.samples += batch * self.workers
+                consistent = True
+                if self.batch_fill == BATCH_SAMPLES:
+                    # Lote completo: junta os histogramas dos workers no total
+                    self.density += self._hist.sum(axis=0)
+                    self._hist.fill(0.0)
+                    self.batch_fill = 0
+                done += batch * self.workers
+                now = time.time()
+                if checkpoint and now - last_save >= checkpoint_every:
+                    self.save(checkpoint)
+                    last_save = now
+                if log:
+                    print(f"🌌 {self.samples:,} órbitas ({self.samples / samples:.0%}) | "
+                          f"{done / max(now - start, 1e-9):,.0f} órbitas/s", file=sys.stderr)
+        finally:
+            # Também ao interromper (Ctrl+C). Se a interrupção cair entre o
+            # kernel e os contadores, o checkpoint anterior é o último consistente
+            if checkpoint and consistent:
+                self.save(checkpoint)
+        return self
+
+    def save(self, path):
+        """Grava o estado num .npz (arquivo temporário + troca atômica)"""
+        tmp = path + '.tmp'
+        with open(tmp, 'wb') as f:
+            # O lote incompleto só é gravado quando existe
+            tail = self._hist if self.batch_fill else np.zeros(0)
+            np.savez(f, density=self.density, rng=self.rng, tail=tail,
+                     counters=np.array([self.samples, self.escaped, self.batch_fill],
+                                       dtype=np.int64),
+                     params=json.dumps(self.params(), sort_keys=True))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        """Retoma um checkpoint gravado por save()"""
+        with np.load(path) as data:
+            params = json.loads(str(data['params']))
+            density = cls(**{k: v for k, v in params.items() if k != 'channels'},
+                          channels=params['channels'])
+            density.density[...] = data['density']
+            density.rng[...] = data['rng']
+            counters = [int(v) for v in data['counters']]
+            density.samples, density.escaped = counters[:2]
+            # Checkpoints antigos não têm lote incompleto
+            if len(counters) > 2 and counters[2]:
+                density.batch_fill = counters[2]
+                density._hist[...] = data['tail']
+        return density
+
+    def total(self):
+        """Densidade acumulada, incluindo o lote incompleto"""
+        if self.batch_fill:
+            return self.density + self._hist.sum(axis=0)
+        return self.density
+
+    def image(self, gamma=0.5, percentile=99.9, color_scheme=None):
+        """Imagem RGB uint8: densidade normalizada por canal e curva de gama
+
+        Um canal vira tons de cinza (ou o colormap `color_scheme` do gerador);
+        três canais são R, G e B.
+        """
+        channels = []
+        for plane in self.total():
+            nonzero = plane[plane > 0]
+            scale = np.percentile(nonzero, percentile) if nonzero.size else 1.0
+            channels.append(np.clip(plane / scale, 0.0, 1.0) ** gamma)
+        if len(channels) == 3:
+            rgb = np.stack(channels, axis=-1)
+        elif color_scheme is not None:
+            colormap = colormap_to_uint8(build_colormap(color_scheme))
+            return colormap[(channels[0] * 255).astype(np.int32)]
+        else:
+            rgb = np.repeat(channels[0][..., None], 3, axis=-1)
+        return (rgb * 255 + 0.5).astype(np.uint8)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Buddhabrot / Nebulabrot por densidade de órbitas (headless, retomável)")
+    parser.add_argument('-o', '--output', default='buddhabrot.png', help="PNG de saída")
+    parser.add_argument('--formula', default='mandelbrot',
+                        choices=[f for f in FORMULAS if f != 'julia'])
+    parser.add_argument('--size', default='800x800', help="LARGURAxALTURA")
+    parser.add_argument('--center', nargs=2, type=float, default=(-0.4, 0.0))
+    parser.add_argument('--zoom', type=float, default=1.25)
+    parser.add_argument('--samples', type=float, default=1e7, help="órbitas no total")
+    parser.add_argument('--nebula', action='store_true',
+                        help="Nebulabrot: R, G, B com até 5000, 500 e 50 iterações")
+    parser.add_argument('--min-iter', type=int, default=BUDDHABROT_CHANNELS[0][0])
+    parser.add_argument('--max-iter', type=int, default=BUDDHABROT_CHANNELS[0][1])
+    parser.add_argument('--color-scheme', type=int, default=None,
+                        help="colormap do gerador (Buddhabrot; padrão: tons de cinza)")
+    parser.add_argument('--gamma', type=float, default=0.5)
+    parser.add_argument('--rotate', action='store_true', help="eixo real na vertical (o 'Buda' em pé)")
+    parser.add_argument('--checkpoint', default=None,
+                        help="arquivo .npz do estado; se existir, a execução é retomada dele")
+    parser.add_argument('--checkpoint-every', type=float, default=60.0, help="segundos entre checkpoints")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.checkpoint and os.path.exists(args.checkpoint):
+        density = OrbitDensity.load(args.checkpoint)
+        print(f"♻️ Retomando {args.checkpoint}: {density.samples:,} órbitas já acumuladas",
+              file=sys.stderr)
+    else:
+        width, height = (int(v) for v in args.size.lower().split('x'))
+        channels = NEBULABROT_CHANNELS if args.nebula else ((args.min_iter, args.max_iter),)
+        density = OrbitDensity(args.formula, width, height, args.center, args.zoom,
+                               channels=channels, seed=args.seed)
+
+    start = time.time()
+    density.run(int(args.samples), args.checkpoint, args.checkpoint_every)
+    rgb = density.image(args.gamma, color_scheme=args.color_scheme)
+    if args.rotate:
+        rgb = np.ascontiguousarray(np.rot90(rgb, -1))
+    with open(args.output, 'wb') as f:
+        f.write(encode_png(rgb))
+    print(f"✅ {density.samples:,} órbitas ({density.escaped / max(density.samples, 1):.1%} "
+          f"escaparam) em {time.time() - start:.1f}s -> {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+import math
+from decimal import Decimal, localcontext
+
+import numpy as np
+from numba import jit, prange
+
+# A partir deste zoom o espaçamento entre pixels se aproxima do epsilon do
+# float64 e os pixels começam a "colapsar" em blocos
+DEEP_ZOOM_THRESHOLD = 1e10
+
+FRACTAL_KINDS = {'mandelbrot': 0, 'julia': 1, 'burning_ship': 2, 'tricorn': 3}
+
+
+def deep_precision(zoom):
+    """Dígitos decimais necessários para representar o centro neste zoom"""
+    return max(30, int(math.log10(max(zoom, 1.0))) + 20)
+
+
+def to_decimal(value):
+    """Converte float/str/Decimal para Decimal sem perder precisão"""
+    if isinstance(value, (Decimal, str)):
+        return Decimal(value)
+    return Decimal(float(value))  # Conversão de float é exata
+
+
+def offset_center(cx, cy, dx, dy, zoom):
+    """Soma deslocamentos float a um centro de alta precisão"""
+    with localcontext() as ctx:
+        ctx.prec = deep_precision(zoom)
+        return (to_decimal(cx) + Decimal(float(dx)),
+                to_decimal(cy) + Decimal(float(dy)))
+
+
+def antenna_misiurewicz(digits=40):
+    """Ponto de Misiurewicz da antena, (c, 0) com c ≈ -1.5437 e `digits` casas
+
+    Raiz real de c³ + 2c² + 2c + 2 (Newton em Decimal): a órbita crítica
+    0 → c → c² + c → -(c² + c) cai no ponto fixo repulsor, então c está na
+    borda do Mandelbrot. No eixo real Burning Ship e Tricorn repetem a
+    dinâmica de z² + c, e o ponto também fica na antena deles.
+    """
+    with localcontext() as ctx:
+        ctx.prec = digits + 10
+        c = Decimal('-1.54')
+        tolerance = Decimal(10) ** -(digits + 5)
+        for _ in range(100):
+            step = (((c + 2) * c + 2) * c + 2) / ((3 * c + 4) * c + 2)
+            c -= step
+            if abs(step) < tolerance:
+                break
+        quantum = Decimal(10) ** -digits
+        return c.quantize(quantum), Decimal(0).quantize(quantum)
+
+
+def _complex_sqrt(a, b):
+    """Raiz quadrada de a + bi em Decimal, no ramo de parte real >= 0"""
+    r = (a * a + b * b).sqrt()
+    re = ((r + a) / 2).sqrt()
+    im = ((r - a) / 2).sqrt()
+    return re, (-im if b < 0 else im)
+
+
+def julia_repelling_points(cr, ci, digits=40):
+    """Dois pontos do conjunto de Julia de z² + c com `digits` casas
+
+    O ponto fixo repulsor β = (1 + √(1 - 4c)) / 2 (|2β| >= 1 no ramo de
+    parte real >= 0) e a pré-imagem √(-β - c) de -β estão no conjunto de
+    Julia para qualquer c: o zoom neles mostra detalhe em qualquer profundidade.
+    """
+    with localcontext() as ctx:
+        ctx.prec = digits + 10
+        cr, ci = to_decimal(cr), to_decimal(ci)
+        sr, si = _complex_sqrt(1 - 4 * cr, -4 * ci)
+        br, bi = (1 + sr) / 2, si / 2
+        pr, pi = _complex_sqrt(-br - cr, -bi - ci)
+        quantum = Decimal(10) ** -digits
+        return [(br.quantize(quantum), bi.quantize(quantum)),
+                (pr.quantize(quantum), pi.quantize(quantum))]
+
+
+def reference_orbit(fractal_type, cx, cy, max_iter, julia_c=(0.0, 0.0), zoom=1.0):
+    """Órbita de referência em precisão arbitrária, arredondada para complex128
+
+    Para Julia a órbita parte do centro (z0 = centro, c = parâmetro); nos
+    demais tipos parte de z0 = 0 com c = centro.
+    """
+    with localcontext() as ctx:
+        ctx.prec = deep_precision(zoom)
+        cx = +to_decimal(cx)
+        cy = +to_decimal(cy)
+        if fractal_type == 'julia':
+            zr, zi = cx, cy
+            cr, ci = Decimal(float(julia_c[0])), Decimal(float(julia_c[1]))
+        else:
+            zr, zi = Decimal(0), Decimal(0)
+            cr, ci = cx, cy
+
+        two = Decimal(2)
+        four = Decimal(4)
+        orbit = np.zeros(max_iter + 1, dtype=np.complex128)
+        length = 0
+        for n in range(max_iter + 1):
+            orbit[n] = complex(float(zr), float(zi))
+            length = n + 1
+            zr2 = zr * zr
+            zi2 = zi * zi
+            # Mantém ao menos dois pontos para o rebase funcionar
+            if zr2 + zi2 > four and length >= 2:
+                break
+            if fractal_type == 'burning_ship':
+                zi = two * abs(zr * zi) + ci
+            elif fractal_type == 'tricorn':
+                zi = -two * zr * zi + ci
+            else:
+                zi = two * zr * zi + ci
+            zr = zr2 - zi2 + cr
+
+    return orbit[:length]
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def series_coefficients(orbit, is_mandelbrot, radius, pixel_size):
+    """Aproximação em série (δn ≈ A·δ + B·δ² + C·δ³) para pular iterações
+
+    Retorna quantas iterações podem ser puladas e os coeficientes nesse ponto.
+    O critério mantém o erro do termo cúbico abaixo de 1/1000 de pixel e
+    para antes que algum pixel do frame possa escapar.
+    """
+    a = 1.0 + 0.0j if not is_mandelbrot else 0.0 + 0.0j
+    b = 0.0 + 0.0j
+    c = 0.0 + 0.0j
+    skip = 0
+    best_a, best_b, best_c = a, b, c
+    # O último ponto da órbita é reservado para o rebase
+    for n in range(orbit.shape[0] - 2):
+        z2 = 2.0 * orbit[n]
+        new_a = z2 * a + (1.0 if is_mandelbrot else 0.0)
+        new_b = z2 * b + a * a
+        new_c = z2 * c + 2.0 * a * b
+        a, b, c = new_a, new_b, new_c
+        if not (np.isfinite(a.real) and np.isfinite(c.real) and np.isfinite(c.imag)):
+            break
+        if abs(c) * radius ** 3 > 1e-3 * abs(a) * pixel_size:
+            break
+        bound = abs(a) * radius + abs(b) * radius ** 2 + abs(c) * radius ** 3
+        if abs(orbit[n + 1]) + bound >= 2.0:
+            break
+        skip = n + 1
+        best_a, best_b, best_c = a, b, c
+    return skip, best_a, best_b, best_c
+
+
+# Sem fastmath: reassociar as somas destrói os termos δ² da perturbação
+@jit(nopython=True, nogil=True, cache=True, parallel=True)
+def perturbation_turbo(h, w, max_iter, orbit, kind, dx, dy, skip, sa_a, sa_b, sa_c):
+    """Escape-time por perturbação em torno da órbita de referência
+
+    Cada pixel itera apenas o delta δ = z - Z em float64. Quando |z| < |δ|
+    (glitch iminente) ou a referência termina, o delta é reancorado no
+    início da órbita (rebase). Retorna as iterações e os rebases por linha.
+    """
+    result = np.zeros((h, w), dtype=np.int32)
+    rebases = np.zeros(h, dtype=np.int64)
+    ref_len = orbit.shape[0]
+    z0 = orbit[0]
+
+    for i in prange(h):
+        oy = (i - 0.5 * h) * dy
+        row_rebases = 0
+        for j in range(w):
+            ox = (j - 0.5 * w) * dx
+            d0 = complex(ox, oy)
+
+            if kind == 1:  # Julia: o delta é a posição inicial
+                dc = 0.0 + 0.0j
+                delta = d0
+            else:
+                dc = d0
+                delta = 0.0 + 0.0j
+
+            n = 0
+            m = 0
+            if skip > 0:
+                delta = sa_a * d0 + sa_b * d0 * d0 + sa_c * d0 * d0 * d0
+                n = skip
+                m = skip
+
+            escaped = False
+            while n < max_iter:
+                zr = orbit[m].real + delta.real
+                zi = orbit[m].imag + delta.imag
+                mag2 = zr * zr + zi * zi
+                if mag2 > 4.0:
+                    result[i, j] = n
+                    escaped = True
+                    break
+
+                # Detecção de glitch + rebase
+                dr, di = delta.real, delta.imag
+                if mag2 < dr * dr + di * di or m == ref_len - 1:
+                    delta = complex(zr - z0.real, zi - z0.imag)
+                    m = 0
+                    row_rebases += 1
+
+                xr = orbit[m].real
+                xi = orbit[m].imag
+                dr = delta.real
+                di = delta.imag
+                if kind == 2:  # Burning Ship: |a+b| - |a| estável
+                    p = xr * xi
+                    q = xr * di + dr * xi + dr * di
+                    if p >= 0.0:
+                        da = q if p + q >= 0.0 else -q - 2.0 * p
+                    else:
+                        da = q + 2.0 * p if p + q > 0.0 else -q
+                    new_dr = (2.0 * xr + dr) * dr - (2.0 * xi + di) * di + dc.real
+                    new_di = 2.0 * da + dc.imag
+                elif kind == 3:  # Tricorn (conjugado)
+                    new_dr = (2.0 * xr + dr) * dr - (2.0 * xi + di) * di + dc.real
+                    new_di = -2.0 * (xr * di + dr * xi + dr * di) + dc.imag
+                else:
+                    new_dr = (2.0 * xr + dr) * dr - (2.0 * xi + di) * di + dc.real
+                    new_di = 2.0 * (xr * di + dr * xi + dr * di) + dc.imag
+                delta = complex(new_dr, new_di)
+                m += 1
+                n += 1
+
+            if not escaped:
+                result[i, j] = max_iter
+        rebases[i] = row_rebases
+    return result, rebases
+
+
+def render_deep(fractal_type, h, w, max_iter, center_x, center_y, zoom,
+                julia_c=(0.0, 0.0), use_series=True, square_pixels=False):
+    """Renderiza um frame profundo: uma órbita de referência + deltas por pixel
+
+    A janela cobre 4/zoom nos dois eixos; com square_pixels o eixo vertical
+    usa o mesmo espaçamento do horizontal (frames não quadrados, ex. 1080p).
+    Retorna (iterações, estatísticas).
+    """
+    orbit = reference_orbit(fractal_type, center_x, center_y, max_iter,
+                            julia_c=julia_c, zoom=zoom)
+    dx = 4.0 / zoom / w
+    dy = dx if square_pixels else 4.0 / zoom / h
+
+    skip = 0
+    sa_a = sa_b = sa_c = 0.0 + 0.0j
+    # A série só vale para as fórmulas analíticas (Mandelbrot e Julia)
+    if use_series and fractal_type in ('mandelbrot', 'julia'):
+        radius = 0.5 * math.hypot(dx * w, dy * h)  # Meia diagonal da janela
+        skip, sa_a, sa_b, sa_c = series_coefficients(
+            orbit, fractal_type == 'mandelbrot', radius, min(dx, dy))
+        skip = min(skip, max_iter)
+
+    iterations, rebases = perturbation_turbo(
+        h, w, max_iter, orbit, FRACTAL_KINDS[fractal_type],
+        dx, dy, skip, sa_a, sa_b, sa_c)
+
+    stats = {
+        'reference_length': len(orbit),
+        'series_skip': int(skip),
+        'rebases': int(rebases.sum()),
+    }
+    return iterations, stats
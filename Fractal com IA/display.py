@@ -0,0 +1,140 @@
+import numpy as np
+from matplotlib.transforms import Bbox
+from numba import jit, prange
+
+
+@jit(nopython=True, nogil=True, cache=True, parallel=True, fastmath=True)
+def upscale_turbo(src, dst, bilinear):
+    """Reamostra o frame RGB uint8 src para dst (RGBA, pode ser fatia do canvas)
+
+    Centros de pixel alinhados como no imshow; só os canais RGB de dst são
+    escritos. Substitui a reamostragem genérica do matplotlib (float, RGBA)
+    no caminho rápido. Pesos bilineares em ponto fixo (1/256).
+    """
+    h, w = src.shape[0], src.shape[1]
+    dh, dw = dst.shape[0], dst.shape[1]
+    # Colunas de origem e pesos são iguais em todas as linhas
+    c0 = np.empty(dw, dtype=np.int64)
+    c1 = np.empty(dw, dtype=np.int64)
+    wx = np.empty(dw, dtype=np.int32)
+    for j in range(dw):
+        if bilinear:
+            x = min(max((j + 0.5) * w / dw - 0.5, 0.0), w - 1.0)
+            c0[j] = int(x)
+            wx[j] = int((x - c0[j]) * 256.0 + 0.5)
+        else:
+            c0[j] = min(int((j + 0.5) * w / dw), w - 1)
+            wx[j] = 0
+        c1[j] = min(c0[j] + 1, w - 1)
+
+    for i in prange(dh):
+        if bilinear:
+            y = min(max((i + 0.5) * h / dh - 0.5, 0.0), h - 1.0)
+            r0 = int(y)
+            wy = np.int32(int((y - r0) * 256.0 + 0.5))
+        else:
+            r0 = min(int((i + 0.5) * h / dh), h - 1)
+            wy = np.int32(0)
+        r1 = min(r0 + 1, h - 1)
+        for j in range(dw):
+            a = wx[j]
+            for k in range(3):
+                top = np.int32(src[r0, c0[j], k]) * (256 - a) + np.int32(src[r0, c1[j], k]) * a
+                bottom = np.int32(src[r1, c0[j], k]) * (256 - a) + np.int32(src[r1, c1[j], k]) * a
+                dst[i, j, k] = np.uint8((top * (256 - wy) + bottom * wy + 32768) >> 16)
+
+
+class BlitPresenter:
+    """Apresenta frames uint8 num AxesImage redesenhando só a imagem (blitting)
+
+    O fundo da figura (botões, textos, eixos) fica guardado desde o último
+    desenho completo; cada frame restaura esse fundo, desenha a imagem e os
+    overlays animados (ex.: o texto de FPS) e copia só a área dos eixos para
+    a tela, sem o sleep do plt.pause. Redimensionar a janela (ou qualquer
+    desenho completo) recaptura o fundo. Com blit=False cai no caminho
+    clássico set_data + draw_idle + plt.pause.
+
+    Em backends Agg (TkAgg, QtAgg, ...) a imagem nem passa pelo pipeline de
+    imagens do matplotlib: upscale_turbo escreve o frame já na resolução da
+    tela direto no buffer RGBA do canvas.
+    """
+
+    def __init__(self, fig, ax, im, overlays=(), blit=True):
+        self.fig = fig
+        self.ax = ax
+        self.im = im
+        self.overlays = list(overlays)
+        self.blit = False
+        self._background = None
+        self._pixels = None  # Área da imagem no buffer RGBA do canvas (caminho direto)
+        self._overlay_boxes = {}  # Última área de cada overlay (texto pode encolher)
+        self.fig.canvas.mpl_connect('draw_event', self._on_draw)
+        self.set_blit(blit)
+
+    def set_blit(self, blit):
+        """Liga/desliga o blitting (artistas animados saem do desenho completo)"""
+        # Backends sem suporte (ex.: alguns não interativos) ficam no caminho clássico
+        self.blit = blit and self.fig.canvas.supports_blit
+        for artist in [self.im] + self.overlays:
+            artist.set_animated(self.blit)
+        self._background = None
+        self._pixels = None
+        self.fig.canvas.draw_idle()
+
+    def _on_draw(self, event):
+        """Depois de um desenho completo: guarda o fundo e redesenha os animados"""
+        if not self.blit:
+            return
+        canvas = self.fig.canvas
+        self._background = canvas.copy_from_bbox(self.fig.bbox)
+        self._pixels = self._image_pixels()
+        for artist in [self.im] + self.overlays:
+            self.fig.draw_artist(artist)
+
+    def _image_pixels(self):
+        """Fatia do buffer do canvas sob a imagem, ou None fora do Agg"""
+        renderer = getattr(self.fig.canvas, 'get_renderer', lambda: None)()
+        if renderer is None or not hasattr(renderer, 'buffer_rgba'):
+            return None
+        pixels = np.asarray(renderer.buffer_rgba())
+        height, width = pixels.shape[:2]
+        box = self.im.get_window_extent(renderer)
+        # Coordenadas de tela crescem para cima; linhas do buffer, para baixo
+        r0, c0 = round(height - box.y1), round(box.x0)
+        r1, c1 = r0 + round(box.height), c0 + round(box.width)
+        if r0 < 0 or c0 < 0 or r1 > height or c1 > width or r1 == r0 or c1 == c0:
+            return None  # Imagem cortada pela janela: fica com o caminho do matplotlib
+        pixels = pixels[r0:r1, c0:c1]
+        return pixels[::-1] if self.im.origin == 'lower' else pixels
+
+    def present(self, frame, pause=0.01):
+        """Mostra o frame (uint8 RGB); pause só vale para o caminho clássico"""
+        self.im.set_data(frame)  # O matplotlib copia: o frame pode ser reaproveitado
+        self.redraw(pause)
+
+    def redraw(self, pause=0.01):
+        """Leva para a tela o que já está na imagem e nos overlays"""
+        canvas = self.fig.canvas
+        if not self.blit:
+            canvas.draw_idle()
+            if pause:
+                import matplotlib.pyplot as plt
+                plt.pause(pause)
+            return
+        if self._background is None:
+            canvas.draw()  # Primeiro frame (ou após set_blit): captura o fundo
+        else:
+            canvas.restore_region(self._background)
+            if self._pixels is not None:
+                upscale_turbo(np.asarray(self.im.get_array()), self._pixels,
+                              self.im.get_interpolation() != 'nearest')
+            else:
+                self.fig.draw_artist(self.im)
+            canvas.blit(self.ax.bbox)
+            for overlay in self.overlays:
+                self.fig.draw_artist(overlay)
+                box = overlay.get_window_extent()
+                old = self._overlay_boxes.get(id(overlay))
+                self._overlay_boxes[id(overlay)] = box
+                canvas.blit(box if old is None else Bbox.union([old, box]))
+        canvas.flush_events()
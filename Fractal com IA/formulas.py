@@ -0,0 +1,83 @@
+import numpy as np
+from numba import jit, prange
+
+from deep_zoom import FRACTAL_KINDS
+
+# Fórmulas da família escape-time; os quatro primeiros ids são os mesmos
+# de FRACTAL_KINDS (o Julia usa o passo do Mandelbrot com z0 = pixel)
+FORMULAS = {**FRACTAL_KINDS, 'celtic': 4, 'multibrot': 5}
+
+# Expoente padrão do Multibrot z^d + c (d = 2 seria o próprio Mandelbrot)
+MULTIBROT_DEGREE = 3
+
+@jit(nopython=True, nogil=True, cache=True, fastmath=True, inline='always')
+def formula_step(formula, zr, zi, zr2, zi2, cr, ci, degree):
+    """Um passo z -> f(z) + c, reaproveitando zr² e zi² já calculados
+    
+    Com `formula` e `degree` constantes (kernels de escape_kernel) os desvios
+    somem na compilação; com eles variando vira um desvio por passo.
+    """
+    if formula == 2:  # Burning Ship
+        return zr2 - zi2 + cr, 2.0 * abs(zr * zi) + ci
+    if formula == 3:  # Tricorn (conjugado)
+        return zr2 - zi2 + cr, -2.0 * zr * zi + ci
+    if formula == 4:  # Celtic
+        return abs(zr2 - zi2) + cr, 2.0 * zr * zi + ci
+    if formula == 5:  # Multibrot: z^d por multiplicações sucessivas
+        pr, pi = zr2 - zi2, 2.0 * zr * zi
+        for _ in range(degree - 2):
+            pr, pi = pr * zr - pi * zi, pr * zi + pi * zr
+        return pr + cr, pi + ci
+    return zr2 - zi2 + cr, 2.0 * zr * zi + ci  # Mandelbrot / Julia
+
+_kernels = {}
+
+def escape_kernel(formula, degree=MULTIBROT_DEGREE):
+    """Kernel paralelo de escape-time especializado numa fórmula
+    
+    kernel(h, w, max_iter, x_min, x_max, y_min, y_max, cr=0.0, ci=0.0): o
+    tipo e o expoente entram como constantes de compilação, então cada
+    fórmula vira um laço próprio (e uma entrada própria no cache em disco)
+    com as mesmas otimizações. Para o Julia, (cr, ci) é o parâmetro c.
+    """
+    key = (formula, degree if formula == 'multibrot' else 2)
+    if key in _kernels:
+        return _kernels[key]
+    
+    kind = FORMULAS[formula]
+    julia = formula == 'julia'
+    power = key[1]
+    
+    @jit(nopython=True, nogil=True, cache=True, parallel=True, fastmath=True)
+    def kernel(h, w, max_iter, x_min, x_max, y_min, y_max, cr=0.0, ci=0.0):
+        result = np.zeros((h, w), dtype=np.int32)
+        dx = (x_max - x_min) / w
+        dy = (y_max - y_min) / h
+        
+        for i in prange(h):
+            y = y_min + i * dy
+            for j in range(w):
+                x = x_min + j * dx
+                if julia:
+                    zr, zi, ar, ai = x, y, cr, ci
+                else:
+                    zr, zi, ar, ai = 0.0, 0.0, x, y
+                zr2, zi2 = zr * zr, zi * zi
+                
+                for n in range(max_iter):
+                    if zr2 + zi2 > 4.0:
+                        result[i, j] = n
+                        break
+                    zr, zi = formula_step(kind, zr, zi, zr2, zi2, ar, ai, power)
+                    zr2 = zr * zr
+                    zi2 = zi * zi
+                else:
+                    result[i, j] = max_iter
+        return result
+    
+    _kernels[key] = kernel
+    return kernel
+
+def compiled_kernels():
+    """Kernels já criados pela fábrica (para estatísticas do cache)"""
+    return list(_kernels.values())
@@ -0,0 +1,126 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+
+TARGET_FPS = 30
+
+# Janela (segundos) do FPS medido
+FPS_WINDOW = 2.0
+
+
+class FrameClock:
+    """Relógio único da animação: passos devidos pelo tempo e FPS medido
+
+    A animação avança um passo por período (1/fps) desde reset(). Quem
+    renderiza pergunta quantos passos estão devidos: com o render atrasado
+    vêm vários de uma vez e só o último é renderizado (os outros contam
+    como pulados), então o ritmo da animação não depende do custo do frame.
+    """
+
+    def __init__(self, fps=TARGET_FPS, window=FPS_WINDOW):
+        self.fps = fps
+        self.period = 1.0 / fps
+        self.window = window
+        self.start = time.perf_counter()
+        self.step = 0
+        self.presented = 0
+        self.skipped = 0
+        self._presents = deque()  # Instantes das últimas apresentações
+        self._lock = threading.Lock()
+
+    def reset(self, now=None):
+        """Recomeça a contagem de passos (ao ligar a animação)"""
+        with self._lock:
+            self.start = time.perf_counter() if now is None else now
+            self.step = 0
+            self._presents.clear()
+
+    def due_steps(self, now=None):
+        """Passos da animação vencidos até agora (0 se ainda não é hora)"""
+        now = time.perf_counter() if now is None else now
+        with self._lock:
+            target = int((now - self.start) * self.fps) + 1
+            steps = target - self.step
+            if steps <= 0:
+                return 0
+            self.step = target
+            self.skipped += steps - 1
+            return steps
+
+    def wait_time(self, now=None):
+        """Segundos até o próximo passo vencer"""
+        now = time.perf_counter() if now is None else now
+        with self._lock:
+            return max(0.0, self.start + self.step * self.period - now)
+
+    def present(self, now=None):
+        """Registra um frame apresentado na tela"""
+        now = time.perf_counter() if now is None else now
+        with self._lock:
+            self.presented += 1
+            self._presents.append(now)
+            while self._presents and now - self._presents[0] > self.window:
+                self._presents.popleft()
+
+    def achieved_fps(self):
+        """FPS apresentado na janela recente"""
+        with self._lock:
+            if len(self._presents) < 2:
+                return 0.0
+            elapsed = self._presents[-1] - self._presents[0]
+            return (len(self._presents) - 1) / elapsed if elapsed > 0 else 0.0
+
+    def stats(self):
+        return {
+            'target_fps': self.fps,
+            'achieved_fps': self.achieved_fps(),
+            'presented_frames': self.presented,
+            'skipped_frames': self.skipped,
+        }
+
+
+class FrameBuffer:
+    """Buffer duplo de frames entre a thread de render e a tela
+
+    publish() copia o frame para o buffer de trás e troca; front() entrega o
+    da frente se houver um novo. O render pode reaproveitar o próprio buffer
+    (ex.: frame_buffer do kernel fundido) logo depois de publicar. Frames
+    substituídos antes de chegar à tela contam em `replaced`.
+    """
+
+    def __init__(self):
+        self.replaced = 0
+        self._buffers = [None, None]
+        self._front = 0
+        self._fresh = False
+        self._stamp = None
+        self._lock = threading.Lock()
+
+    def publish(self, frame, stamp=None):
+        """Publica um frame (stamp: instante do pedido, para medir a latência)"""
+        with self._lock:
+            back = 1 - self._front
+            buffer = self._buffers[back]
+            if buffer is None or buffer.shape != frame.shape or buffer.dtype != frame.dtype:
+                buffer = self._buffers[back] = np.empty_like(frame)
+            np.copyto(buffer, frame)
+            self.replaced += self._fresh
+            self._front = back
+            self._fresh = True
+            self._stamp = stamp
+
+    @contextmanager
+    def front(self):
+        """with buffer.front() as (frame, stamp): frame é None sem frame novo
+
+        O buffer fica travado dentro do with (a tela copia o frame ali).
+        """
+        with self._lock:
+            if not self._fresh:
+                yield None, None
+                return
+            self._fresh = False
+            yield self._buffers[self._front], self._stamp
@@ -0,0 +1,204 @@
+import numpy as np
+
+# Mesma numeração dos kernels numba
+FRACTAL_KINDS = {'mandelbrot': 0, 'julia': 1, 'burning_ship': 2, 'tricorn': 3}
+
+
+class ActiveSetEngine:
+    """Escape-time vetorizado em NumPy para hosts sem numba
+
+    Itera só o conjunto ativo de pixels como arrays inteiros. A cada
+    `compact_every` iterações os pixels que escaparam são retirados do
+    conjunto; os buffers de trabalho são reaproveitados entre frames e a
+    compactação alterna entre dois bancos para não realocar.
+    """
+
+    def __init__(self, compact_every=8):
+        self.compact_every = compact_every
+        self._capacity = 0
+        self._banks = None
+        self._scratch = None
+
+    def _reserve(self, size):
+        """Garante buffers para `size` pixels ativos (só cresce)"""
+        if size <= self._capacity:
+            return
+        self._capacity = size
+        self._banks = [
+            {name: np.empty(size) for name in ('zr', 'zi', 'cr', 'ci')} for _ in range(2)
+        ]
+        for bank in self._banks:
+            bank['ids'] = np.empty(size, dtype=np.intp)
+        self._scratch = {
+            'zr2': np.empty(size), 'zi2': np.empty(size), 'mag': np.empty(size),
+            'esc': np.empty(size, dtype=np.int32),
+            'escaped': np.empty(size, dtype=np.bool_), 'fresh': np.empty(size, dtype=np.bool_),
+        }
+
+    def run(self, result, todo, z_state_real, z_state_imag, xs, ys, max_iter, kind,
+            c_real=0.0, c_imag=0.0, interior=False):
+        """Mesmo contrato de fractal_set_masked (scriptOptimizado)
+
+        Calcula os pixels marcados em `todo`; os que têm result > 0 e z_state
+        válido (não NaN) retomam de onde pararam, e quem não escapa deixa o z
+        em z_state. Com interior só o teste do cardioide/bulbo (Mandelbrot)
+        é aplicado; a detecção de ciclos fica com o kernel numba. Retorna
+        (pixels calculados, iterações retomadas, iterações economizadas pela
+        detecção de interior).
+        """
+        w = result.shape[1]
+        res = result.reshape(-1)
+        state_r = z_state_real.reshape(-1)
+        state_i = z_state_imag.reshape(-1)
+
+        ids = np.flatnonzero(todo)
+        count = len(ids)
+        start = res[ids]
+        resumed = (start > 0) & ~np.isnan(state_r[ids])
+        start[~resumed] = 0
+        skipped = int(start.sum())
+
+        interior_saved = 0
+        if interior and kind == FRACTAL_KINDS['mandelbrot']:
+            a, b = xs[ids % w], ys[ids // w]
+            xq = a - 0.25
+            q = xq * xq + b * b
+            inside = (q * (q + xq) <= 0.25 * b * b) | ((a + 1) ** 2 + b * b <= 0.0625)
+            res[ids[inside]] = max_iter
+            interior_saved = int((max_iter - start[inside]).sum())
+            ids, start = ids[~inside], start[~inside]
+
+        self._reserve(len(ids))
+        # Um grupo por ponto de partida (tipicamente: do zero e o max_iter antigo)
+        for s in np.unique(start):
+            group = ids[start == s]
+            self._run_group(group, int(s), res, state_r, state_i, xs, ys, w,
+                            max_iter, kind, c_real, c_imag)
+        return count, skipped, interior_saved
+
+    def _run_group(self, group, start, res, state_r, state_i, xs, ys, w,
+                   max_iter, kind, c_real, c_imag):
+        """Itera de `start` até max_iter os pixels (índices planos) do grupo"""
+        n_active = len(group)
+        bank, spare = self._banks
+        zr, zi, cr, ci = (bank[name][:n_active] for name in ('zr', 'zi', 'cr', 'ci'))
+        ids = bank['ids'][:n_active]
+        ids[:] = group
+
+        px = xs[group % w]
+        py = ys[group // w]
+        if start > 0:
+            zr[:] = state_r[group]
+            zi[:] = state_i[group]
+        elif kind == 1:
+            zr[:] = px
+            zi[:] = py
+        else:
+            zr.fill(0.0)
+            zi.fill(0.0)
+        if kind == 1:
+            cr.fill(c_real)
+            ci.fill(c_imag)
+        else:
+            cr[:] = px
+            ci[:] = py
+
+        scratch = self._scratch
+        esc = scratch['esc'][:n_active]
+        esc.fill(-1)
+        since_compact = 0
+
+        # Pixels já escapados seguem iterando até a compactação e podem estourar
+        with np.errstate(over='ignore', invalid='ignore'):
+            for n in range(start, max_iter):
+                zr2 = np.multiply(zr, zr, out=scratch['zr2'][:n_active])
+                zi2 = np.multiply(zi, zi, out=scratch['zi2'][:n_active])
+                mag = np.add(zr2, zi2, out=scratch['mag'][:n_active])
+                escaped = np.greater(mag, 4.0, out=scratch['escaped'][:n_active])
+                fresh = np.less(esc, 0, out=scratch['fresh'][:n_active])
+                np.logical_and(escaped, fresh, out=escaped)
+                np.copyto(esc, n, where=escaped)
+
+                # zi' = 2·zr·zi + ci (Burning Ship com |·|, Tricorn conjugado)
+                np.multiply(zr, zi, out=zi)
+                if kind == 2:
+                    np.abs(zi, out=zi)
+                zi *= -2.0 if kind == 3 else 2.0
+                zi += ci
+                np.subtract(zr2, zi2, out=zr)
+                zr += cr
+
+                since_compact += 1
+                if since_compact < self.compact_every:
+                    continue
+                since_compact = 0
+
+                keep = np.less(esc, 0, out=scratch['fresh'][:n_active])
+                done = ~keep
+                res[ids[done]] = esc[done]
+                n_keep = int(np.count_nonzero(keep))
+                if n_keep == 0:
+                    return
+                if n_keep == n_active:
+                    continue
+
+                # Compacta o conjunto ativo no outro banco e troca os bancos
+                for name in ('zr', 'zi', 'cr', 'ci', 'ids'):
+                    np.compress(keep, bank[name][:n_active], out=spare[name][:n_keep])
+                bank, spare = spare, bank
+                n_active = n_keep
+                zr, zi, cr, ci = (bank[name][:n_active] for name in ('zr', 'zi', 'cr', 'ci'))
+                ids = bank['ids'][:n_active]
+                esc = scratch['esc'][:n_active]
+                esc.fill(-1)
+
+        done = esc >= 0
+        res[ids[done]] = esc[done]
+        alive = ~done
+        res[ids[alive]] = max_iter
+        state_r[ids[alive]] = zr[alive]
+        state_i[ids[alive]] = zi[alive]
+
+
+_engine = ActiveSetEngine()
+
+
+def escape_time(h, w, max_iter, x_min, x_max, y_min, y_max, kind, c_real=0.0, c_imag=0.0):
+    """Frame inteiro de iterações com o motor NumPy"""
+    xs = x_min + (x_max - x_min) * np.arange(w) / w
+    ys = y_min + (y_max - y_min) * np.arange(h) / h
+    result = np.zeros((h, w), dtype=np.int32)
+    todo = np.ones((h, w), dtype=np.bool_)
+    z_state_real = np.full((h, w), np.nan)
+    z_state_imag = np.full((h, w), np.nan)
+    _engine.run(result, todo, z_state_real, z_state_imag, xs, ys, max_iter, kind, c_real, c_imag)
+    return result
+
+
+# Substitutos com as mesmas assinaturas dos kernels de scriptOptimizado.py
+def mandelbrot_set(h, w, max_iter, x_min, x_max, y_min, y_max):
+    """Mandelbrot vetorizado"""
+    return escape_time(h, w, max_iter, x_min, x_max, y_min, y_max, FRACTAL_KINDS['mandelbrot'])
+
+
+def julia_set(h, w, max_iter, x_min, x_max, y_min, y_max, c_real, c_imag):
+    """Julia vetorizado"""
+    return escape_time(h, w, max_iter, x_min, x_max, y_min, y_max, FRACTAL_KINDS['julia'],
+                       c_real, c_imag)
+
+
+def burning_ship_set(h, w, max_iter, x_min, x_max, y_min, y_max):
+    """Burning Ship vetorizado"""
+    return escape_time(h, w, max_iter, x_min, x_max, y_min, y_max, FRACTAL_KINDS['burning_ship'])
+
+
+def tricorn_set(h, w, max_iter, x_min, x_max, y_min, y_max):
+    """Tricorn vetorizado"""
+    return escape_time(h, w, max_iter, x_min, x_max, y_min, y_max, FRACTAL_KINDS['tricorn'])
+
+
+def fractal_set_masked(result, todo, z_state_real, z_state_imag, xs, ys, max_iter, kind,
+                       c_real, c_imag, interior=False):
+    """Cálculo mascarado/retomável vetorizado"""
+    return _engine.run(result, todo, z_state_real, z_state_imag, xs, ys, max_iter, kind,
+                       c_real, c_imag, interior)
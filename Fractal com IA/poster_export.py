@@ -0,0 +1,329 @@
+import argparse
+import json
+import os
+import struct
+import sys
+import time
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from batch_render import (_colormap, _frame_bounds, _init_worker, png_chunk, png_header, png_rows,
+                          render_iterations)
+from deep_zoom import DEEP_ZOOM_THRESHOLD, FRACTAL_KINDS, offset_center, to_decimal
+from precision import choose_precision
+from scriptSuperOtimizado import iterations_for_zoom, smooth_fixed_turbo, smooth_palette_turbo
+
+# Lado dos tiles renderizados (cada worker segura um tile de int32 por vez)
+POSTER_TILE = 1024
+# Teto de memória de uma faixa de linhas colorida (mais os temporários dela)
+STRIP_BYTES = 16 * 1024**2
+# Contagens gravadas em uint16: max_iter não pode passar disso
+MAX_ITER_LIMIT = 65535
+
+
+def poster_tier(width, height, center, zoom):
+    """Aritmética de todos os tiles, escolhida pelo espaçamento do pôster inteiro"""
+    spacing = 4.0 / zoom / width
+    reach = max(abs(float(center[0])) + width / 2 * spacing,
+                abs(float(center[1])) + height / 2 * spacing)
+    return choose_precision(spacing, reach)
+
+
+def poster_params(fractal_type, width, height, center, zoom, max_iter=None,
+                  julia_c=(-0.8, 0.156), interior=False, tile=POSTER_TILE):
+    """Parâmetros que definem as iterações do pôster (o arquivo de progresso guarda)"""
+    if fractal_type not in FRACTAL_KINDS:
+        raise ValueError(f"Tipo de fractal desconhecido: {fractal_type}")
+    max_iter = max_iter or iterations_for_zoom(zoom)
+    if max_iter > MAX_ITER_LIMIT:
+        raise ValueError(f"max_iter acima de {MAX_ITER_LIMIT} não cabe no arquivo uint16")
+    # Como no batch_render: coloração suave onde o float64 basta, contagens além
+    tier = poster_tier(width, height, center, zoom)
+    smooth = zoom < DEEP_ZOOM_THRESHOLD and tier != 'double-double'
+    return {
+        'fractal_type': fractal_type, 'width': width, 'height': height,
+        'center': [str(to_decimal(center[0])), str(to_decimal(center[1]))],
+        'zoom': float(zoom), 'max_iter': max_iter, 'julia_c': list(julia_c),
+        'interior': interior, 'tile': tile, 'smooth': smooth,
+    }
+
+
+def poster_jobs(params):
+    """Pedidos de render (formato do batch_render) de cada tile, com a posição no pôster
+
+    Todos os tiles têm o espaçamento de pixel do pôster inteiro (zoom do
+    tile = zoom x largura / lado do tile) e a mesma aritmética, então as
+    emendas não aparecem.
+    """
+    width, height, tile, zoom = params['width'], params['height'], params['tile'], params['zoom']
+    cx, cy = params['center']
+    spacing = 4.0 / zoom / width
+    tier = poster_tier(width, height, (cx, cy), zoom)
+    index = 0
+    for row0 in range(0, height, tile):
+        for col0 in range(0, width, tile):
+            h, w = min(tile, height - row0), min(tile, width - col0)
+            tcx, tcy = offset_center(cx, cy, (col0 + w / 2 - width / 2) * spacing,
+                                     (row0 + h / 2 - height / 2) * spacing, zoom)
+            yield {
+                'index': index, 'row0': row0, 'col0': col0,
+                'fractal_type': params['fractal_type'], 'julia_c': tuple(params['julia_c']),
+                'center': (str(tcx), str(tcy)), 'zoom': zoom * width / w,
+                'max_iter': params['max_iter'], 'width': w, 'height': h,
+                'interior': params['interior'], 'tier': tier, 'smooth': params['smooth'],
+            }
+            index += 1
+
+
+def _band(path, width, row0, row1, mode):
+    """Linhas [row0, row1) do arquivo de iterações mapeadas em memória
+
+    Só o trecho usado é mapeado e ele é liberado quando o array sai de
+    escopo: a memória residente não cresce com o tamanho do arquivo.
+    """
+    return np.memmap(path, dtype=np.uint16, mode=mode, offset=row0 * width * 2,
+                     shape=(row1 - row0, width))
+
+
+def render_poster_tile(job, path, width):
+    """Executado nos workers: renderiza um tile e grava direto no arquivo mapeado
+
+    Com job['smooth'] grava a contagem suave em ponto fixo (smooth_fixed);
+    senão, a contagem inteira.
+    """
+    if job['smooth']:
+        cr, ci = job['julia_c'] if job['fractal_type'] == 'julia' else (0.0, 0.0)
+        values = smooth_fixed_turbo(job['height'], job['width'], job['max_iter'], *_frame_bounds(job),
+                                    FRACTAL_KINDS[job['fractal_type']], cr, ci, job['interior'])
+    else:
+        values = np.minimum(render_iterations(job), MAX_ITER_LIMIT)
+    band = _band(path, width, job['row0'], job['row0'] + job['height'], 'r+')
+    band[:, job['col0']:job['col0'] + job['width']] = values
+    band.flush()
+    del band
+    return job['index']
+
+
+def _save_progress(path, params, done):
+    """Grava o progresso (troca atômica: um Ctrl+C não corrompe o arquivo)"""
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump({'params': params, 'done': sorted(done)}, f)
+    os.replace(tmp, path)
+
+
+def render_iteration_file(params, path, progress_path, workers=None, numba_threads=1):
+    """Renderiza os tiles que faltam no arquivo de iterações uint16 (retomável)
+
+    O progresso (tiles prontos) fica num JSON ao lado; um tile só entra nele
+    depois de gravado e descarregado no arquivo. Retorna (tiles renderizados
+    agora, tiles no total).
+    """
+    done = set()
+    if os.path.exists(progress_path) and os.path.exists(path):
+        with open(progress_path) as f:
+            progress = json.load(f)
+        if progress['params'] != params:
+            raise ValueError(f"{progress_path} é de outro pôster; apague-o (e {path}) para recomeçar")
+        done = set(progress['done'])
+        print(f"♻️ Retomando: {len(done)} tiles já prontos", file=sys.stderr)
+    else:
+        with open(path, 'wb') as f:
+            f.truncate(params['width'] * params['height'] * 2)  # Arquivo esparso
+        _save_progress(progress_path, params, done)
+
+    jobs = [job for job in poster_jobs(params) if job['index'] not in done]
+    total = len(done) + len(jobs)
+    workers = workers or os.cpu_count() or 1
+    pending = deque()
+    start = time.time()
+
+    def finish(future):
+        done.add(future.result())
+        _save_progress(progress_path, params, done)
+        rendered = len(done) - (total - len(jobs))
+        elapsed = time.time() - start
+        print(f"🧱 {len(done)}/{total} tiles | {rendered * params['tile']**2 / 1e6 / elapsed:.1f} Mpx/s",
+              file=sys.stderr)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(numba_threads,)) as pool:
+        for job in jobs:
+            pending.append(pool.submit(render_poster_tile, job, path, params['width']))
+            if len(pending) >= 2 * workers:
+                finish(pending.popleft())
+        while pending:
+            finish(pending.popleft())
+    return len(jobs), total
+
+
+class PngStream:
+    """PNG escrito por faixas de linhas: um zlib contínuo, um IDAT por faixa"""
+
+    def __init__(self, f, width, height, level=6):
+        self.f = f
+        self.f.write(png_header(width, height))
+        self._zlib = zlib.compressobj(level)
+
+    def write(self, rgb):
+        data = self._zlib.compress(png_rows(rgb))
+        if data:
+            self.f.write(png_chunk(b'IDAT', data))
+
+    def close(self):
+        self.f.write(png_chunk(b'IDAT', self._zlib.flush()))
+        self.f.write(png_chunk(b'IEND', b''))
+
+
+class TiffStream:
+    """TIFF RGB sem compressão escrito por faixas; BigTIFF acima de 4 GB
+
+    Sem compressão o tamanho de cada faixa é conhecido de antemão, então o
+    diretório (IFD) com os offsets vai no começo do arquivo e os pixels
+    seguem em ordem, sem voltar atrás.
+    """
+
+    # Tipos TIFF: SHORT, LONG e LONG8 (só no BigTIFF)
+    _FORMATS = {3: 'H', 4: 'I', 16: 'Q'}
+
+    def __init__(self, f, width, height, rows_per_strip):
+        self.f = f
+        row_bytes = width * 3
+        strips = -(-height // rows_per_strip)
+        counts = [rows_per_strip * row_bytes] * (strips - 1)
+        counts.append((height - (strips - 1) * rows_per_strip) * row_bytes)
+        big = height * row_bytes + 64 * (strips + 16) > 0xFFFFFFFF
+        offset_type = 16 if big else 4
+        word = 8 if big else 4  # Valores até esse tamanho ficam dentro da entrada
+
+        entries = [(256, 4, [width]), (257, 4, [height]), (258, 3, [8, 8, 8]), (259, 3, [1]),
+                   (262, 3, [2]), (273, offset_type, [0] * strips), (277, 3, [3]),
+                   (278, 4, [rows_per_strip]), (279, offset_type, counts), (284, 3, [1])]
+        head = (struct.pack('<2sHHHQ', b'II', 43, 8, 0, 16) if big
+                else struct.pack('<2sHI', b'II', 42, 8))
+        ifd_size = (8 + len(entries) * 20 + 8) if big else (2 + len(entries) * 12 + 4)
+        extra = sum(self._size(kind, values) for _, kind, values in entries
+                    if self._size(kind, values) > word)
+        data_start = len(head) + ifd_size + extra
+        entries[5] = (273, offset_type, [data_start + sum(counts[:i]) for i in range(strips)])
+
+        ifd = struct.pack('<Q' if big else '<H', len(entries))
+        extra_bytes = b''
+        for tag, kind, values in entries:
+            packed = struct.pack(f'<{len(values)}{self._FORMATS[kind]}', *values)
+            if len(packed) <= word:
+                value = packed.ljust(word, b'\0')
+            else:
+                value = struct.pack('<Q' if big else '<I', len(head) + ifd_size + len(extra_bytes))
+                extra_bytes += packed
+            ifd += struct.pack('<HHQ' if big else '<HHI', tag, kind, len(values)) + value
+        ifd += b'\0' * word  # Sem próximo IFD
+        self.f.write(head + ifd + extra_bytes)
+
+    @classmethod
+    def _size(cls, kind, values):
+        return struct.calcsize('<' + cls._FORMATS[kind]) * len(values)
+
+    def write(self, rgb):
+        self.f.write(np.ascontiguousarray(rgb).tobytes())
+
+    def close(self):
+        pass
+
+
+def export_image(params, path, output, color_scheme=0):
+    """Colore o arquivo de iterações faixa por faixa e grava o PNG ou TIFF
+
+    Cada faixa tem no máximo STRIP_BYTES de RGB; a imagem inteira nunca
+    fica na memória. Grava em output + '.part' e só troca no fim. A cor é a
+    do batch_render: suave (ponto fixo) ou por contagem, conforme o arquivo.
+    """
+    width, height, max_iter = params['width'], params['height'], params['max_iter']
+    colormap, colormap_rgb = _colormap(color_scheme)
+    rows = max(1, min(height, STRIP_BYTES // (width * 3)))
+    tiff = output.lower().endswith(('.tif', '.tiff'))
+    tmp = output + '.part'
+    with open(tmp, 'wb') as f:
+        stream = TiffStream(f, width, height, rows) if tiff else PngStream(f, width, height)
+        for row0 in range(0, height, rows):
+            band = _band(path, width, row0, min(height, row0 + rows), 'r')
+            if params['smooth']:
+                rgb = np.empty(band.shape + (3,), dtype=np.uint8)
+                smooth_palette_turbo(rgb, band, colormap)
+            else:
+                # Mesma coloração por contagem do batch_render
+                normalized = np.clip((band * (255.0 / max_iter)).astype(np.int32), 0, 255)
+                rgb = colormap_rgb[normalized]
+            del band
+            stream.write(rgb)
+        stream.close()
+    os.replace(tmp, output)
+
+
+def _peak_rss_mb():
+    """Pico de memória residente deste processo e dos workers (MB), se disponível"""
+    try:
+        import resource
+    except ImportError:
+        return None, None
+    scale = 1024 if sys.platform != 'darwin' else 1  # ru_maxrss: KB no Linux, bytes no macOS
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 1024**2
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale / 1024**2
+    return own, children
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Exporta pôsteres gigapixel (tiles -> arquivo mapeado -> PNG/TIFF por faixas). "
+                    "As cores seguem o batch_render: suaves onde o float64 basta, por contagem "
+                    "(faixas) no double-double e no zoom profundo.")
+    parser.add_argument('-o', '--output', default='poster.png', help="arquivo .png ou .tif")
+    parser.add_argument('--type', default='mandelbrot', choices=list(FRACTAL_KINDS))
+    parser.add_argument('--size', default='16384x16384', help="LARGURAxALTURA")
+    parser.add_argument('--center', nargs=2, default=('-0.5', '0.0'),
+                        help="centro (strings para zoom profundo)")
+    parser.add_argument('--zoom', type=float, default=1.0)
+    parser.add_argument('--max-iter', type=int, default=None,
+                        help="iterações fixas (padrão: cresce com o zoom)")
+    parser.add_argument('--julia-c', nargs=2, type=float, default=(-0.8, 0.156))
+    parser.add_argument('--color-scheme', type=int, default=0)
+    parser.add_argument('--interior', action='store_true',
+                        help="detecção de interior (cardioide/bulbo + ciclos)")
+    parser.add_argument('--tile', type=int, default=POSTER_TILE)
+    parser.add_argument('--work', default=None,
+                        help="arquivo de iterações (padrão: saída + '.iter'); o progresso fica em .json ao lado")
+    parser.add_argument('--keep-iterations', action='store_true',
+                        help="mantém o arquivo de iterações (recolorir sem renderizar de novo); "
+                             "guarda contagens suaves em ponto fixo (mu*65535/max_iter) ou inteiras")
+    parser.add_argument('-j', '--workers', type=int, default=None, help="processos de render")
+    parser.add_argument('--numba-threads', type=int, default=1,
+                        help="threads do numba por processo")
+    args = parser.parse_args(argv)
+
+    width, height = (int(v) for v in args.size.lower().split('x'))
+    params = poster_params(args.type, width, height, args.center, args.zoom, args.max_iter,
+                           args.julia_c, args.interior, args.tile)
+    work = args.work or args.output + '.iter'
+    progress = work + '.json'
+
+    print(f"🖼️ Pôster {width}x{height} ({width * height / 1e9:.2f} Gpx) -> {args.output} | "
+          f"iterações em {work} ({width * height * 2 / 1024**3:.2f} GB)", file=sys.stderr)
+    start = time.time()
+    rendered, total = render_iteration_file(params, work, progress, args.workers, args.numba_threads)
+    render_s = time.time() - start
+    export_image(params, work, args.output, args.color_scheme)
+    if not args.keep_iterations:
+        os.remove(work)
+        os.remove(progress)
+
+    own, children = _peak_rss_mb()
+    memory = f" | pico de memória {own:.0f} MB (workers {children:.0f} MB)" if own else ""
+    print(f"✅ {rendered}/{total} tiles renderizados em {render_s:.1f}s, exportado em "
+          f"{time.time() - start - render_s:.1f}s{memory}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+from decimal import Decimal, localcontext
+
+import numpy as np
+from numba import jit, prange
+
+from deep_zoom import deep_precision, to_decimal
+
+# Sem float32: com as contas de escape o kernel em lanes não rende mais em
+# float32 que em float64 (medido no benchmark), só perderia precisão
+PRECISION_TIERS = ('float64', 'double-double')
+
+# O espaçamento entre pixels precisa ficar 2^10 ulps acima do epsilon
+# absoluto do tipo; abaixo disso pixels vizinhos começam a se fundir
+TIER_MARGIN = 2.0 ** 10
+
+# Pixels iterados juntos pelo kernel em lockstep
+LANES = 16
+
+
+def choose_precision(spacing, scale=2.0):
+    """Aritmética mais barata que ainda resolve o espaçamento entre pixels
+
+    scale é a maior |coordenada| envolvida (as órbitas chegam a 2), pois o
+    epsilon absoluto cresce com ela.
+    """
+    scale = max(scale, 2.0)
+    if spacing >= TIER_MARGIN * np.finfo(np.float64).eps * scale:
+        return 'float64'
+    return 'double-double'
+
+
+@jit(nopython=True, nogil=True, cache=True, parallel=True, fastmath=True)
+def escape_lanes_turbo(xs, ys, max_iter, kind, cr=0.0, ci=0.0):
+    """Escape-time em float64, em blocos de LANES pixels iterados em lockstep
+
+    Pixels que já escaparam seguem iterando até o bloco inteiro terminar;
+    nas regiões lentas (perto da borda) os blocos andam juntos e o kernel
+    rende cerca de 2x o laço por pixel. len(xs) deve ser múltiplo de LANES.
+    """
+    h = ys.shape[0]
+    w = xs.shape[0]
+    result = np.empty((h, w), dtype=np.int32)
+
+    for i in prange(h):
+        y = ys[i]
+        zr = np.empty_like(xs[:LANES])
+        zi = np.empty_like(xs[:LANES])
+        ar = np.empty_like(xs[:LANES])
+        ai = np.empty_like(xs[:LANES])
+        count = np.empty(LANES, dtype=np.int32)
+        for j0 in range(0, w, LANES):
+            for l in range(LANES):
+                x = xs[j0 + l]
+                if kind == 1:  # Julia
+                    zr[l] = x
+                    zi[l] = y
+                    ar[l] = cr
+                    ai[l] = ci
+                else:
+                    zr[l] = 0.0
+                    zi[l] = 0.0
+                    ar[l] = x
+                    ai[l] = y
+                count[l] = max_iter
+
+            for n in range(max_iter):
+                alive = 0
+                for l in range(LANES):
+                    r2 = zr[l] * zr[l]
+                    i2 = zi[l] * zi[l]
+                    if count[l] == max_iter and r2 + i2 > 4.0:
+                        count[l] = n
+                    t = zr[l] * zi[l]
+                    if kind == 2:
+                        t = abs(t)
+                    elif kind == 3:
+                        t = -t  # Conjugado
+                    zi[l] = 2.0 * t + ai[l]
+                    zr[l] = r2 - i2 + ar[l]
+                    alive += count[l] == max_iter
+                if alive == 0:
+                    break
+
+            for l in range(LANES):
+                result[i, j0 + l] = count[l]
+    return result
+
+
+# Aritmética double-double (valor = hi + lo); sem fastmath, que desfaria as
+# transformações sem erro
+@jit(nopython=True, nogil=True, cache=True)
+def _two_sum(a, b):
+    s = a + b
+    bb = s - a
+    return s, (a - (s - bb)) + (b - bb)
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def _quick_two_sum(a, b):
+    s = a + b
+    return s, b - (s - a)
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def _two_prod(a, b):
+    p = a * b
+    t = 134217729.0 * a  # Divisão de Dekker: 2^27 + 1
+    ah = t - (t - a)
+    al = a - ah
+    t = 134217729.0 * b
+    bh = t - (t - b)
+    bl = b - bh
+    return p, ((ah * bh - p) + ah * bl + al * bh) + al * bl
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def _dd_add(ah, al, bh, bl):
+    s, e = _two_sum(ah, bh)
+    t, f = _two_sum(al, bl)
+    e += t
+    s, e = _quick_two_sum(s, e)
+    e += f
+    return _quick_two_sum(s, e)
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def _dd_mul(ah, al, bh, bl):
+    p, e = _two_prod(ah, bh)
+    e += ah * bl + al * bh
+    return _quick_two_sum(p, e)
+
+
+@jit(nopython=True, nogil=True, cache=True, parallel=True)
+def double_double_turbo(h, w, max_iter, cx_hi, cx_lo, cy_hi, cy_lo, dx, dy, kind, cr, ci):
+    """Escape-time em double-double (~32 dígitos) para zooms além do float64
+
+    O centro vem em dois float64 (hi + lo); o deslocamento de cada pixel é
+    somado em double-double, então pixels vizinhos nunca colapsam.
+    """
+    result = np.zeros((h, w), dtype=np.int32)
+    for i in prange(h):
+        py_hi, py_lo = _dd_add(cy_hi, cy_lo, (i - 0.5 * h) * dy, 0.0)
+        for j in range(w):
+            px_hi, px_lo = _dd_add(cx_hi, cx_lo, (j - 0.5 * w) * dx, 0.0)
+            if kind == 1:  # Julia
+                zr_hi, zr_lo, zi_hi, zi_lo = px_hi, px_lo, py_hi, py_lo
+                ar_hi, ar_lo, ai_hi, ai_lo = cr, 0.0, ci, 0.0
+            else:
+                zr_hi, zr_lo, zi_hi, zi_lo = 0.0, 0.0, 0.0, 0.0
+                ar_hi, ar_lo, ai_hi, ai_lo = px_hi, px_lo, py_hi, py_lo
+
+            result[i, j] = max_iter
+            for n in range(max_iter):
+                r2_hi, r2_lo = _dd_mul(zr_hi, zr_lo, zr_hi, zr_lo)
+                i2_hi, i2_lo = _dd_mul(zi_hi, zi_lo, zi_hi, zi_lo)
+                if r2_hi + i2_hi > 4.0:
+                    result[i, j] = n
+                    break
+                t_hi, t_lo = _dd_mul(zr_hi, zr_lo, zi_hi, zi_lo)
+                if kind == 2 and t_hi < 0.0:
+                    t_hi, t_lo = -t_hi, -t_lo
+                elif kind == 3:
+                    t_hi, t_lo = -t_hi, -t_lo  # Conjugado
+                zi_hi, zi_lo = _dd_add(2.0 * t_hi, 2.0 * t_lo, ai_hi, ai_lo)
+                d_hi, d_lo = _dd_add(r2_hi, r2_lo, -i2_hi, -i2_lo)
+                zr_hi, zr_lo = _dd_add(d_hi, d_lo, ar_hi, ar_lo)
+    return result
+
+
+def split_double_double(value, zoom=1.0):
+    """Decimal/str/float -> (hi, lo) com hi + lo ≈ valor em ~32 dígitos"""
+    with localcontext() as ctx:
+        ctx.prec = deep_precision(zoom)
+        value = to_decimal(value)
+        hi = float(value)
+        return hi, float(value - Decimal(hi))
+
+
+def render_tiered(h, w, max_iter, center_x, center_y, zoom, kind, cr=0.0, ci=0.0,
+                  square_pixels=False, tier=None, spacing=None):
+    """Escape-time com a aritmética escolhida pelo espaçamento dos pixels
+
+    A janela cobre 4/zoom nos dois eixos (ou só na horizontal com
+    square_pixels); tier força uma aritmética e spacing=(dx, dy) fixa o
+    espaçamento (uma faixa de um frame maior). Retorna (iterações, tier).
+    """
+    if spacing is None:
+        dx = 4.0 / zoom / w
+        dy = dx if square_pixels else 4.0 / zoom / h
+    else:
+        dx, dy = spacing
+    fx, fy = float(center_x), float(center_y)
+    if tier is None:
+        tier = choose_precision(min(dx, dy), max(abs(fx), abs(fy)))
+
+    if tier == 'double-double':
+        cx_hi, cx_lo = split_double_double(center_x, zoom)
+        cy_hi, cy_lo = split_double_double(center_y, zoom)
+        return double_double_turbo(h, w, max_iter, cx_hi, cx_lo, cy_hi, cy_lo,
+                                   dx, dy, kind, cr, ci), tier
+
+    padded = -(-w // LANES) * LANES
+    # Mesma grade dos kernels turbo: x_min + j * dx, com x_min = centro - w/2 * dx
+    xs = (fx - 0.5 * w * dx) + np.arange(padded) * dx
+    ys = (fy - 0.5 * h * dy) + np.arange(h) * dy
+    return escape_lanes_turbo(xs, ys, max_iter, kind, cr, ci)[:, :w], tier
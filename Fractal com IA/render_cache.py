@@ -0,0 +1,95 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# Contagens de iteração cabem em 16 bits (max_iter nunca passa de 5000)
+ITER_DTYPE = np.uint16
+ITER_LIMIT = np.iinfo(ITER_DTYPE).max
+
+
+def compact_iterations(iterations):
+    """Converte iterações para o formato compacto do cache (uint16)"""
+    if iterations.size and iterations.max() > ITER_LIMIT:
+        raise ValueError(f"Iterações acima de {ITER_LIMIT} não cabem no cache compacto")
+    return np.ascontiguousarray(iterations, dtype=ITER_DTYPE)
+
+
+def _nbytes(value):
+    """Tamanho de uma entrada: arrays pelo nbytes, bytes pelo comprimento"""
+    return value.nbytes if isinstance(value, np.ndarray) else len(value)
+
+
+class RenderCache:
+    """Cache LRU thread-safe de iterações, limitado por memória em bytes
+
+    Guarda as contagens de iteração em uint16 (a colorização é feita na
+    leitura) e mantém contadores de acertos, falhas e descartes. Com
+    compact=None guarda as entradas como vieram (ex.: PNGs já codificados).
+    """
+
+    def __init__(self, max_bytes, compact=compact_iterations):
+        self.max_bytes = max_bytes
+        self.compact = compact
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Retorna a entrada (ou None) e a marca como usada recentemente"""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, iterations):
+        """Guarda as iterações e descarta as menos usadas até caber no orçamento"""
+        value = self.compact(iterations) if self.compact else iterations
+        size = _nbytes(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes_used -= _nbytes(old)
+            self._entries[key] = value
+            self.bytes_used += size
+            while self.bytes_used > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.bytes_used -= _nbytes(evicted)
+                self.evictions += 1
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def clear(self):
+        """Esvazia o cache (os contadores são mantidos)"""
+        with self._lock:
+            self._entries.clear()
+            self.bytes_used = 0
+
+    def stats(self):
+        """Contadores do cache: entradas, bytes, acertos, falhas e descartes"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self.bytes_used,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
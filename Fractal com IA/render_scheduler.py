@@ -0,0 +1,153 @@
+import heapq
+import itertools
+import threading
+from collections import OrderedDict
+
+# Quantos produtos de pré-render (frames ou tiles) ficam registrados à espera
+# de serem usados; os mais antigos saem e contam como desperdício
+PREFETCH_MEMORY = 4096
+
+
+class RenderScheduler:
+    """Fila de pré-render com prioridades, cancelamento e estatísticas de acerto
+
+    Os jobs são (chave, parâmetros) com prioridade numérica (menor = antes).
+    retarget() troca o conjunto de jobs pendentes pela previsão nova da
+    janela: o que não está mais previsto é cancelado antes de rodar. Jobs já
+    em execução terminam (os kernels não são interrompíveis).
+
+    O acerto é medido pelos produtos: o worker registra o que renderizou
+    (chaves de frames ou de tiles) e a exibição consome com claim(); o que a
+    exibição teve de renderizar na hora conta como falha (miss()).
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._pending = {}  # chave -> entrada [prioridade, ordem, chave, parâmetros]
+        self._running = set()
+        self._order = itertools.count()
+        self._prefetched = OrderedDict()
+        self._cond = threading.Condition()
+        self.closed = False
+        self.submitted = 0
+        self.cancelled = 0
+        self.completed = 0
+        self.produced = 0
+        self.hits = 0
+        self.misses = 0
+        self.wasted = 0
+
+    def _push(self, key, params, priority):
+        old = self._pending.get(key)
+        if old is not None:
+            if old[0] == priority:
+                return
+            old[3] = None  # Entrada antiga vira lixo no heap
+        else:
+            self.submitted += 1
+        entry = [priority, next(self._order), key, params]
+        self._pending[key] = entry
+        heapq.heappush(self._heap, entry)
+
+    def _cancel(self, key):
+        entry = self._pending.pop(key)
+        entry[3] = None
+        self.cancelled += 1
+
+    def submit(self, key, params, priority=0):
+        """Agenda um job (se já pendente, fica a maior prioridade)"""
+        with self._cond:
+            if self.closed or key in self._running:
+                return
+            if key in self._pending:
+                priority = min(priority, self._pending[key][0])
+            self._push(key, params, priority)
+            self._cond.notify()
+
+    def retarget(self, jobs):
+        """Troca os pendentes por jobs = [(chave, parâmetros, prioridade)]
+
+        Pendentes fora da lista são cancelados; os que continuam previstos
+        só têm a prioridade atualizada.
+        """
+        with self._cond:
+            if self.closed:
+                return
+            wanted = {key for key, _, _ in jobs}
+            for key in [key for key in self._pending if key not in wanted]:
+                self._cancel(key)
+            for key, params, priority in jobs:
+                if key not in self._running:
+                    self._push(key, params, priority)
+            self._cond.notify_all()
+
+    def get(self, timeout=None):
+        """Próximo job (chave, parâmetros) pela prioridade, ou None (timeout/fechado)"""
+        with self._cond:
+            while True:
+                while self._heap and self._heap[0][3] is None:
+                    heapq.heappop(self._heap)
+                if self._heap or self.closed:
+                    break
+                if not self._cond.wait(timeout):
+                    return None
+            if self.closed:
+                return None
+            _, _, key, params = heapq.heappop(self._heap)
+            del self._pending[key]
+            self._running.add(key)
+            return key, params
+
+    def done(self, key, produced=()):
+        """Fim de um job; produced são as chaves (frames/tiles) que ele gerou"""
+        with self._cond:
+            self._running.discard(key)
+            self.completed += 1
+            for product in produced:
+                self._prefetched[product] = True
+                self.produced += 1
+            while len(self._prefetched) > PREFETCH_MEMORY:
+                self._prefetched.popitem(last=False)
+                self.wasted += 1
+
+    def claim(self, product):
+        """A exibição usou este produto; True (e conta acerto) se veio do pré-render"""
+        with self._cond:
+            if self._prefetched.pop(product, None) is None:
+                return False
+            self.hits += 1
+            return True
+
+    def miss(self, count=1):
+        """A exibição teve de renderizar `count` produtos na hora"""
+        with self._cond:
+            self.misses += count
+
+    def __len__(self):
+        with self._cond:
+            return len(self._pending)
+
+    def close(self):
+        """Descarta os pendentes e libera os workers bloqueados em get()"""
+        with self._cond:
+            self.closed = True
+            self._pending.clear()
+            self._heap.clear()
+            self._cond.notify_all()
+
+    def stats(self):
+        """Contadores da fila e taxa de acerto do pré-render"""
+        with self._cond:
+            demand = self.hits + self.misses
+            return {
+                'pending': len(self._pending),
+                'running': len(self._running),
+                'submitted': self.submitted,
+                'cancelled': self.cancelled,
+                'completed': self.completed,
+                'produced': self.produced,
+                'hits': self.hits,
+                'misses': self.misses,
+                'wasted': self.wasted,
+                'hit_rate': self.hits / demand if demand else 0.0,
+            }
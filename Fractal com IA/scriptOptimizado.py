@@ -3,10 +3,19 @@ import matplotlib.pyplot as plt
 from matplotlib.widgets import Button
 import random
 import colorsys
-from numba import jit
 import threading
 import time
 
+try:
+    from numba import jit
+    HAS_NUMBA = True
+except ImportError:
+    # Sem numba os laços abaixo rodariam em Python puro; os kernels são
+    # trocados pelo motor NumPy vetorizado logo após as definições
+    HAS_NUMBA = False
+    def jit(**kwargs):
+        return lambda f: f
+
 # Funções otimizadas com Numba JIT para cálculos ultra-rápidos
 @jit(nopython=True)
 def mandelbrot_set(h, w, max_iter, x_min, x_max, y_min, y_max):
@@ -37,6 +46,62 @@ def mandelbrot_set(h, w, max_iter, x_min, x_max, y_min, y_max):
     
     return result
 
+@jit(nopython=True)
+def mandelbrot_set_interior(h, w, max_iter, x_min, x_max, y_min, y_max):
+    """Mandelbrot com detecção de interior (cardioide/bulbo + ciclos)
+    
+    Produz exatamente o mesmo resultado de mandelbrot_set e retorna também
+    quantas iterações foram economizadas.
+    """
+    result = np.zeros((h, w), dtype=np.int32)
+    saved = 0
+    
+    for i in range(h):
+        for j in range(w):
+            c_real = x_min + (x_max - x_min) * j / w
+            c_imag = y_min + (y_max - y_min) * i / h
+            
+            # Cardioide principal e bulbo de período 2
+            xq = c_real - 0.25
+            q = xq*xq + c_imag*c_imag
+            if q * (q + xq) <= 0.25 * c_imag*c_imag or (c_real + 1)**2 + c_imag*c_imag <= 0.0625:
+                result[i, j] = max_iter
+                saved += max_iter
+                continue
+            
+            z_real = 0.0
+            z_imag = 0.0
+            # Ciclo exato do estado (Brent) => ponto nunca escapa
+            saved_real = 0.0
+            saved_imag = 0.0
+            power = 1
+            lam = 0
+            
+            for n in range(max_iter):
+                if z_real*z_real + z_imag*z_imag > 4:
+                    result[i, j] = n
+                    break
+                
+                new_real = z_real*z_real - z_imag*z_imag + c_real
+                new_imag = 2*z_real*z_imag + c_imag
+                z_real = new_real
+                z_imag = new_imag
+                
+                if z_real == saved_real and z_imag == saved_imag:
+                    result[i, j] = max_iter
+                    saved += max_iter - n - 1
+                    break
+                lam += 1
+                if lam == power:
+                    saved_real = z_real
+                    saved_imag = z_imag
+                    power *= 2
+                    lam = 0
+            else:
+                result[i, j] = max_iter
+    
+    return result, saved
+
 @jit(nopython=True)
 def julia_set(h, w, max_iter, x_min, x_max, y_min, y_max, c_real, c_imag):
     """Versão ultra-otimizada do conjunto de Julia"""
@@ -116,6 +181,111 @@ def tricorn_set(h, w, max_iter, x_min, x_max, y_min, y_max):
     
     return result
 
+@jit(nopython=True)
+def fractal_set_masked(result, todo, z_state_real, z_state_imag, xs, ys, max_iter, kind, c_real, c_imag,
+                       interior=False):
+    """Calcula só os pixels marcados em `todo`, em coordenadas explícitas
+    
+    kind: 0 Mandelbrot, 1 Julia, 2 Burning Ship, 3 Tricorn (mesmas fórmulas
+    das funções acima). Pixels marcados com result > 0 retomam a iteração de
+    onde pararam: result guarda o n já feito e z_state o z daquele ponto (NaN
+    força recomeçar do zero). Quem não escapa deixa o z em z_state para uma
+    retomada futura. Com interior, pontos no cardioide/bulbo (Mandelbrot) e
+    órbitas que repetem o estado exato (Brent, todos os tipos) param cedo
+    com o mesmo resultado. Retorna (pixels calculados, iterações retomadas,
+    iterações economizadas pela detecção de interior).
+    """
+    h, w = result.shape
+    count = 0
+    skipped = 0
+    interior_saved = 0
+    
+    for i in range(h):
+        for j in range(w):
+            if not todo[i, j]:
+                continue
+            count += 1
+            
+            if kind == 1:
+                a = c_real
+                b = c_imag
+            else:
+                a = xs[j]
+                b = ys[i]
+            
+            start = result[i, j]
+            if start > 0 and not np.isnan(z_state_real[i, j]):
+                z_real = z_state_real[i, j]
+                z_imag = z_state_imag[i, j]
+                skipped += start
+            else:
+                start = 0
+                if kind == 1:
+                    z_real = xs[j]
+                    z_imag = ys[i]
+                else:
+                    z_real = 0.0
+                    z_imag = 0.0
+            
+            if interior and kind == 0:
+                # Cardioide principal e bulbo de período 2
+                xq = a - 0.25
+                q = xq*xq + b*b
+                if q * (q + xq) <= 0.25 * b*b or (a + 1)**2 + b*b <= 0.0625:
+                    result[i, j] = max_iter
+                    interior_saved += max_iter - start
+                    continue
+            
+            # Brent a partir do estado inicial (do zero ou retomado)
+            saved_real = z_real
+            saved_imag = z_imag
+            power = 1
+            lam = 0
+            
+            for n in range(start, max_iter):
+                if z_real*z_real + z_imag*z_imag > 4:
+                    result[i, j] = n
+                    break
+                
+                if kind == 2:
+                    new_real = abs(z_real)*abs(z_real) - abs(z_imag)*abs(z_imag) + a
+                    new_imag = 2*abs(z_real)*abs(z_imag) + b
+                elif kind == 3:
+                    new_real = z_real*z_real - z_imag*z_imag + a
+                    new_imag = -2*z_real*z_imag + b
+                else:
+                    new_real = z_real*z_real - z_imag*z_imag + a
+                    new_imag = 2*z_real*z_imag + b
+                z_real = new_real
+                z_imag = new_imag
+                
+                if interior:
+                    if z_real == saved_real and z_imag == saved_imag:
+                        # Ciclo exato: nunca escapa; o z (no ciclo) fica para a retomada
+                        result[i, j] = max_iter
+                        z_state_real[i, j] = z_real
+                        z_state_imag[i, j] = z_imag
+                        interior_saved += max_iter - n - 1
+                        break
+                    lam += 1
+                    if lam == power:
+                        saved_real = z_real
+                        saved_imag = z_imag
+                        power *= 2
+                        lam = 0
+            else:
+                result[i, j] = max_iter
+                z_state_real[i, j] = z_real
+                z_state_imag[i, j] = z_imag
+    
+    return count, skipped, interior_saved
+
+if not HAS_NUMBA:
+    from numpy_engine import (burning_ship_set, fractal_set_masked, julia_set,
+                              mandelbrot_set, tricorn_set)
+
+FRACTAL_KINDS = {'mandelbrot': 0, 'julia': 1, 'burning_ship': 2, 'tricorn': 3}
+
 class FastFractalGenerator:
     def __init__(self):
         # Resolução reduzida para performance (pode ajustar)
@@ -136,6 +306,19 @@ class FastFractalGenerator:
             self.julia_c_real = random.uniform(-2, 2)
             self.julia_c_imag = random.uniform(-2, 2)
         
+        # Detecção de interior (opcional): com reuse_buffer nos quatro tipos
+        # (ciclos de Brent, mais cardioide/bulbo no Mandelbrot); sem ele, só
+        # no Mandelbrot
+        self.interior_check = False
+        self.interior_saved = 0
+        
+        # Reaproveita amostras do frame anterior que coincidem com as novas
+        # (zoom por fator inteiro no mesmo centro cai exatamente na grade).
+        # Pixels que não escaparam guardam (zr, zi, n): aumentar max_iter só
+        # continua esses pixels, e trocar as cores não itera nada
+        self.reuse_buffer = True
+        self._last_frame = None
+        
         # Cache para colormap
         self._color_cache = {}
         self.generate_colormap()
@@ -167,6 +350,70 @@ class FastFractalGenerator:
         
         self.colormap = colors
     
+    def _sample_grid(self):
+        """Coordenadas exatas das amostras: centro + k * passo
+        
+        Com zoom por fator 2 o passo cai pela metade sem arredondamento, então
+        toda amostra antiga com k par na grade nova tem o mesmo valor em bits.
+        """
+        step_x = 4.0 / self.zoom / self.width
+        step_y = 4.0 / self.zoom / self.height
+        xs = self.center_x + (np.arange(self.width) - self.width // 2) * step_x
+        ys = self.center_y + (np.arange(self.height) - self.height // 2) * step_y
+        return xs, ys
+    
+    def _generate_iterations_reused(self):
+        """Calcula as iterações copiando as amostras coincidentes do último frame
+        
+        Amostras que não escaparam com o max_iter antigo são retomadas do z
+        salvo em vez de recomeçar do zero.
+        """
+        xs, ys = self._sample_grid()
+        iterations = np.zeros((self.height, self.width), dtype=np.int32)
+        todo = np.ones((self.height, self.width), dtype=np.bool_)
+        z_real = np.full((self.height, self.width), np.nan)
+        z_imag = np.full((self.height, self.width), np.nan)
+        params = (self.fractal_type, getattr(self, 'julia_c_real', 0.0), getattr(self, 'julia_c_imag', 0.0))
+        
+        last = self._last_frame
+        if last is not None and last['params'] == params:
+            _, new_j, old_j = np.intersect1d(xs, last['xs'], assume_unique=True, return_indices=True)
+            _, new_i, old_i = np.intersect1d(ys, last['ys'], assume_unique=True, return_indices=True)
+            if len(new_i) and len(new_j):
+                new_ix, old_ix = np.ix_(new_i, new_j), np.ix_(old_i, old_j)
+                old = last['iterations'][old_ix]
+                # Quem escapou com o orçamento antigo continua igual; quem não
+                # escapou é retomado se o novo max_iter for maior
+                if self.max_iter <= last['max_iter']:
+                    valid = np.ones(old.shape, dtype=np.bool_)
+                else:
+                    valid = old < last['max_iter']
+                iterations[new_ix] = np.minimum(old, self.max_iter)
+                todo[new_ix] = ~valid
+                # O z salvo só corresponde à contagem se ela não foi cortada
+                resumable = (old == last['max_iter']) & (last['max_iter'] <= self.max_iter)
+                z_real[new_ix] = np.where(resumable, last['z_real'][old_ix], np.nan)
+                z_imag[new_ix] = np.where(resumable, last['z_imag'][old_ix], np.nan)
+        
+        kind = FRACTAL_KINDS[self.fractal_type]
+        if kind == 1:
+            c_real, c_imag = self.julia_c_real, self.julia_c_imag
+        else:
+            c_real, c_imag = 0.0, 0.0
+        computed, resumed, saved = fractal_set_masked(iterations, todo, z_real, z_imag, xs, ys,
+                                                      self.max_iter, kind, c_real, c_imag,
+                                                      interior=self.interior_check)
+        if self.interior_check:
+            self.interior_saved = saved
+        
+        self._last_frame = {'params': params, 'xs': xs, 'ys': ys,
+                            'iterations': iterations, 'max_iter': self.max_iter,
+                            'z_real': z_real, 'z_imag': z_imag}
+        reused = iterations.size - computed
+        print(f"♻️ Reaproveitados {reused} de {iterations.size} pixels ({100*reused/iterations.size:.0f}%), "
+              f"{resumed} iterações retomadas")
+        return iterations
+    
     def generate_fractal(self):
         """Gera fractal usando funções otimizadas"""
         start_time = time.time()
@@ -177,8 +424,15 @@ class FastFractalGenerator:
         y_min = self.center_y - 2.0 / self.zoom
         y_max = self.center_y + 2.0 / self.zoom
         
-        # Chama função otimizada correspondente
-        if self.fractal_type == 'mandelbrot':
+        # Chama função otimizada correspondente (cada caminho com detecção de
+        # interior preenche interior_saved)
+        self.interior_saved = None
+        if self.reuse_buffer:
+            iterations = self._generate_iterations_reused()
+        elif self.fractal_type == 'mandelbrot' and self.interior_check and HAS_NUMBA:
+            iterations, self.interior_saved = mandelbrot_set_interior(
+                self.height, self.width, self.max_iter, x_min, x_max, y_min, y_max)
+        elif self.fractal_type == 'mandelbrot':
             iterations = mandelbrot_set(self.height, self.width, self.max_iter, 
                                       x_min, x_max, y_min, y_max)
         elif self.fractal_type == 'julia':
@@ -197,6 +451,8 @@ class FastFractalGenerator:
         
         calc_time = time.time() - start_time
         print(f"⚡ Fractal calculado em {calc_time:.3f}s")
+        if self.interior_saved is not None:
+            print(f"🕳️ Interior: {self.interior_saved} iterações economizadas")
         
         return fractal_image
     
@@ -226,6 +482,25 @@ class FastFractalGenerator:
         self.generate_colormap()
         self.update_fractal()
     
+    def refine(self, event):
+        """Dobra max_iter na mesma vista: só os pixels que não escaparam continuam"""
+        self.max_iter *= 2
+        self.generate_colormap()
+        self.update_fractal()
+    
+    def cycle_colors(self, event):
+        """Troca o esquema de cores recolorindo as contagens guardadas"""
+        self.color_scheme = (self.color_scheme + 1) % 5
+        self.generate_colormap()
+        last = self._last_frame
+        xs, ys = self._sample_grid()
+        if (last is None or last['max_iter'] != self.max_iter
+                or not np.array_equal(last['xs'], xs) or not np.array_equal(last['ys'], ys)):
+            self.update_fractal()
+            return
+        self.im.set_array(self.colormap[last['iterations']])
+        self.fig.canvas.draw_idle()
+    
     def new_fractal(self, event):
         """Gera novo fractal rapidamente"""
         print("🔄 Gerando novo fractal...")
@@ -289,16 +564,22 @@ class FastFractalGenerator:
         ax_zoom_out = plt.axes([0.02, 0.80, 0.1, 0.04])
         ax_reset = plt.axes([0.02, 0.75, 0.1, 0.04])
         ax_new = plt.axes([0.02, 0.70, 0.1, 0.04])
+        ax_refine = plt.axes([0.02, 0.65, 0.1, 0.04])
+        ax_colors = plt.axes([0.02, 0.60, 0.1, 0.04])
         
         btn_zoom_in = Button(ax_zoom_in, 'Zoom +')
         btn_zoom_out = Button(ax_zoom_out, 'Zoom -')
         btn_reset = Button(ax_reset, 'Reset')
         btn_new = Button(ax_new, 'Novo')
+        btn_refine = Button(ax_refine, 'Refinar')
+        btn_colors = Button(ax_colors, 'Cores')
         
         btn_zoom_in.on_clicked(self.zoom_in)
         btn_zoom_out.on_clicked(self.zoom_out)
         btn_reset.on_clicked(self.reset_view)
         btn_new.on_clicked(self.new_fractal)
+        btn_refine.on_clicked(self.refine)
+        btn_colors.on_clicked(self.cycle_colors)
         
         # Instruções compactas
         instructions = [
@@ -307,6 +588,8 @@ class FastFractalGenerator:
             '• Clique = Centralizar',
             '• Botões = Zoom',  
             '• "Novo" = Outro fractal',
+            '• "Refinar" = Mais iterações',
+            '• "Cores" = Recolorir',
             '',
             '⚡ Otimizado com Numba!',
             f'📐 Resolução: {self.width}x{self.height}',
@@ -316,7 +599,7 @@ class FastFractalGenerator:
         for i, text in enumerate(instructions):
             weight = 'bold' if '🚀' in text else 'normal'
             size = 11 if '🚀' in text else 9
-            self.fig.text(0.02, 0.65 - i*0.04, text, fontsize=size, weight=weight)
+            self.fig.text(0.02, 0.55 - i*0.04, text, fontsize=size, weight=weight)
         
         plt.show()
 
@@ -333,17 +616,10 @@ if __name__ == "__main__":
     print("   • Resolução adaptativa")
     print("\n🎯 Preparando fractal...")
     
-    try:
-        fractal_gen = FastFractalGenerator()
-        fractal_gen.show()
-    except ImportError:
+    if not HAS_NUMBA:
         print("\n❌ Para máxima performance, instale:")
         print("   pip install numba")
-        print("\n🔄 Executando versão básica otimizada...")
-        
-        # Fallback sem numba (ainda otimizado)
-        import sys
-        sys.modules['numba'] = type(sys)('numba')
-        sys.modules['numba'].jit = lambda **kwargs: lambda f: f
-        fractal_gen = FastFractalGenerator()
-        fractal_gen.show()
\ No newline at end of file
+        print("\n🔄 Usando o motor NumPy vetorizado...")
+    
+    fractal_gen = FastFractalGenerator()
+    fractal_gen.show()
@@ -1,122 +1,826 @@
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.widgets import Button
+import atexit
+import contextlib
+import copy
+import functools
+import importlib
 import random
 import colorsys
+import numba
 from numba import jit, prange
+from numba.core.registry import CPUDispatcher as Dispatcher
+import sys
 import threading
 import time
+import math
 from collections import deque
-import queue
+import deep_zoom
+import formulas
+import precision
+import transition
+from deep_zoom import (DEEP_ZOOM_THRESHOLD, FRACTAL_KINDS, antenna_misiurewicz, julia_repelling_points,
+                       render_deep, to_decimal, offset_center)
+from frame_clock import FrameBuffer, FrameClock
+from formulas import MULTIBROT_DEGREE, escape_kernel, formula_step
+from render_cache import RenderCache
+from render_scheduler import RenderScheduler
+from precision import choose_precision, render_tiered
+from symmetry import mirror_tiles, tile_mirror_plan
+from telemetry import ITERATION_BUCKETS, Metrics
+from transition import ZoomTransition
 
-# Funções ultra-otimizadas com paralelização
-@jit(nopython=True, parallel=True, fastmath=True)
-def mandelbrot_turbo(h, w, max_iter, x_min, x_max, y_min, y_max):
-    """Mandelbrot com paralelização e matemática rápida"""
+def _threadsafe_layer():
+    """Pede ao numba uma camada de threads que aceita chamadas simultâneas
+    
+    Os kernels paralelos rodam ao mesmo tempo na exibição, no pré-render,
+    no warm-up e na animação: isso exige TBB ou OpenMP (o workqueue aborta
+    o processo com "Concurrent access has been detected"). O TBB vem antes:
+    o OpenMP do GCC aborta os processos filhos de um fork() feito depois de
+    uma região paralela (batch_render, poster_export). A saída com TBB é
+    segura porque _start_kernel_thread sobe o pool na thread principal e
+    as threads de kernels são juntadas no atexit. Precisa valer antes da
+    primeira chamada paralela; uma escolha explícita em
+    NUMBA_THREADING_LAYER é respeitada. False se só sobra o workqueue.
+    """
+    layer = numba.config.THREADING_LAYER
+    if layer != 'default':
+        return layer in ('threadsafe', 'safe', 'tbb', 'omp')
+    for pool in ('tbbpool', 'omppool'):
+        try:
+            importlib.import_module(f'numba.np.ufunc.{pool}')
+        except ImportError:
+            continue
+        numba.config.THREADING_LAYER = 'threadsafe'
+        return True
+    return False
+
+# Sem camada thread-safe as chamadas paralelas entram uma de cada vez
+PARALLEL_LOCK = contextlib.nullcontext() if _threadsafe_layer() else threading.RLock()
+
+def _serialized(method):
+    """Método que chama kernels paralelos: passa pelo PARALLEL_LOCK"""
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        with PARALLEL_LOCK:
+            return method(*args, **kwargs)
+    return wrapper
+
+# Kernels paralelos por tipo: um só laço (formulas.py) especializado na fórmula
+mandelbrot_turbo = escape_kernel('mandelbrot')
+julia_turbo = escape_kernel('julia')
+burning_ship_turbo = escape_kernel('burning_ship')
+tricorn_turbo = escape_kernel('tricorn')
+
+@jit(nopython=True, nogil=True, cache=True, fastmath=True, inline='always')
+def _escape_orbit(formula, zr, zi, x, y, max_iter):
+    """Laço de escape de um ponto; chamado com `formula` constante"""
+    zr2, zi2 = zr * zr, zi * zi
+    for n in range(max_iter):
+        if zr2 + zi2 > 4.0:
+            return n
+        zr, zi = formula_step(formula, zr, zi, zr2, zi2, x, y, MULTIBROT_DEGREE)
+        zr2 = zr * zr
+        zi2 = zi * zi
+    return max_iter
+
+@jit(nopython=True, nogil=True, cache=True, fastmath=True)
+def escape_point(kind, x, y, max_iter, cr, ci):
+    """Iterações de um único ponto, com o mesmo passo dos kernels de formulas.py
+    
+    O tipo é decidido fora do laço: cada ramo tem o laço especializado.
+    """
+    if kind == 1:  # Julia
+        return _escape_orbit(0, x, y, cr, ci, max_iter)
+    if kind == 2:
+        return _escape_orbit(2, 0.0, 0.0, x, y, max_iter)
+    if kind == 3:
+        return _escape_orbit(3, 0.0, 0.0, x, y, max_iter)
+    return _escape_orbit(0, 0.0, 0.0, x, y, max_iter)
+
+@jit(nopython=True, nogil=True, cache=True, fastmath=True, inline='always')
+def _interior_orbit(formula, zr, zi, x, y, max_iter):
+    """Laço de escape com detecção de ciclos (Brent); `formula` constante
+    
+    Compara com um ponto salvo em intervalos que dobram. A checagem fica
+    logo após o teste de escape para não alterar a aritmética do passo (com
+    fastmath, mexer no passo muda as FMAs e a órbita deixa de bater).
+    """
+    saved_r, saved_i = 1e300, 1e300
+    power = 1
+    lam = 0
+    zr2, zi2 = zr * zr, zi * zi
+    for n in range(max_iter):
+        if zr2 + zi2 > 4.0:
+            return n, 0
+        if zr == saved_r and zi == saved_i:
+            return max_iter, max_iter - n
+        lam += 1
+        if lam == power:
+            saved_r, saved_i = zr, zi
+            power *= 2
+            lam = 0
+        zr, zi = formula_step(formula, zr, zi, zr2, zi2, x, y, MULTIBROT_DEGREE)
+        zr2 = zr * zr
+        zi2 = zi * zi
+    return max_iter, 0
+
+@jit(nopython=True, nogil=True, cache=True, fastmath=True)
+def escape_point_interior(kind, x, y, max_iter, cr, ci):
+    """Como escape_point, mas detecta pontos interiores cedo
+    
+    Retorna (iterações, iterações economizadas). O teste do cardioide/bulbo
+    só vale para Mandelbrot; a detecção de ciclos exige repetição exata do
+    estado (zr, zi), então o ponto realmente nunca escaparia.
+    """
+    if kind == 1:  # Julia
+        return _interior_orbit(0, x, y, cr, ci, max_iter)
+    if kind == 2:
+        return _interior_orbit(2, 0.0, 0.0, x, y, max_iter)
+    if kind == 3:
+        return _interior_orbit(3, 0.0, 0.0, x, y, max_iter)
+    
+    xq = x - 0.25
+    q = xq * xq + y * y
+    if q * (q + xq) <= 0.25 * y * y or (x + 1.0) * (x + 1.0) + y * y <= 0.0625:
+        return max_iter, max_iter
+    return _interior_orbit(0, 0.0, 0.0, x, y, max_iter)
+
+@jit(nopython=True, nogil=True, cache=True, parallel=True, fastmath=True)
+def interior_turbo(h, w, max_iter, x_min, x_max, y_min, y_max, kind, cr=0.0, ci=0.0):
+    """Escape-time com detecção de interior para os quatro tipos
+    
+    Retorna (iterações, total de iterações economizadas).
+    """
     result = np.zeros((h, w), dtype=np.int32)
+    saved = np.zeros(h, dtype=np.int64)
     dx = (x_max - x_min) / w
     dy = (y_max - y_min) / h
     
     for i in prange(h):
         y = y_min + i * dy
+        row_saved = 0
         for j in range(w):
-            x = x_min + j * dx
-            
-            # Otimização: usar variáveis locais
+            n, s = escape_point_interior(kind, x_min + j * dx, y, max_iter, cr, ci)
+            result[i, j] = n
+            row_saved += s
+        saved[i] = row_saved
+    return result, saved.sum()
+
+# Raio de escape² da coloração suave: bem acima de 4 para log|z| variar contínuo
+SMOOTH_BAILOUT = 256.0
+
+# Contagem suave em ponto fixo (tiles e arquivos uint16): mu * SMOOTH_LEVELS /
+# max_iter no exterior, SMOOTH_LEVELS no interior
+SMOOTH_LEVELS = 65535
+
+@jit(nopython=True, nogil=True, cache=True, fastmath=True)
+def smooth_fixed(kind, px, py, max_iter, cr, ci, interior):
+    """Contagem suave de um ponto em ponto fixo, já na escala da paleta
+    
+    O exterior fica em [0, SMOOTH_LEVELS - 1], o interior vale
+    SMOOTH_LEVELS. Com interior, usa o teste do cardioide/bulbo e a detecção
+    de ciclos de escape_point_interior. Retorna (valor, iterações economizadas).
+    """
+    if kind == 1:  # Julia
+        zr, zi = px, py
+        x, y = cr, ci
+    else:
+        zr, zi = 0.0, 0.0
+        x, y = px, py
+        if interior and kind == 0:
+            xq = x - 0.25
+            q = xq * xq + y * y
+            if q * (q + xq) <= 0.25 * y * y or (x + 1.0) * (x + 1.0) + y * y <= 0.0625:
+                return SMOOTH_LEVELS, max_iter
+    
+    saved_r, saved_i = 1e300, 1e300
+    power = 1
+    lam = 0
+    n = 0
+    zr2, zi2 = zr * zr, zi * zi
+    while n < max_iter and zr2 + zi2 <= SMOOTH_BAILOUT:
+        if interior:
+            if zr == saved_r and zi == saved_i:
+                return SMOOTH_LEVELS, max_iter - n
+            lam += 1
+            if lam == power:
+                saved_r, saved_i = zr, zi
+                power *= 2
+                lam = 0
+        zr, zi = formula_step(kind, zr, zi, zr2, zi2, x, y, MULTIBROT_DEGREE)
+        zr2 = zr * zr
+        zi2 = zi * zi
+        n += 1
+    
+    m = zr2 + zi2
+    if m <= SMOOTH_BAILOUT:
+        return SMOOTH_LEVELS, 0
+    mu = n + 1.0 - math.log(0.5 * math.log(m)) / math.log(2.0)
+    return _smooth_level(mu, max_iter), 0
+
+@jit(nopython=True, nogil=True, cache=True, fastmath=True, inline='always')
+def _smooth_level(mu, max_iter):
+    """Contagem suave mu do exterior em ponto fixo"""
+    return min(int(max(mu, 0.0) * (SMOOTH_LEVELS / max_iter) + 0.5), SMOOTH_LEVELS - 1)
+
+# Estado retomável por pixel, num array (h, w, 3) com (zr, zi, n) contíguos:
+# n >= 0 é uma órbita que não escapou em n iterações; os marcadores dizem que
+# o pixel ainda não foi iterado, que escapou (zi guarda a contagem de escape e
+# zr a contagem suave) ou que é interior provado (cardioide/bulbo ou ciclo)
+RESUME_FRESH = -1.0
+RESUME_ESCAPED = -2.0
+RESUME_INTERIOR = -3.0
+
+@jit(nopython=True, nogil=True, cache=True, fastmath=True, inline='always')
+def _resume_orbit(formula, zr, zi, x, y, k, max_iter, bailout, interior):
+    """Laço de escape a partir da iteração k; `formula` constante
+    
+    Com interior, detecta ciclos como _interior_orbit (a contagem de Brent
+    recomeça no estado retomado, o que só atrasa a detecção). Retorna
+    (zr, zi, |z|², iterações, ciclo encontrado).
+    """
+    saved_r, saved_i = 1e300, 1e300
+    power = 1
+    lam = 0
+    zr2, zi2 = zr * zr, zi * zi
+    while k < max_iter and zr2 + zi2 <= bailout:
+        if interior:
+            if zr == saved_r and zi == saved_i:
+                return zr, zi, zr2 + zi2, k, True
+            lam += 1
+            if lam == power:
+                saved_r, saved_i = zr, zi
+                power *= 2
+                lam = 0
+        zr, zi = formula_step(formula, zr, zi, zr2, zi2, x, y, MULTIBROT_DEGREE)
+        zr2 = zr * zr
+        zi2 = zi * zi
+        k += 1
+    return zr, zi, zr2 + zi2, k, False
+
+@jit(nopython=True, nogil=True, cache=True, fastmath=True)
+def resume_point(kind, px, py, max_iter, cr, ci, interior, smooth, state, i, j):
+    """Ponto da subdivisão continuando o estado guardado em state[i, j]
+    
+    Um pixel que não escapou continua da iteração n em vez de recomeçar de
+    z0; um que já escapou só é reescalado para max_iter. O resultado é o
+    mesmo de _subdivision_point sem estado (inclusive com max_iter menor
+    que o do estado) e o estado é atualizado para o próximo aumento.
+    Retorna (valor, iterações economizadas pela detecção de interior).
+    """
+    top = SMOOTH_LEVELS if smooth else max_iter
+    n = state[i, j, 2]
+    if n == RESUME_INTERIOR:
+        return top, 0
+    if n == RESUME_ESCAPED:
+        escaped = int(state[i, j, 1])
+        if smooth:
+            return (_smooth_level(state[i, j, 0], max_iter) if escaped <= max_iter else top), 0
+        return min(escaped, max_iter), 0
+    
+    if kind == 1:  # Julia
+        x, y = cr, ci
+    else:
+        x, y = px, py
+    if n == RESUME_FRESH:
+        start = 0
+        if kind == 1:
+            zr, zi = px, py
+        else:
             zr, zi = 0.0, 0.0
-            zr2, zi2 = 0.0, 0.0
+            if interior and kind == 0:
+                xq = x - 0.25
+                q = xq * xq + y * y
+                if q * (q + xq) <= 0.25 * y * y or (x + 1.0) * (x + 1.0) + y * y <= 0.0625:
+                    state[i, j, 2] = RESUME_INTERIOR
+                    return top, max_iter
+    else:
+        start = int(n)
+        zr, zi = state[i, j, 0], state[i, j, 1]
+    
+    # Laço especializado por fórmula, como no escape_point
+    bailout = SMOOTH_BAILOUT if smooth else 4.0
+    if kind == 2:
+        zr, zi, m, k, cycle = _resume_orbit(2, zr, zi, x, y, start, max_iter, bailout, interior)
+    elif kind == 3:
+        zr, zi, m, k, cycle = _resume_orbit(3, zr, zi, x, y, start, max_iter, bailout, interior)
+    else:
+        zr, zi, m, k, cycle = _resume_orbit(0, zr, zi, x, y, start, max_iter, bailout, interior)
+    if cycle:
+        state[i, j, 2] = RESUME_INTERIOR
+        return top, max_iter - k
+    
+    if m <= bailout:
+        if k > start or n == RESUME_FRESH:
+            state[i, j, 0], state[i, j, 1], state[i, j, 2] = zr, zi, k
+        return top, 0
+    state[i, j, 1], state[i, j, 2] = k, RESUME_ESCAPED
+    if not smooth:
+        return min(k, max_iter), 0
+    mu = k + 1.0 - math.log(0.5 * math.log(m)) / math.log(2.0)
+    state[i, j, 0] = mu
+    return _smooth_level(mu, max_iter), 0
+
+@jit(nopython=True, nogil=True, cache=True, fastmath=True)
+def _subdivision_point(kind, x, y, max_iter, cr, ci, interior, smooth, state, i, j):
+    """Ponto da subdivisão: contagem inteira ou suave em ponto fixo
+    
+    Com state (ver resume_point) a órbita continua do estado guardado.
+    """
+    if state is not None:
+        return resume_point(kind, x, y, max_iter, cr, ci, interior, smooth, state, i, j)
+    if smooth:
+        return smooth_fixed(kind, x, y, max_iter, cr, ci, interior)
+    if interior:
+        return escape_point_interior(kind, x, y, max_iter, cr, ci)
+    return escape_point(kind, x, y, max_iter, cr, ci), 0
+
+@jit(nopython=True, nogil=True, cache=True, parallel=True, fastmath=True)
+def mariani_silver_turbo(canvas, tile_mask, tile, col0, row0, spacing, max_iter, kind,
+                         cr=0.0, ci=0.0, min_size=4, interior=False, smooth=False, state=None):
+    """Subdivisão de Mariani-Silver: calcula só as bordas dos retângulos
+    
+    Se toda a borda tem a mesma contagem o interior é preenchido sem iterar;
+    caso contrário o retângulo é dividido em 4 até min_size. Trabalha sobre
+    um canvas alinhado à grade de tiles: só os tiles marcados em tile_mask
+    são renderizados, em paralelo. O pixel (i, j) do canvas fica em
+    ((col0 + j) * spacing, (row0 + i) * spacing). Com smooth o canvas
+    recebe a contagem suave em ponto fixo (smooth_fixed); aí só o interior
+    tem bordas uniformes. Com state ((zr, zi, n) de cada pixel do canvas,
+    ver resume_point) os pixels continuam de onde pararam e o estado é
+    atualizado; os preenchidos sem iterar ficam como estavam. Retorna
+    (pixels iterados, iterações economizadas pela detecção de interior).
+    """
+    done = np.zeros(canvas.shape, dtype=np.bool_)
+    tiles_y, tiles_x = tile_mask.shape
+    computed = np.zeros(tiles_x * tiles_y, dtype=np.int64)
+    saved = np.zeros(tiles_x * tiles_y, dtype=np.int64)
+    
+    for t in prange(tiles_x * tiles_y):
+        if not tile_mask[t // tiles_x, t % tiles_x]:
+            continue
+        # Pilha explícita de retângulos (x0, y0, x1, y1) inclusivos
+        stack = np.empty((64, 4), dtype=np.int64)
+        stack[0, 0] = (t % tiles_x) * tile
+        stack[0, 1] = (t // tiles_x) * tile
+        stack[0, 2] = stack[0, 0] + tile - 1
+        stack[0, 3] = stack[0, 1] + tile - 1
+        top = 1
+        count = 0
+        saved_count = 0
+        
+        while top > 0:
+            top -= 1
+            x0, y0, x1, y1 = stack[top, 0], stack[top, 1], stack[top, 2], stack[top, 3]
             
-            for n in range(max_iter):
-                if zr2 + zi2 > 4.0:
-                    result[i, j] = n
-                    break
-                zi = 2.0 * zr * zi + y
-                zr = zr2 - zi2 + x
-                zr2 = zr * zr
-                zi2 = zi * zi
+            # Calcula a borda (pixels já feitos por vizinhos são reaproveitados)
+            uniform = True
+            value = -1
+            for j in range(x0, x1 + 1):
+                for i in (y0, y1):
+                    if not done[i, j]:
+                        canvas[i, j], skipped = _subdivision_point(kind, (col0 + j) * spacing, (row0 + i) * spacing,
+                                                                  max_iter, cr, ci, interior, smooth,
+                                                                  state, i, j)
+                        saved_count += skipped
+                        done[i, j] = True
+                        count += 1
+                    if value < 0:
+                        value = canvas[i, j]
+                    elif canvas[i, j] != value:
+                        uniform = False
+            for i in range(y0 + 1, y1):
+                for j in (x0, x1):
+                    if not done[i, j]:
+                        canvas[i, j], skipped = _subdivision_point(kind, (col0 + j) * spacing, (row0 + i) * spacing,
+                                                                  max_iter, cr, ci, interior, smooth,
+                                                                  state, i, j)
+                        saved_count += skipped
+                        done[i, j] = True
+                        count += 1
+                    if canvas[i, j] != value:
+                        uniform = False
+            
+            if x1 - x0 < 2 or y1 - y0 < 2:
+                continue
+            
+            if uniform:
+                # Borda uniforme: preenche o interior sem iterar
+                for i in range(y0 + 1, y1):
+                    for j in range(x0 + 1, x1):
+                        canvas[i, j] = value
+                        done[i, j] = True
+            elif x1 - x0 <= min_size or y1 - y0 <= min_size:
+                for i in range(y0 + 1, y1):
+                    for j in range(x0 + 1, x1):
+                        if not done[i, j]:
+                            canvas[i, j], skipped = _subdivision_point(kind, (col0 + j) * spacing, (row0 + i) * spacing,
+                                                                      max_iter, cr, ci, interior, smooth,
+                                                                      state, i, j)
+                            saved_count += skipped
+                            done[i, j] = True
+                            count += 1
             else:
-                result[i, j] = max_iter
-    return result
+                mx = (x0 + x1) // 2
+                my = (y0 + y1) // 2
+                stack[top, 0], stack[top, 1], stack[top, 2], stack[top, 3] = x0, y0, mx, my
+                stack[top + 1, 0], stack[top + 1, 1], stack[top + 1, 2], stack[top + 1, 3] = mx, y0, x1, my
+                stack[top + 2, 0], stack[top + 2, 1], stack[top + 2, 2], stack[top + 2, 3] = x0, my, mx, y1
+                stack[top + 3, 0], stack[top + 3, 1], stack[top + 3, 2], stack[top + 3, 3] = mx, my, x1, y1
+                top += 4
+        computed[t] = count
+        saved[t] = saved_count
+    return computed.sum(), saved.sum()
 
-@jit(nopython=True, parallel=True, fastmath=True)
-def julia_turbo(h, w, max_iter, x_min, x_max, y_min, y_max, cr, ci):
-    """Julia Set ultra-otimizado"""
-    result = np.zeros((h, w), dtype=np.int32)
+@jit(nopython=True, nogil=True, cache=True, parallel=True, fastmath=True)
+def tile_pass_turbo(canvas, tile_mask, tile, col0, row0, spacing, max_iter, kind,
+                    cr, ci, stride, prev_stride, interior=False, smooth=False, state=None):
+    """Um passe da renderização progressiva sobre os tiles marcados do canvas
+    
+    Calcula os pixels da grade de passo `stride` que não estavam na grade do
+    passe anterior (`prev_stride`, 0 = nenhum). Com stride 1 e prev_stride 0
+    renderiza os tiles inteiros; smooth e state como no mariani_silver_turbo.
+    Retorna (pixels calculados, iterações economizadas pela detecção de
+    interior).
+    """
+    h, w = canvas.shape
+    rows = (h + stride - 1) // stride
+    counts = np.zeros(rows, dtype=np.int64)
+    saved = np.zeros(rows, dtype=np.int64)
+    
+    for r in prange(rows):
+        i = r * stride
+        y = (row0 + i) * spacing
+        row_done = prev_stride > 0 and i % prev_stride == 0
+        c = 0
+        row_saved = 0
+        for j in range(0, w, stride):
+            if not tile_mask[i // tile, j // tile]:
+                continue  # Tile já está no cache
+            if row_done and j % prev_stride == 0:
+                continue  # Já calculado no passe mais grosso
+            canvas[i, j], skipped = _subdivision_point(kind, (col0 + j) * spacing, y, max_iter,
+                                                       cr, ci, interior, smooth, state, i, j)
+            row_saved += skipped
+            c += 1
+        counts[r] = c
+        saved[r] = row_saved
+    return counts.sum(), saved.sum()
+
+@jit(nopython=True, nogil=True, cache=True, parallel=True, fastmath=True)
+def smooth_color_turbo(out, max_iter, x_min, x_max, y_min, y_max, kind, palette, cr=0.0, ci=0.0):
+    """Escape-time com coloração suave fundida: escreve RGB(A) uint8 direto em out
+    
+    Cada pixel usa a contagem normalizada n + 1 - log2(log|z|) e interpola
+    entre as duas cores vizinhas da paleta (256 cores em [0, 1], a última
+    reservada ao interior), sem arrays intermediários de iterações.
+    """
+    h, w, channels = out.shape
     dx = (x_max - x_min) / w
     dy = (y_max - y_min) / h
+    scale = 255.0 / max_iter
+    inv_log2 = 1.0 / math.log(2.0)
     
     for i in prange(h):
-        y = y_min + i * dy
+        py = y_min + i * dy
         for j in range(w):
-            x = x_min + j * dx
+            px = x_min + j * dx
+            if kind == 1:  # Julia
+                zr, zi = px, py
+                x, y = cr, ci
+            else:
+                zr, zi = 0.0, 0.0
+                x, y = px, py
             
-            zr, zi = x, y
+            n = 0
             zr2, zi2 = zr * zr, zi * zi
-            
-            for n in range(max_iter):
-                if zr2 + zi2 > 4.0:
-                    result[i, j] = n
-                    break
-                zi = 2.0 * zr * zi + ci
-                zr = zr2 - zi2 + cr
+            while n < max_iter and zr2 + zi2 <= SMOOTH_BAILOUT:
+                zr, zi = formula_step(kind, zr, zi, zr2, zi2, x, y, MULTIBROT_DEGREE)
                 zr2 = zr * zr
                 zi2 = zi * zi
+                n += 1
+            m = zr2 + zi2
+            
+            if m <= SMOOTH_BAILOUT:
+                for c in range(3):
+                    out[i, j, c] = np.uint8(palette[255, c] * 255.0 + 0.5)
             else:
-                result[i, j] = max_iter
+                mu = n + 1.0 - math.log(0.5 * math.log(m)) * inv_log2
+                pos = min(max(mu * scale, 0.0), 254.0)
+                k = int(pos)
+                f = pos - k
+                k2 = min(k + 1, 254)
+                for c in range(3):
+                    value = palette[k, c] * (1.0 - f) + palette[k2, c] * f
+                    out[i, j, c] = np.uint8(value * 255.0 + 0.5)
+            if channels == 4:
+                out[i, j, 3] = 255
+
+# Antialiasing: pixels a menos de AA_THRESHOLD pixels da borda do conjunto
+# (pela estimativa de distância) recebem AA_SAMPLES x AA_SAMPLES amostras
+AA_THRESHOLD = 1.0
+AA_SAMPLES = 4
+
+@jit(nopython=True, nogil=True, cache=True, fastmath=True)
+def distance_point(kind, px, py, max_iter, cr, ci):
+    """Órbita com a derivada dz/dc (ou dz/dz0 no Julia)
+    
+    Retorna (contagem suave, distância estimada até o conjunto); pontos que
+    não escapam dão (-1, 0). A derivada usa o z "dobrado" de cada fórmula
+    (|x| + i|y| no Burning Ship, conjugado no Tricorn), que é o que a
+    fórmula eleva ao quadrado.
+    """
+    if kind == 1:  # Julia
+        zr, zi = px, py
+        x, y = cr, ci
+        dr, di = 1.0, 0.0
+        add = 0.0
+    else:
+        zr, zi = 0.0, 0.0
+        x, y = px, py
+        dr, di = 0.0, 0.0
+        add = 1.0
+    
+    n = 0
+    zr2, zi2 = zr * zr, zi * zi
+    while n < max_iter and zr2 + zi2 <= SMOOTH_BAILOUT:
+        wr, wi, er, ei = zr, zi, dr, di
+        if kind == 2:
+            if zr < 0.0:
+                wr, er = -zr, -dr
+            if zi < 0.0:
+                wi, ei = -zi, -di
+        elif kind == 3:
+            wi, ei = -zi, -di
+        dr, di = 2.0 * (wr * er - wi * ei) + add, 2.0 * (wr * ei + wi * er)
+        zr, zi = formula_step(kind, zr, zi, zr2, zi2, x, y, MULTIBROT_DEGREE)
+        zr2 = zr * zr
+        zi2 = zi * zi
+        n += 1
+    
+    m = zr2 + zi2
+    if m <= SMOOTH_BAILOUT:
+        return -1.0, 0.0
+    mu = n + 1.0 - math.log(0.5 * math.log(m)) / math.log(2.0)
+    # |z| ln|z| / |dz|, com ln|z| = ln(m) / 2
+    return mu, 0.5 * math.sqrt(m / (dr * dr + di * di)) * 0.5 * math.log(m)
+
+@jit(nopython=True, nogil=True, cache=True, fastmath=True)
+def smooth_point(kind, px, py, max_iter, cr, ci):
+    """Só a contagem suave (-1 no interior): as subamostras não usam a derivada"""
+    if kind == 1:  # Julia
+        zr, zi = px, py
+        x, y = cr, ci
+    else:
+        zr, zi = 0.0, 0.0
+        x, y = px, py
+    
+    n = 0
+    zr2, zi2 = zr * zr, zi * zi
+    while n < max_iter and zr2 + zi2 <= SMOOTH_BAILOUT:
+        zr, zi = formula_step(kind, zr, zi, zr2, zi2, x, y, MULTIBROT_DEGREE)
+        zr2 = zr * zr
+        zi2 = zi * zi
+        n += 1
+    
+    m = zr2 + zi2
+    if m <= SMOOTH_BAILOUT:
+        return -1.0
+    return n + 1.0 - math.log(0.5 * math.log(m)) / math.log(2.0)
+
+@jit(nopython=True, nogil=True, cache=True, fastmath=True)
+def _palette_rgb(palette, mu, scale):
+    """Cor (0-1) da contagem suave mu; mu < 0 é o interior"""
+    if mu < 0.0:
+        return palette[255, 0], palette[255, 1], palette[255, 2]
+    pos = min(max(mu * scale, 0.0), 254.0)
+    k = int(pos)
+    f = pos - k
+    k2 = min(k + 1, 254)
+    return (palette[k, 0] * (1.0 - f) + palette[k2, 0] * f,
+            palette[k, 1] * (1.0 - f) + palette[k2, 1] * f,
+            palette[k, 2] * (1.0 - f) + palette[k2, 2] * f)
+
+@jit(nopython=True, nogil=True, cache=True, parallel=True, fastmath=True)
+def smooth_palette_turbo(out, values, palette):
+    """Colore contagens suaves em ponto fixo (smooth_fixed) direto em out (RGB uint8)
+
+    Mesma interpolação da paleta do smooth_color_turbo, sem depender de
+    max_iter: o ponto fixo já está na escala da paleta.
+    """
+    h, w = values.shape
+    scale = 255.0 / SMOOTH_LEVELS
+    for i in prange(h):
+        for j in range(w):
+            value = values[i, j]
+            r, g, b = _palette_rgb(palette, -1.0 if value >= SMOOTH_LEVELS else float(value), scale)
+            out[i, j, 0] = np.uint8(r * 255.0 + 0.5)
+            out[i, j, 1] = np.uint8(g * 255.0 + 0.5)
+            out[i, j, 2] = np.uint8(b * 255.0 + 0.5)
+
+@jit(nopython=True, nogil=True, cache=True, parallel=True, fastmath=True)
+def smooth_fixed_turbo(h, w, max_iter, x_min, x_max, y_min, y_max, kind, cr=0.0, ci=0.0, interior=False):
+    """Contagens suaves em ponto fixo (uint16) na grade do smooth_color_turbo
+
+    Para guardar e colorir depois com smooth_palette_turbo (pôsteres).
+    """
+    result = np.empty((h, w), dtype=np.uint16)
+    dx = (x_max - x_min) / w
+    dy = (y_max - y_min) / h
+    for i in prange(h):
+        py = y_min + i * dy
+        for j in range(w):
+            result[i, j] = smooth_fixed(kind, x_min + j * dx, py, max_iter, cr, ci, interior)[0]
     return result
 
-@jit(nopython=True, parallel=True, fastmath=True)
-def burning_ship_turbo(h, w, max_iter, x_min, x_max, y_min, y_max):
-    """Burning Ship ultra-otimizado"""
-    result = np.zeros((h, w), dtype=np.int32)
+@jit(nopython=True, nogil=True, cache=True, parallel=True, fastmath=True)
+def distance_turbo(h, w, max_iter, x_min, x_max, y_min, y_max, kind, cr=0.0, ci=0.0):
+    """Contagem suave e distância estimada (unidades do plano) por pixel"""
+    mu = np.empty((h, w))
+    distance = np.empty((h, w))
     dx = (x_max - x_min) / w
     dy = (y_max - y_min) / h
     
     for i in prange(h):
         y = y_min + i * dy
         for j in range(w):
-            x = x_min + j * dx
-            
-            zr, zi = 0.0, 0.0
-            
-            for n in range(max_iter):
-                if zr*zr + zi*zi > 4.0:
-                    result[i, j] = n
-                    break
-                new_zr = zr*zr - zi*zi + x
-                new_zi = 2.0 * abs(zr * zi) + y
-                zr, zi = new_zr, new_zi
-            else:
-                result[i, j] = max_iter
-    return result
+            mu[i, j], distance[i, j] = distance_point(kind, x_min + j * dx, y, max_iter, cr, ci)
+    return mu, distance
 
-@jit(nopython=True, parallel=True, fastmath=True)
-def tricorn_turbo(h, w, max_iter, x_min, x_max, y_min, y_max):
-    """Tricorn ultra-otimizado"""
-    result = np.zeros((h, w), dtype=np.int32)
+@jit(nopython=True, nogil=True, cache=True, parallel=True, fastmath=True)
+def antialias_turbo(out, mu, distance, max_iter, x_min, x_max, y_min, y_max, kind, palette,
+                    cr=0.0, ci=0.0, samples=AA_SAMPLES, threshold=AA_THRESHOLD):
+    """Colore o frame e superamostra só os pixels de borda
+    
+    Borda: distância estimada abaixo de `threshold` pixels, ou pixel interior
+    com algum vizinho de fora (a estimativa não vale dentro do conjunto).
+    Esses recebem samples x samples amostras com a cor média; os demais
+    usam a cor da amostra central. Retorna o número de pixels superamostrados.
+    """
+    h, w, channels = out.shape
     dx = (x_max - x_min) / w
     dy = (y_max - y_min) / h
+    limit = threshold * max(dx, dy)
+    scale = 255.0 / max_iter
+    weight = 1.0 / (samples * samples)
+    counts = np.zeros(h, dtype=np.int64)
     
     for i in prange(h):
-        y = y_min + i * dy
         for j in range(w):
-            x = x_min + j * dx
-            
-            zr, zi = 0.0, 0.0
+            boundary = mu[i, j] >= 0.0 and distance[i, j] < limit
+            if mu[i, j] < 0.0:
+                for ni in range(max(i - 1, 0), min(i + 2, h)):
+                    for nj in range(max(j - 1, 0), min(j + 2, w)):
+                        if mu[ni, nj] >= 0.0:
+                            boundary = True
             
-            for n in range(max_iter):
-                if zr*zr + zi*zi > 4.0:
-                    result[i, j] = n
-                    break
-                new_zr = zr*zr - zi*zi + x
-                new_zi = -2.0 * zr * zi + y  # Conjugado
-                zr, zi = new_zr, new_zi
+            if boundary:
+                r = g = b = 0.0
+                for sa in range(samples):
+                    sy = y_min + (i + (sa + 0.5) / samples - 0.5) * dy
+                    for sb in range(samples):
+                        sx = x_min + (j + (sb + 0.5) / samples - 0.5) * dx
+                        pr, pg, pb = _palette_rgb(palette, smooth_point(kind, sx, sy, max_iter, cr, ci),
+                                                  scale)
+                        r += pr
+                        g += pg
+                        b += pb
+                r *= weight
+                g *= weight
+                b *= weight
+                counts[i] += 1
             else:
-                result[i, j] = max_iter
-    return result
+                r, g, b = _palette_rgb(palette, mu[i, j], scale)
+            out[i, j, 0] = np.uint8(r * 255.0 + 0.5)
+            out[i, j, 1] = np.uint8(g * 255.0 + 0.5)
+            out[i, j, 2] = np.uint8(b * 255.0 + 0.5)
+            if channels == 4:
+                out[i, j, 3] = 255
+    return counts.sum()
+
+def build_colormap(color_scheme):
+    """Colormap otimizado com gradientes suaves (256 cores RGB em [0, 1])"""
+    colors = np.zeros((256, 3), dtype=np.float32)  # Mais cores para suavidade
+    
+    for i in range(256):
+        if i == 255:
+            colors[i] = [0, 0, 0]
+        else:
+            t = i / 255.0
+            
+            if color_scheme == 0:  # Azul-vermelho suave
+                colors[i] = [
+                    0.5 + 0.5 * np.cos(3.0 + t * 6.28318),
+                    0.5 + 0.5 * np.cos(2.0 + t * 6.28318), 
+                    0.5 + 0.5 * np.cos(1.0 + t * 6.28318)
+                ]
+            elif color_scheme == 1:  # Arco-íris fluído
+                colors[i] = colorsys.hsv_to_rgb((t * 3) % 1.0, 0.8, 1.0)
+            elif color_scheme == 2:  # Fogo intenso
+                colors[i] = [
+                    min(1.0, t * 2),
+                    min(1.0, max(0, (t - 0.3) * 2)),
+                    max(0, t - 0.7) * 3
+                ]
+            elif color_scheme == 3:  # Oceano profundo
+                colors[i] = [
+                    t * 0.3,
+                    0.5 + 0.5 * np.sin(t * 3.14159),
+                    0.8 + 0.2 * np.cos(t * 6.28318)
+                ]
+            else:  # Neon psicodélico
+                colors[i] = [
+                    0.5 + 0.5 * np.sin(t * 12.56637),
+                    0.5 + 0.5 * np.sin(t * 18.84955),
+                    0.5 + 0.5 * np.sin(t * 25.13274)
+                ]
+    
+    return colors
+
+def iterations_for_zoom(zoom, deep_zoom=True):
+    """Iterações máximas adequadas para a profundidade do zoom"""
+    if zoom <= 5:
+        return 50
+    if not deep_zoom or zoom < DEEP_ZOOM_THRESHOLD:
+        return min(100, int(50 + np.log10(zoom) * 10))
+    return min(5000, int(100 + (math.log10(zoom) - 10) * 50))
+
+def target_depth(x, y):
+    """Zoom máximo que um alvo sustenta pelas casas decimais com que foi dado
+    
+    Com d casas o ponto só é conhecido a ~10^-d: além do zoom 10^d a janela
+    cabe na incerteza, o alvo pode nem estar na borda e o frame vira uma
+    cor só. Vale a coordenada mais precisa (zeros são exatos e não contam),
+    e nunca menos que o zoom 100 de antes dos alvos profundos.
+    """
+    decimals = [-to_decimal(str(v)).as_tuple().exponent for v in (x, y) if v != 0]
+    return 10.0 ** max(decimals + [2])
+
+def colormap_to_uint8(colormap):
+    """Colormap em [0, 1] convertido para RGB uint8 (4x menor que float32)"""
+    return np.round(colormap * 255).astype(np.uint8)
+
+def jit_kernels():
+    """Todos os kernels numba usados pelo gerador (compilados com cache em disco)"""
+    modules = (deep_zoom, formulas, precision, transition, sys.modules[__name__])
+    return [obj for module in modules for obj in vars(module).values()
+            if isinstance(obj, Dispatcher) and obj.__module__ == module.__name__
+            ] + formulas.compiled_kernels()
+
+def kernel_cache_stats():
+    """Assinaturas carregadas do cache em disco (hits) e compiladas (misses)"""
+    hits = misses = 0
+    for kernel in jit_kernels():
+        hits += sum(kernel.stats.cache_hits.values())
+        misses += sum(kernel.stats.cache_misses.values())
+    return hits, misses
+
+# Warm-up em segundo plano: uma vez por processo ("Novo" recria o gerador)
+_warmup_thread = None
+
+# Threads que chamam kernels paralelos (pré-render, warm-up, animação). Na
+# saída elas param e são juntadas antes da finalização do interpretador
+_kernel_threads = []
+_exiting = threading.Event()
+
+def _start_kernel_thread(target, *args):
+    """Inicia uma thread de kernels (daemon) registrada para a saída
+    
+    Antes, sobe o pool de threads do numba na thread que chama (a principal):
+    com o TBB, um pool iniciado por outra thread trava a finalização do TBB
+    na saída do processo, mesmo com essa thread já encerrada.
+    """
+    numba.get_num_threads()
+    _kernel_threads[:] = [t for t in _kernel_threads if t.is_alive()]
+    thread = threading.Thread(target=target, args=args, daemon=True)
+    thread.start()
+    _kernel_threads.append(thread)
+    return thread
+
+@atexit.register
+def _join_kernel_threads():
+    """Sinaliza a saída e espera as threads de kernels terminarem o passo atual"""
+    _exiting.set()
+    for thread in _kernel_threads:
+        thread.join()
+
+# Largura do mundo coberta por um tile no nível 0 da quadtree
+TILE_BASE_SPAN = 4.0
+
+# Com a subdivisão, prévias progressivas só até este passo: o passe 1/2 já
+# custa tanto quanto o Mariani-Silver do frame inteiro
+SUBDIVISION_PREVIEW_STRIDE = 4
+
+# Cliques mais antigos que isso (segundos) não entram na extrapolação do pré-render
+CLICK_MEMORY = 10.0
+
+# Intervalo (segundos) entre os resumos de métricas no terminal
+METRICS_LOG_INTERVAL = 10.0
 
 class VideoSmoothFractalGenerator:
     def __init__(self):
+        self.startup_time = time.perf_counter()
+        
         # Resolução otimizada para fluidez
         self.width = 400
         self.height = 400
@@ -124,8 +828,51 @@ class VideoSmoothFractalGenerator:
         self.zoom_factor = 1.2  # Zoom mais suave
         self.center_x = 0.0
         self.center_y = 0.0
+        self.center_hp = (to_decimal(0.0), to_decimal(0.0))  # Centro em alta precisão
         self.zoom = 1.0
         
+        # Deep zoom por perturbação além do limite do float64
+        self.deep_zoom = True
+        self.max_auto_zoom = 1e30 if self.deep_zoom else 100
+        self.deep_stats = None
+        
+        # Aritmética do último frame (float64, double-double ou perturbação),
+        # escolhida pelo espaçamento entre pixels
+        self.precision = 'float64'
+        
+        # Subdivisão de Mariani-Silver: pula regiões uniformes
+        self.subdivision = True
+        
+        # Detecção de interior (opcional): cardioide/bulbo + ciclos de Brent
+        self.interior_check = False
+        self.interior_saved = 0
+        self.resumed_iterations = 0  # Poupadas pelo estado dos tiles (resume_iterations)
+        
+        # Coloração suave: sem tiles, fundida ao kernel (RGB uint8 escrito
+        # direto num buffer reaproveitado entre frames); com tiles, eles
+        # guardam a contagem suave em ponto fixo, colorida por kernel
+        self.smooth_coloring = True
+        self.frame_buffer = None
+        
+        # Antialiasing por estimativa de distância (opcional): superamostra
+        # só os pixels a ~1 pixel da borda do conjunto
+        self.antialias = False
+        self.antialiased_pixels = 0
+        
+        # Simetria (eixo real ou origem): com a janela sobre o eixo, os tiles
+        # de um lado saem do espelho dos do outro (grade dos tiles simétrica)
+        self.symmetry = True
+        
+        # Renderização progressiva: 1/8 -> 1/4 -> 1/2 -> resolução total
+        self.progressive = True
+        self.progressive_strides = (8, 4, 2, 1)
+        
+        # Apresentação rápida: blitting só da imagem sobre o fundo guardado
+        # (display.BlitPresenter, criado em show()), sem o sleep do plt.pause
+        self.blit = True
+        self.presenter = None
+        self.render_generation = 0  # Incrementa a cada pedido; abandona os antigos
+        
         # Parâmetros aleatórios
         self.fractal_type = random.choice(['mandelbrot', 'julia', 'burning_ship', 'tricorn'])
         self.color_scheme = random.randint(0, 4)
@@ -134,218 +881,897 @@ class VideoSmoothFractalGenerator:
             self.julia_c_real = random.uniform(-2, 2)
             self.julia_c_imag = random.uniform(-2, 2)
         
-        # Sistema de cache multi-thread
-        self.frame_cache = {}
-        self.cache_size = 20
-        self.render_queue = queue.Queue(maxsize=5)
+        # Sistema de cache multi-thread: LRU com orçamento em bytes, iterações
+        # em uint16 colorizadas na leitura
+        self.frame_cache = RenderCache(max_bytes=16 * 1024**2)  # Zoom profundo ou sem tiles
+        
+        # Cache de tiles em quadtree: (parâmetros, nível, tx, ty) -> iterações
+        self.use_tiles = True
+        self.tile_size = 64
+        self.tile_cache = RenderCache(max_bytes=16 * 1024**2)
+        
+        # Estado (zr, zi, n) dos tiles, sem max_iter na chave: quando o zoom
+        # aumenta max_iter, um tile que falta no cache continua de onde o
+        # render anterior (ex.: o pré-render do destino) parou
+        self.resume_iterations = True
+        self.tile_states = RenderCache(max_bytes=32 * 1024**2, compact=np.array)
         self.cache_thread_running = True
         
-        # Pool de threads para pré-rendering
+        # Pré-render com prioridades: frames previstos (caminho de um clique
+        # ou zoom em andamento, trajetória do auto-zoom, repetição dos
+        # últimos cliques) até prefetch_ahead frames à frente; previsões que
+        # deixam de valer são canceladas antes de rodar
+        self.scheduler = RenderScheduler()
+        self.prefetch_ahead = 6
+        self.planned_frames = deque()  # (zoom, cx, cy, max_iter) já decididos
+        self.click_moves = deque(maxlen=3)  # (instante, dx, dy) em frações da janela
+        
+        # Métricas: tempos por etapa, frames acima de 33ms, iterações por
+        # pixel; caches e pré-render entram como coletores (lidos só na
+        # exportação). O print por frame só com log_frames; sem ele sai um
+        # resumo a cada METRICS_LOG_INTERVAL (e o snapshot em metrics_path)
+        self.metrics = Metrics(enabled=True)
+        self.metrics.add_collector(self._metrics_gauges)
+        self.log_frames = False
+        self.metrics_path = None
+        self._metrics_logged = time.time()
+        
+        # Pool de threads para pré-rendering (kernels nogil rodam em paralelo;
+        # só com o workqueue do numba eles passam pelo PARALLEL_LOCK)
         self.render_threads = []
         for i in range(2):  # 2 threads de render
-            t = threading.Thread(target=self._cache_worker, daemon=True)
-            t.start()
-            self.render_threads.append(t)
+            self.render_threads.append(_start_kernel_thread(self._cache_worker, self.scheduler))
         
         # Animação automática
         self.auto_zoom = False
-        self.animation_timer = None
         self.zoom_direction = 1
+        
+        # Relógio único da animação: uma thread renderiza o estado do
+        # instante atual (pulando passos vencidos se atrasar) num buffer
+        # duplo; um timer do loop da GUI apresenta o frame mais novo
+        self.target_fps = 30
+        self.clock = FrameClock(self.target_fps)
+        self.frames = FrameBuffer()
+        self.frame_timer = None
+        self.animation_run = None  # Ficha da animação em curso; threads de outra ficha saem
+        self.animation_stride = 1  # Passos por frame renderizado (previsão do pré-render)
+        self._fps_shown = 0.0
         self.target_x = random.uniform(-1, 1)
         self.target_y = random.uniform(-1, 1)
+        self.target_depth = 100.0  # Alvo sorteado: só zoom raso
         
-        # Sistema de transição suave
+        # Sistema de transição suave: só o destino é renderizado; os passos
+        # do meio reamostram o frame da tela e o destino (transition.py)
         self.transition_steps = 8
         self.transition_cache = deque(maxlen=self.transition_steps)
+        self.synthesize_transitions = True
+        self.last_frame = None  # Último frame exibido e a view dele
+        self.last_view = None
         
         self.generate_colormap()
         self.precompute_interesting_points()
         
+        # Kernels com cache=True saem do cache em disco; o warm-up (opcional)
+        # carrega/compila todos os caminhos num grid mínimo em segundo plano
+        self.warmup = True
+        if self.warmup:
+            self.start_warmup()
+        
         print(f"🎬 Fractal Vídeo: {self.fractal_type.upper()}")
         print(f"⚡ Resolução: {self.width}x{self.height} | FPS target: 30+")
     
+    def start_warmup(self):
+        """Dispara o warm-up dos kernels numa thread (uma vez por processo)"""
+        global _warmup_thread
+        if _warmup_thread is not None:
+            return
+        _warmup_thread = _start_kernel_thread(self._warm_up)
+    
+    def _warm_up(self):
+        """Passa por todos os caminhos de render num grid mínimo
+        
+        Usa uma cópia do gerador com caches próprios, então as chamadas têm
+        exatamente as assinaturas dos frames reais. O caminho do primeiro
+        frame vem antes; os quatro tipos compartilham os kernels com `kind`.
+        Na saída do processo para no fim do passo em andamento.
+        """
+        start = time.perf_counter()
+        probe = copy.copy(self)
+        probe.width = probe.height = 16
+        probe.frame_cache = RenderCache(max_bytes=1024**2)
+        probe.tile_cache = RenderCache(max_bytes=1024**2)
+        probe.tile_states = RenderCache(max_bytes=1024**2, compact=np.array)
+        probe.scheduler = RenderScheduler()
+        probe.metrics = Metrics(enabled=False)
+        probe.frame_buffer = None
+        probe.julia_c_real, probe.julia_c_imag = -0.8, 0.156
+        probe.max_iter = 8
+        base = {name: getattr(self, name)
+                for name in ('use_tiles', 'subdivision', 'interior_check', 'deep_zoom',
+                             'resume_iterations')}
+        cx, cy = self.center_hp
+        
+        steps = [(self.zoom, {})]  # Configuração atual primeiro
+        steps += [(1.0, {'subdivision': not self.subdivision}),
+                  (1.0, {'interior_check': True}),
+                  (1.0, {'resume_iterations': False}),  # Tiles sem estado (max_iter no teto)
+                  (1.0, {'resume_iterations': False, 'subdivision': not self.subdivision}),
+                  (1e6, {'use_tiles': False}),  # float64
+                  (1e6, {'use_tiles': False, 'interior_check': True}),
+                  (1e12, {'deep_zoom': True}),  # Perturbação
+                  (1e14, {'deep_zoom': False})]  # double-double
+        try:
+            for zoom, settings in steps:
+                for fractal_type in FRACTAL_KINDS:
+                    if _exiting.is_set():
+                        return
+                    probe.__dict__.update(base, **settings)
+                    probe.fractal_type = fractal_type
+                    probe._generate_iterations(zoom, cx, cy)
+            if _exiting.is_set():
+                return
+            probe._colorize(np.zeros((16, 16), dtype=np.int32), smooth=True)
+            frame = probe._render_fused(1.0, cx, cy).copy()
+            probe._render_antialiased(1.0, cx, cy)
+            with PARALLEL_LOCK:
+                ZoomTransition(frame, (1.0, cx, cy), frame, (2.0, cx, cy)).frame((1.5, cx, cy), 0.5)
+        except Exception as e:
+            print(f"⚠️ Warm-up interrompido: {e}")
+            return
+        
+        hits, misses = kernel_cache_stats()
+        print(f"🔥 Warm-up: {(time.perf_counter() - start)*1000:.0f}ms | "
+              f"kernels do cache em disco: {hits}, compilados: {misses}")
+    
     def precompute_interesting_points(self):
-        """Pre-computa pontos interessantes para navegação automática"""
-        self.interesting_points = []
-        if self.fractal_type == 'mandelbrot':
-            self.interesting_points = [
+        """Pre-computa pontos interessantes para navegação automática
+        
+        Cada alvo é (x, y, profundidade): o auto-zoom volta ao chegar nela.
+        Com zoom profundo só entram pontos na borda do conjunto com precisão
+        para chegar a max_auto_zoom (pontos de 4 casas viram uma cor só bem
+        antes disso) e com escape rápido o bastante para as iterações de
+        iterations_for_zoom.
+        """
+        if self.deep_zoom:
+            if self.fractal_type == 'julia':
+                points = julia_repelling_points(self.julia_c_real, self.julia_c_imag)
+            else:
+                # Ponto de Misiurewicz da antena e a ponta dela (exata)
+                points = [antenna_misiurewicz(), ('-2', '0', math.inf)]
+                if self.fractal_type == 'mandelbrot':
+                    points.append(('0', '1', math.inf))  # Misiurewicz c = i (exato)
+        elif self.fractal_type == 'mandelbrot':
+            points = [
                 (-0.7269, 0.1889), (-0.8, 0.156), (-0.74529, 0.11307),
                 (-1.25066, 0.02012), (0.285, 0.01), (-0.762, 0.0847)
             ]
         elif self.fractal_type == 'julia':
             # Pontos interessantes para Julia sets
-            self.interesting_points = [
+            points = [
                 (0.0, 0.0), (0.3, 0.5), (-0.5, 0.6), 
                 (0.285, 0.01), (-0.7269, 0.1889)
             ]
         else:
             # Pontos genéricos para outros fractais
-            self.interesting_points = [
+            points = [
                 (0.0, 0.0), (0.5, 0.5), (-0.5, 0.5),
                 (0.3, -0.3), (-0.3, 0.3)
             ]
+        self.interesting_points = [point if len(point) == 3 else (*point, target_depth(*point))
+                                   for point in points]
+    
+    def _auto_zoom_limit(self):
+        """Zoom em que o auto-zoom volta: o menor entre o máximo e o do alvo"""
+        return min(self.max_auto_zoom, self.target_depth)
     
     def generate_colormap(self):
         """Colormap otimizado com gradientes suaves"""
-        colors = np.zeros((256, 3), dtype=np.float32)  # Mais cores para suavidade
-        
-        for i in range(256):
-            if i == 255:
-                colors[i] = [0, 0, 0]
-            else:
-                t = i / 255.0
-                
-                if self.color_scheme == 0:  # Azul-vermelho suave
-                    colors[i] = [
-                        0.5 + 0.5 * np.cos(3.0 + t * 6.28318),
-                        0.5 + 0.5 * np.cos(2.0 + t * 6.28318), 
-                        0.5 + 0.5 * np.cos(1.0 + t * 6.28318)
-                    ]
-                elif self.color_scheme == 1:  # Arco-íris fluído
-                    colors[i] = colorsys.hsv_to_rgb((t * 3) % 1.0, 0.8, 1.0)
-                elif self.color_scheme == 2:  # Fogo intenso
-                    colors[i] = [
-                        min(1.0, t * 2),
-                        min(1.0, max(0, (t - 0.3) * 2)),
-                        max(0, t - 0.7) * 3
-                    ]
-                elif self.color_scheme == 3:  # Oceano profundo
-                    colors[i] = [
-                        t * 0.3,
-                        0.5 + 0.5 * np.sin(t * 3.14159),
-                        0.8 + 0.2 * np.cos(t * 6.28318)
-                    ]
-                else:  # Neon psicodélico
-                    colors[i] = [
-                        0.5 + 0.5 * np.sin(t * 12.56637),
-                        0.5 + 0.5 * np.sin(t * 18.84955),
-                        0.5 + 0.5 * np.sin(t * 25.13274)
-                    ]
-        
-        self.colormap = colors
-    
-    def _cache_worker(self):
-        """Worker thread para pré-renderização"""
-        while self.cache_thread_running:
-            try:
-                params = self.render_queue.get(timeout=0.1)
-                if params is None:
-                    continue
-                    
-                zoom, cx, cy = params
-                cache_key = (zoom, round(cx, 4), round(cy, 4))
-                
-                if cache_key not in self.frame_cache:
-                    frame = self._generate_fractal_raw(zoom, cx, cy)
-                    
-                    # Gerencia tamanho do cache
-                    if len(self.frame_cache) >= self.cache_size:
-                        # Remove item mais antigo
-                        oldest_key = next(iter(self.frame_cache))
-                        del self.frame_cache[oldest_key]
-                    
-                    self.frame_cache[cache_key] = frame
-                    
-            except queue.Empty:
+        self.colormap = build_colormap(self.color_scheme)  # float: interpolação suave
+        self.colormap_rgb = colormap_to_uint8(self.colormap)
+    
+    def _cache_worker(self, scheduler):
+        """Worker thread para pré-renderização (até o scheduler ser fechado)"""
+        while self.cache_thread_running and not scheduler.closed and not _exiting.is_set():
+            job = scheduler.get(timeout=0.1)
+            if job is None:
                 continue
+            
+            key, (zoom, cx, cy, max_iter) = job
+            # Cópia rasa: mesmos caches, mas max_iter do frame previsto e sem
+            # disputar precision/interior_saved com a exibição
+            renderer = copy.copy(self)
+            renderer.max_iter = max_iter
+            produced = []
+            start = time.perf_counter()
+            try:
+                if not renderer._uses_frame_cache(zoom):
+                    # Pré-renderiza só os tiles que faltam
+                    view = renderer._prepare_tiles(zoom, cx, cy)
+                    renderer._render_tiles(view)
+                    produced = renderer._tile_keys(view, view['missing'])
+                elif key not in self.frame_cache:
+                    # Kernels com nogil: os workers renderizam em paralelo de verdade
+                    iterations, _ = renderer._generate_iterations(zoom, cx, cy)
+                    self.frame_cache.put(key, iterations)
+                    produced = [key]
             except Exception:
-                continue
+                pass
+            finally:
+                scheduler.done(key, produced)
+                self.metrics.observe('prefetch_ms', (time.perf_counter() - start) * 1000.0)
+    
+    def _metrics_gauges(self):
+        """Gauges lidos na exportação: caches, fila de pré-render e uso dos workers"""
+        gauges = {}
+        for name, cache in (('frame_cache', self.frame_cache), ('tile_cache', self.tile_cache)):
+            stats = cache.stats()
+            for field in ('entries', 'bytes', 'hits', 'misses', 'evictions', 'hit_rate'):
+                gauges[f'{name}_{field}'] = stats[field]
+        gauges.update(self.clock.stats())
+        gauges['replaced_frames'] = self.frames.replaced
+        prefetch = self.scheduler.stats()
+        gauges['prefetch_queue_depth'] = prefetch['pending']
+        for field in ('running', 'cancelled', 'produced', 'hits', 'misses', 'wasted', 'hit_rate'):
+            gauges[f'prefetch_{field}'] = prefetch[field]
+        busy = self.metrics.histograms.get('prefetch_ms')
+        uptime = time.time() - self.metrics.start
+        if busy is not None and uptime > 0:
+            gauges['worker_utilization'] = busy.sum / 1000.0 / (uptime * len(self.render_threads))
+        return gauges
+    
+    def _record_frame(self, seconds):
+        """Fecha a medição de um frame exibido; de tempos em tempos resume e exporta"""
+        self.metrics.frame(seconds)
+        now = time.time()
+        if not self.metrics.enabled or now - self._metrics_logged < METRICS_LOG_INTERVAL:
+            return
+        self._metrics_logged = now
+        prefetch = self.scheduler.stats()
+        saved = self.metrics.counters.get('transition_saved_ms', 0.0)
+        print(f"{self.metrics.summary()} | pré-render: acertos {prefetch['hit_rate']:.0%}, "
+              f"fila {prefetch['pending']} | transições: ~{saved / 1000:.1f}s poupados")
+        if self.metrics_path:
+            self.metrics.write(self.metrics_path)
+    
+    def export_metrics(self, path):
+        """Grava o snapshot das métricas (.json ou texto do Prometheus)"""
+        self.metrics.write(path)
+        print(f"📊 Métricas gravadas em {path}")
+    
+    def _cache_key(self, zoom, cx, cy, max_iter=None):
+        """Chave do cache; em zoom profundo usa o centro exato"""
+        max_iter = max_iter or self.max_iter
+        if self.deep_zoom and zoom >= DEEP_ZOOM_THRESHOLD:
+            return (zoom, str(to_decimal(cx)), str(to_decimal(cy)), max_iter)
+        return (zoom, round(float(cx), 4), round(float(cy), 4), max_iter)
+    
+    def _uses_frame_cache(self, zoom):
+        """Frames inteiros no cache só sem tiles ou em zoom profundo"""
+        return (not self.use_tiles or (self.deep_zoom and zoom >= DEEP_ZOOM_THRESHOLD)
+                or self._precision_for(zoom) == 'double-double')  # Tiles são float64
+    
+    def _precision_for(self, zoom):
+        """Tier de precisão do frame direto neste zoom (sem perturbação)"""
+        cx, cy = self.center_hp
+        return choose_precision(4.0 / zoom / self.width, max(abs(float(cx)), abs(float(cy))))
     
-    def _generate_fractal_raw(self, zoom, center_x, center_y):
-        """Geração raw ultra-rápida"""
-        x_min = center_x - 2.0 / zoom
-        x_max = center_x + 2.0 / zoom
-        y_min = center_y - 2.0 / zoom
-        y_max = center_y + 2.0 / zoom
+    def _uses_fused_coloring(self, zoom):
+        """Coloração suave fundida: só no caminho de frame inteiro em float64"""
+        return (self.smooth_coloring and not self.use_tiles and not self.interior_check
+                and not (self.deep_zoom and zoom >= DEEP_ZOOM_THRESHOLD)
+                and self._precision_for(zoom) != 'double-double')
+    
+    def _uses_smooth_tiles(self, zoom):
+        """Coloração suave no caminho de tiles (contagem suave em ponto fixo)"""
+        return self.smooth_coloring and not self._uses_frame_cache(zoom)
+    
+    def _uses_antialias(self, zoom):
+        """Antialiasing por distância: kernels float64, fora do zoom profundo"""
+        return (self.antialias and not (self.deep_zoom and zoom >= DEEP_ZOOM_THRESHOLD)
+                and self._precision_for(zoom) != 'double-double')
+    
+    def _output_buffer(self):
+        """Buffer uint8 do frame, reaproveitado enquanto a resolução não muda"""
+        if self.frame_buffer is None or self.frame_buffer.shape[:2] != (self.height, self.width):
+            self.frame_buffer = np.empty((self.height, self.width, 3), dtype=np.uint8)
+        return self.frame_buffer
+    
+    @_serialized
+    def _render_fused(self, zoom, center_x, center_y):
+        """Frame colorido direto pelo kernel, no buffer uint8 pré-alocado"""
+        cr, ci = self._julia_c()
+        self.precision = 'float64'
+        smooth_color_turbo(self._output_buffer(), self.max_iter,
+                           *self._view_bounds(zoom, center_x, center_y),
+                           FRACTAL_KINDS[self.fractal_type], self.colormap, cr, ci)
+        return self.frame_buffer
+    
+    @_serialized
+    def _render_antialiased(self, zoom, center_x, center_y):
+        """Frame com estimativa de distância e superamostragem só na borda"""
+        cr, ci = self._julia_c()
+        bounds = self._view_bounds(zoom, center_x, center_y)
+        kind = FRACTAL_KINDS[self.fractal_type]
+        self.precision = 'float64'
+        mu, distance = distance_turbo(self.height, self.width, self.max_iter, *bounds, kind, cr, ci)
+        self.antialiased_pixels = antialias_turbo(self._output_buffer(), mu, distance, self.max_iter,
+                                                  *bounds, kind, self.colormap, cr, ci)
+        return self.frame_buffer
+    
+    def _julia_c(self):
+        """Parâmetro c do Julia (zero para os outros tipos)"""
+        if self.fractal_type == 'julia':
+            return self.julia_c_real, self.julia_c_imag
+        return 0.0, 0.0
+    
+    def _tile_level(self, zoom):
+        """Nível da quadtree cujo pixel é o mais próximo do pixel da tela"""
+        pixel = 4.0 / zoom / self.width
+        level = round(math.log2(TILE_BASE_SPAN / (self.tile_size * pixel)))
+        return level, TILE_BASE_SPAN / self.tile_size / 2.0 ** level
+    
+    def _prepare_tiles(self, zoom, center_x, center_y):
+        """Canvas alinhado aos tiles que cobre a janela, já com os tiles do cache
         
-        if self.fractal_type == 'mandelbrot':
-            iterations = mandelbrot_turbo(self.height, self.width, self.max_iter, 
-                                        x_min, x_max, y_min, y_max)
-        elif self.fractal_type == 'julia':
-            iterations = julia_turbo(self.height, self.width, self.max_iter,
-                                   x_min, x_max, y_min, y_max,
-                                   self.julia_c_real, self.julia_c_imag)
-        elif self.fractal_type == 'burning_ship':
-            iterations = burning_ship_turbo(self.height, self.width, self.max_iter,
-                                          x_min, x_max, y_min, y_max)
-        else:  # tricorn
-            iterations = tricorn_turbo(self.height, self.width, self.max_iter,
-                                     x_min, x_max, y_min, y_max)
-        
-        # Mapeia para colormap expandido
-        normalized = (iterations * 255 / self.max_iter).astype(np.int32)
-        normalized = np.clip(normalized, 0, 255)
-        
-        return self.colormap[normalized]
+        Os tiles que faltam ficam marcados em view['missing'].
+        """
+        level, spacing = self._tile_level(zoom)
+        x_min, x_max, y_min, y_max = self._view_bounds(zoom, center_x, center_y)
+        dx = (x_max - x_min) / self.width
+        dy = (y_max - y_min) / self.height
+        size = self.tile_size
+        
+        # Índice global (no nível) de cada pixel da tela; a origem é (0, 0)
+        cols = np.floor((x_min + np.arange(self.width) * dx) / spacing).astype(np.int64)
+        rows = np.floor((y_min + np.arange(self.height) * dy) / spacing).astype(np.int64)
+        tx0, ty0 = cols[0] // size, rows[0] // size
+        ntx = cols[-1] // size - tx0 + 1
+        nty = rows[-1] // size - ty0 + 1
+        
+        canvas = np.zeros((nty * size, ntx * size), dtype=np.int32)
+        missing = np.zeros((nty, ntx), dtype=np.bool_)
+        params = (self.fractal_type, *self._julia_c(), self.max_iter, self.smooth_coloring)
+        for ty in range(nty):
+            for tx in range(ntx):
+                tile = self.tile_cache.get((params, level, tx0 + tx, ty0 + ty))
+                if tile is None:
+                    missing[ty, tx] = True
+                else:
+                    canvas[ty*size:(ty+1)*size, tx*size:(tx+1)*size] = tile
+        
+        view = {
+            'params': params, 'level': level, 'spacing': spacing,
+            'tx0': tx0, 'ty0': ty0, 'canvas': canvas, 'missing': missing,
+            'rows': rows - ty0 * size, 'cols': cols - tx0 * size,
+            'state': None, 'resumed': 0,
+        }
+        if missing.any() and self._keeps_state():
+            self._load_states(view)
+        return view
+    
+    def _keeps_state(self):
+        """Estado retomável só enquanto max_iter ainda pode crescer nos tiles"""
+        return self.resume_iterations and self.max_iter < iterations_for_zoom(DEEP_ZOOM_THRESHOLD, False)
+    
+    def _state_key(self, view, tx, ty):
+        """Chave do estado de um tile: a do tile sem max_iter"""
+        fractal_type, cr, ci, _, smooth = view['params']
+        return ((fractal_type, cr, ci, smooth), view['level'], tx, ty)
+    
+    def _load_states(self, view):
+        """Estado (zr, zi, n) dos tiles que faltam, do cache ou do zero
+        
+        view['resumed'] conta as iterações que o estado poupa: as já feitas
+        pelos pixels que não escaparam e as contagens dos que escaparam.
+        """
+        size = self.tile_size
+        state = np.empty(view['canvas'].shape + (3,))
+        state[:, :, 2] = RESUME_FRESH
+        for ty, tx in np.argwhere(view['missing']):
+            tile = self.tile_states.get(self._state_key(view, view['tx0'] + tx, view['ty0'] + ty))
+            if tile is not None:
+                state[ty*size:(ty+1)*size, tx*size:(tx+1)*size] = tile
+                n = tile[:, :, 2]
+                view['resumed'] += int(np.where(n == RESUME_ESCAPED, tile[:, :, 1], np.maximum(n, 0.0)).sum())
+        view['state'] = state
+    
+    @_serialized
+    def _render_tiles(self, view):
+        """Renderiza os tiles que faltam no canvas e os guarda no cache"""
+        missing = view['missing']
+        self.resumed_iterations = view['resumed']
+        if not missing.any():
+            return
+        self.metrics.count('resumed_iterations', view['resumed'])
+        size = self.tile_size
+        cr, ci = self._julia_c()
+        args = (view['canvas'], self._tiles_to_render(view), size, view['tx0'] * size,
+                view['ty0'] * size, view['spacing'], self.max_iter, FRACTAL_KINDS[self.fractal_type],
+                cr, ci)
+        if self.subdivision:
+            _, self.interior_saved = mariani_silver_turbo(*args, interior=self.interior_check,
+                                                          smooth=self.smooth_coloring,
+                                                          state=view['state'])
+        else:
+            _, self.interior_saved = tile_pass_turbo(*args, 1, 0, interior=self.interior_check,
+                                                     smooth=self.smooth_coloring, state=view['state'])
+        self._mirror_tiles(view)
+        self._store_tiles(view)
+    
+    def _tiles_to_render(self, view):
+        """Tiles que faltam menos os que saem por simetria (view['mirrored'])"""
+        view['mirrored'] = None
+        if self.symmetry:
+            size = self.tile_size
+            view['mirrored'] = tile_mirror_plan(FRACTAL_KINDS[self.fractal_type], view['missing'],
+                                                size, view['ty0'] * size, view['tx0'] * size)
+        if view['mirrored'] is None:
+            return view['missing']
+        self.metrics.count('mirrored_tiles', int(view['mirrored'].sum()))
+        return view['missing'] & ~view['mirrored']
+    
+    def _mirror_tiles(self, view):
+        """Preenche os tiles espelhados a partir dos já prontos (e o estado deles)"""
+        if view['mirrored'] is not None:
+            size = self.tile_size
+            mirror_tiles(view['canvas'], view['mirrored'], size, view['ty0'] * size,
+                         view['tx0'] * size, FRACTAL_KINDS[self.fractal_type], view['state'])
+    
+    def _tile_keys(self, view, mask):
+        """Chaves do cache dos tiles da janela marcados em mask"""
+        return [(view['params'], view['level'], view['tx0'] + tx, view['ty0'] + ty)
+                for ty, tx in np.argwhere(mask)]
+    
+    def _store_tiles(self, view):
+        """Guarda os tiles recém-renderizados (o cache descarta os menos usados)"""
+        size = self.tile_size
+        canvas = view['canvas']
+        state = view['state']
+        for key in self._tile_keys(view, view['missing']):
+            ty, tx = key[3] - view['ty0'], key[2] - view['tx0']
+            self.tile_cache.put(key, canvas[ty*size:(ty+1)*size, tx*size:(tx+1)*size])
+            if state is not None:
+                self.tile_states.put(self._state_key(view, key[2], key[3]),
+                                     state[ty*size:(ty+1)*size, tx*size:(tx+1)*size])
+    
+    def _claim_tiles(self, view):
+        """Acertos do pré-render: tiles da janela que ele deixou prontos"""
+        for key in self._tile_keys(view, ~view['missing']):
+            self.scheduler.claim(key)
+        self.scheduler.miss(int(view['missing'].sum()))
+    
+    def _sample_view(self, view, canvas):
+        """Amostra a janela da tela a partir do canvas de tiles"""
+        return canvas[view['rows'][:, None], view['cols'][None, :]]
+    
+    def _set_center(self, cx, cy):
+        """Atualiza o centro (float ou Decimal) mantendo a cópia float"""
+        self.center_hp = (to_decimal(cx), to_decimal(cy))
+        self.center_x = float(self.center_hp[0])
+        self.center_y = float(self.center_hp[1])
+    
+    def _iterations_for_zoom(self, zoom):
+        """Iterações máximas adequadas para a profundidade do zoom"""
+        return iterations_for_zoom(zoom, self.deep_zoom)
+    
+    def _colorize(self, iterations, smooth=False):
+        """Mapeia iterações (ou contagens suaves em ponto fixo) para o colormap"""
+        with self.metrics.stage('colorize'):
+            if smooth:
+                full = iterations.shape == (self.height, self.width)
+                out = self._output_buffer() if full else np.empty(iterations.shape + (3,), dtype=np.uint8)
+                with PARALLEL_LOCK:
+                    smooth_palette_turbo(out, iterations, self.colormap)
+                return out
+            # Escala em float: iterações uint16 do cache estourariam em * 255
+            normalized = (iterations * (255.0 / self.max_iter)).astype(np.int32)
+            np.clip(normalized, 0, 255, out=normalized)
+            # Frames da tela vão para o buffer uint8 pré-alocado
+            out = self._output_buffer() if normalized.shape == (self.height, self.width) else None
+            return np.take(self.colormap_rgb, normalized, axis=0, out=out)
+    
+    def _observe_iterations(self, iterations, smooth=False):
+        """Iterações médias por pixel do frame (contagens suaves voltam à escala)"""
+        if self.metrics.enabled:
+            mean = float(iterations.mean())
+            if smooth:
+                mean *= self.max_iter / SMOOTH_LEVELS
+            self.metrics.observe('iterations_per_pixel', mean, ITERATION_BUCKETS)
+    
+    def _view_bounds(self, zoom, center_x, center_y):
+        """Limites (x_min, x_max, y_min, y_max) da janela visível"""
+        center_x = float(center_x)
+        center_y = float(center_y)
+        return (center_x - 2.0 / zoom, center_x + 2.0 / zoom,
+                center_y - 2.0 / zoom, center_y + 2.0 / zoom)
+    
+    @_serialized
+    def _generate_iterations(self, zoom, center_x, center_y):
+        """Geração raw ultra-rápida das iterações
+        
+        Retorna (iterações, renderizou); renderizou é False quando o frame
+        foi montado só com tiles do cache.
+        """
+        if self.deep_zoom and zoom >= DEEP_ZOOM_THRESHOLD:
+            iterations, self.deep_stats = render_deep(
+                self.fractal_type, self.height, self.width, self.max_iter,
+                center_x, center_y, zoom, julia_c=self._julia_c())
+            self.precision = 'perturbação'
+            return iterations, True
+        
+        # Tiles e frames inteiros: float64 até o double-double ser necessário
+        self.precision = self._precision_for(zoom)
+        if self.use_tiles and self.precision != 'double-double':
+            view = self._prepare_tiles(zoom, center_x, center_y)
+            self._claim_tiles(view)
+            rendered = bool(view['missing'].any())
+            self._render_tiles(view)
+            return self._sample_view(view, view['canvas']), rendered
+        
+        cr, ci = self._julia_c()
+        kind = FRACTAL_KINDS[self.fractal_type]
+        if self.interior_check and self.precision != 'double-double':
+            iterations, self.interior_saved = interior_turbo(
+                self.height, self.width, self.max_iter,
+                *self._view_bounds(zoom, center_x, center_y), kind, cr, ci)
+        else:
+            iterations, _ = render_tiered(self.height, self.width, self.max_iter, center_x, center_y,
+                                          zoom, kind, cr, ci, tier=self.precision)
+        return iterations, True
     
     def generate_fractal_smooth(self):
         """Geração com transições suaves"""
-        cache_key = (self.zoom, round(self.center_x, 4), round(self.center_y, 4))
+        cx, cy = self.center_hp
+        if self._uses_antialias(self.zoom):
+            start_time = time.time()
+            with self.metrics.stage('antialias'):
+                frame = self._render_antialiased(self.zoom, cx, cy)
+            self.metrics.count('antialiased_pixels', self.antialiased_pixels)
+            if self.log_frames:
+                share = self.antialiased_pixels / (self.width * self.height)
+                print(f"⚡ Frame: {(time.time() - start_time)*1000:.1f}ms (antialias: "
+                      f"{share:.1%} dos pixels superamostrados)")
+            return frame
+        if self._uses_fused_coloring(self.zoom):
+            # O kernel fundido já entrega o frame final; não há o que cachear
+            start_time = time.time()
+            with self.metrics.stage('fused'):  # Iteração e cor num kernel só
+                frame = self._render_fused(self.zoom, cx, cy)
+            if self.log_frames:
+                print(f"⚡ Frame: {(time.time() - start_time)*1000:.1f}ms (coloração suave, {self.precision})")
+            return frame
+        
+        cache_key = self._cache_key(self.zoom, cx, cy)
+        use_frame_cache = self._uses_frame_cache(self.zoom)
         
         # Tenta pegar do cache primeiro
-        if cache_key in self.frame_cache:
-            return self.frame_cache[cache_key]
+        if use_frame_cache:
+            cached = self.frame_cache.get(cache_key)
+            if cached is not None:
+                self.scheduler.claim(cache_key)
+                self._preload_next_frames()
+                return self._colorize(cached)
+            self.scheduler.miss()
         
-        # Se não estiver no cache, gera rapidamente
+        # Se não estiver no cache, gera rapidamente (com tiles, só os que faltam)
         start_time = time.time()
-        frame = self._generate_fractal_raw(self.zoom, self.center_x, self.center_y)
+        with self.metrics.stage('iterate'):
+            iterations, rendered = self._generate_iterations(self.zoom, cx, cy)
+        smooth = self._uses_smooth_tiles(self.zoom)
+        self._observe_iterations(iterations, smooth)
+        frame = self._colorize(iterations, smooth)
         calc_time = time.time() - start_time
         
         # Adiciona ao cache
-        if len(self.frame_cache) >= self.cache_size:
-            oldest_key = next(iter(self.frame_cache))
-            del self.frame_cache[oldest_key]
-        self.frame_cache[cache_key] = frame
+        if use_frame_cache:
+            self.frame_cache.put(cache_key, iterations)
         
         # Pré-carrega próximos frames
         self._preload_next_frames()
+        if not self.log_frames or (not use_frame_cache and not rendered):
+            return frame  # Sem log ou montado só com tiles do cache
         
-        print(f"⚡ Frame: {calc_time*1000:.1f}ms | Cache: {len(self.frame_cache)}")
+        if self.deep_zoom and self.zoom >= DEEP_ZOOM_THRESHOLD and self.deep_stats:
+            print(f"🔬 Deep: skip {self.deep_stats['series_skip']} | "
+                  f"rebases {self.deep_stats['rebases']}")
+        if self.interior_check:
+            print(f"🕳️ Interior: {self.interior_saved} iterações economizadas")
+        if self.resumed_iterations:
+            print(f"⏩ Retomadas: {self.resumed_iterations} iterações de tiles com max_iter menor")
+        frames, tiles = self.frame_cache.stats(), self.tile_cache.stats()
+        prefetch = self.scheduler.stats()
+        print(f"⚡ Frame: {calc_time*1000:.1f}ms ({self.precision}) | Cache: {frames['entries']} frames, "
+              f"{tiles['entries']} tiles ({(frames['bytes'] + tiles['bytes']) / 1024**2:.1f} MB, "
+              f"acertos tiles {tiles['hit_rate']:.0%}, descartes {frames['evictions'] + tiles['evictions']}) | "
+              f"Pré-render: acertos {prefetch['hit_rate']:.0%}, cancelados {prefetch['cancelled']}")
         return frame
     
+    def generate_fractal_progressive(self):
+        """Renderização progressiva: gera previews 1/8, 1/4, 1/2 e o frame final
+        
+        Cada passe reaproveita as amostras dos anteriores. Com a subdivisão
+        ligada o frame final vem do Mariani-Silver logo depois das prévias
+        1/8 e 1/4. Um novo pedido de renderização (render_generation)
+        abandona o refinamento em andamento.
+        """
+        self.render_generation += 1
+        generation = self.render_generation
+        cx, cy = self.center_hp
+        
+        # Zoom profundo, modo sem tiles e antialias não têm previews
+        if self._uses_frame_cache(self.zoom) or self._uses_antialias(self.zoom):
+            yield self.generate_fractal_smooth()
+            return
+        
+        start_time = time.time()
+        first_time = None
+        view = self._prepare_tiles(self.zoom, cx, cy)
+        self._claim_tiles(view)
+        canvas = view['canvas']
+        missing = view['missing']
+        if not missing.any():
+            self._preload_next_frames()
+            yield self._colorize(self._sample_view(view, canvas), self.smooth_coloring)
+            return
+        
+        self.metrics.count('resumed_iterations', view['resumed'])
+        size = self.tile_size
+        cr, ci = self._julia_c()
+        missing_pixels = np.repeat(np.repeat(missing, size, axis=0), size, axis=1)
+        args = (canvas, self._tiles_to_render(view), size, view['tx0'] * size, view['ty0'] * size,
+                view['spacing'], self.max_iter, FRACTAL_KINDS[self.fractal_type], cr, ci)
+        strides = self.progressive_strides
+        if self.subdivision:
+            # Só as prévias baratas; o frame final sai da subdivisão
+            strides = [s for s in strides if s >= SUBDIVISION_PREVIEW_STRIDE] + [1]
+        
+        prev_stride = 0
+        for stride in strides:
+            if self.render_generation != generation:
+                return  # Navegação nova: abandona o refinamento
+            
+            with self.metrics.stage('iterate'), PARALLEL_LOCK:
+                if stride == 1 and self.subdivision:
+                    mariani_silver_turbo(*args, interior=self.interior_check, smooth=self.smooth_coloring,
+                                         state=view['state'])
+                else:
+                    tile_pass_turbo(*args, stride, prev_stride, interior=self.interior_check,
+                                    smooth=self.smooth_coloring, state=view['state'])
+            # Os espelhos caem na mesma grade de passo `stride` das fontes
+            self._mirror_tiles(view)
+            prev_stride = stride
+            if first_time is None:
+                first_time = time.time() - start_time
+            
+            if stride > 1:
+                # Tiles novos aparecem em blocos; os do cache já em resolução total
+                coarse = np.repeat(np.repeat(canvas[::stride, ::stride], stride, axis=0), stride, axis=1)
+                preview = np.where(missing_pixels, coarse, canvas)
+                yield self._colorize(self._sample_view(view, preview), self.smooth_coloring)
+        
+        self._store_tiles(view)
+        iterations = self._sample_view(view, canvas)
+        self._observe_iterations(iterations, self.smooth_coloring)
+        frame = self._colorize(iterations, self.smooth_coloring)
+        self._preload_next_frames()
+        
+        if self.log_frames:
+            calc_time = time.time() - start_time
+            print(f"⚡ Frame: {calc_time*1000:.1f}ms (preview: {first_time*1000:.1f}ms) | "
+                  f"Tiles: {int(missing.sum())} novos, {len(self.tile_cache)} no cache, "
+                  f"{view['resumed']} iterações retomadas")
+        yield frame
+    
+    def _animation_step(self, zoom, cx, cy, direction):
+        """Próximo (zoom, cx, cy) do auto-zoom: 5% rumo ao alvo e zoom de 5%"""
+        # Movimento suave em direção ao target (diferença em alta precisão)
+        dx = float(to_decimal(self.target_x) - cx) * 0.05
+        dy = float(to_decimal(self.target_y) - cy) * 0.05
+        cx, cy = offset_center(cx, cy, dx, dy, zoom)
+        return zoom * (1.05 if direction > 0 else 0.95), cx, cy
+    
+    def _predict_frames(self):
+        """Frames prováveis em ordem de chegada: [(zoom, cx, cy, max_iter)]
+        
+        Primeiro o que já está decidido (passos restantes de um clique ou
+        zoom); depois, no auto-zoom, a própria trajetória simulada; fora
+        dele, os passos de zoom +/- e a repetição do deslocamento médio dos
+        últimos cliques, intercalados por distância.
+        """
+        frames = list(self.planned_frames)
+        zoom, cx, cy, max_iter = frames[-1] if frames else (self.zoom, *self.center_hp, self.max_iter)
+        ahead = self.prefetch_ahead
+        
+        if self.auto_zoom:
+            # Com o render atrasado o relógio pula passos: prevê de stride em stride
+            direction = self.zoom_direction
+            for _ in range(ahead):
+                for _ in range(self.animation_stride):
+                    if zoom > self._auto_zoom_limit():
+                        direction = -1
+                    elif zoom < 2:
+                        return frames  # Vai sortear um alvo novo: imprevisível
+                    zoom, cx, cy = self._animation_step(zoom, cx, cy, direction)
+                if self.deep_zoom:
+                    max_iter = self._iterations_for_zoom(zoom)
+                frames.append((zoom, cx, cy, max_iter))
+            return frames
+        
+        now = time.time()
+        moves = [(mx, my) for t, mx, my in self.click_moves if now - t < CLICK_MEMORY]
+        guesses = []
+        for step in range(1, ahead + 1):
+            t = step / ahead
+            guesses.append([(zoom * self.zoom_factor ** t, cx, cy, max_iter),
+                            (zoom / self.zoom_factor ** t, cx, cy, max_iter)])
+            if moves:
+                # Mesma interpolação de on_click, repetindo o movimento médio
+                span = 4.0 / zoom
+                mx = sum(m[0] for m in moves) / len(moves) * span * t
+                my = sum(m[1] for m in moves) / len(moves) * span * t
+                guesses[-1].insert(0, (zoom, *offset_center(cx, cy, mx, my, zoom), max_iter))
+        return frames + [frame for group in guesses for frame in group]
+    
     def _preload_next_frames(self):
-        """Pré-carrega próximos frames prováveis"""
-        if self.render_queue.qsize() < 3:  # Não sobrecarrega a queue
-            # Pré-carrega zooms próximos
-            for zoom_mult in [self.zoom_factor, 1/self.zoom_factor]:
-                next_zoom = self.zoom * zoom_mult
-                try:
-                    self.render_queue.put_nowait((next_zoom, self.center_x, self.center_y))
-                except queue.Full:
-                    break
+        """Reagenda o pré-render para os frames previstos (prioridade = ordem)"""
+        jobs = {}
+        for zoom, cx, cy, max_iter in self._predict_frames():
+            if self._uses_antialias(zoom) or self._uses_fused_coloring(zoom):
+                continue  # Frames coloridos direto pelo kernel não passam pelo cache
+            key = self._cache_key(zoom, cx, cy, max_iter)
+            if key not in jobs:
+                jobs[key] = ((zoom, cx, cy, max_iter), len(jobs))
+        self.scheduler.retarget([(key, params, priority)
+                                 for key, (params, priority) in jobs.items()])
+    
+    def _plan_frames(self, frames):
+        """Registra os frames de uma transição e já agenda o pré-render deles"""
+        self.planned_frames = deque((zoom, cx, cy, self.max_iter) for zoom, cx, cy in frames)
+        self._preload_next_frames()
     
     def smooth_zoom_in(self, event):
         """Zoom suave com interpolação"""
-        for step in range(self.transition_steps):
-            zoom_step = self.zoom * (self.zoom_factor ** (step / self.transition_steps))
-            self._smooth_update(zoom_step, self.center_x, self.center_y)
-        
-        self.zoom *= self.zoom_factor
-        if self.zoom > 5:
-            self.max_iter = min(100, int(50 + np.log10(self.zoom) * 10))
+        path = [(self.zoom * (self.zoom_factor ** (step / self.transition_steps)), *self.center_hp)
+                for step in range(1, self.transition_steps + 1)]
+        # Iterações do zoom de destino já valem para a transição; os tiles do
+        # destino pré-renderizados com o max_iter anterior são retomados
+        if path[-1][0] > 5:
+            self.max_iter = self._iterations_for_zoom(path[-1][0])
             self.generate_colormap()
+        self._transition(path)
     
     def smooth_zoom_out(self, event):
         """Zoom out suave"""
-        for step in range(self.transition_steps):
-            zoom_step = self.zoom * (1/self.zoom_factor) ** (step / self.transition_steps)
-            self._smooth_update(zoom_step, self.center_x, self.center_y)
-        
-        self.zoom /= self.zoom_factor
-        if self.zoom <= 5:
-            self.max_iter = 50
+        path = [(self.zoom * (1/self.zoom_factor) ** (step / self.transition_steps), *self.center_hp)
+                for step in range(1, self.transition_steps + 1)]
+        new_iter = self._iterations_for_zoom(path[-1][0])
+        if new_iter != self.max_iter:
+            self.max_iter = new_iter
             self.generate_colormap()
+        self._transition(path)
+    
+    def _transition(self, path):
+        """Leva a tela pela trajetória path = [(zoom, cx, cy)] até o último ponto
+        
+        Com synthesize_transitions só o destino é renderizado; os passos do
+        meio saem do ZoomTransition (frame da tela + destino reamostrados)
+        no ritmo de target_fps. O destino vem do gerador progressivo: o
+        primeiro frame sai com o passe 1/8 e cada frame seguinte avança um
+        passe, então o detalhe chega durante a animação. Sem
+        synthesize_transitions cada passo é um frame renderizado.
+        """
+        if not self.synthesize_transitions:
+            self._plan_frames(path)
+            for zoom, cx, cy in path:
+                self._smooth_update(zoom, cx, cy)
+            return
+        
+        self.planned_frames.clear()
+        start = time.perf_counter()
+        source_view = (self.zoom, *self.center_hp)
+        renders = 1
+        if self.last_frame is not None and self.last_view == source_view:
+            source = self.last_frame.copy()
+        else:
+            # Tela fora de sincronia com o estado (ex.: depois do auto-zoom)
+            source = self.generate_fractal_smooth().copy()
+            renders += 1
+        
+        # A única renderização da transição: o destino, passe a passe
+        *steps, target_view = path
+        self.zoom = target_view[0]
+        self._set_center(*target_view[1:])
+        render_start = time.perf_counter()
+        if self.progressive:
+            passes = self.generate_fractal_progressive()  # Incrementa render_generation
+        else:
+            self.render_generation += 1
+            passes = iter([self.generate_fractal_smooth()])
+        target = next(passes).copy()  # Os passes reaproveitam o buffer do frame
+        generation = self.render_generation
+        render_time = time.perf_counter() - render_start
+        
+        engine = ZoomTransition(source, source_view, target, target_view)
+        period = 1.0 / self.target_fps
+        shown = time.perf_counter() - period
+        for i, view in enumerate(steps + [target_view], 1):
+            # Um passe por frame; o último frame espera o destino completo
+            for _ in range(1 if i < len(path) else len(self.progressive_strides)):
+                render_start = time.perf_counter()
+                refined = next(passes, None)
+                if refined is None:
+                    break
+                np.copyto(target, refined)
+                render_time += time.perf_counter() - render_start
+            if self.render_generation != generation:
+                return  # Navegação nova abandonou o destino
+            
+            delay = shown + period - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)  # Sem renders no caminho: segura o ritmo da animação
+            shown = time.perf_counter()
+            if i < len(path):
+                with self.metrics.stage('warp'), PARALLEL_LOCK:
+                    frame = engine.frame(view, i / len(path))
+            else:
+                frame = target
+            self.zoom = view[0]  # Estado acompanha a tela (cliques durante a transição)
+            self._set_center(*view[1:])
+            self._display(frame, pause=0.001)
+            # O primeiro frame responde ao pedido: inclui o render do passe 1/8
+            self._record_frame(time.perf_counter() - (start if i == 1 else shown))
+            if self.render_generation != generation:
+                return  # Navegação nova começou durante a transição
+        
+        stats = engine.stats(render_time)
+        self.metrics.count('transition_renders', renders)
+        self.metrics.count('synthesized_frames', stats['synthesized'])
+        self.metrics.count('transition_saved_ms', stats['saved_ms'])
+        if self.log_frames:
+            print(f"🎞️ Transição: {renders} render(s), destino {stats['render_ms']:.1f}ms | "
+                  f"{stats['synthesized']} frames sintetizados em {stats['warp_ms']:.1f}ms | "
+                  f"~{stats['saved_ms']:.0f}ms de cálculo poupados")
     
     def _smooth_update(self, zoom, cx, cy):
         """Atualização ultra-suave"""
         self.zoom = zoom
-        self.center_x = cx
-        self.center_y = cy
+        self._set_center(cx, cy)
+        if self.planned_frames:
+            self.planned_frames.popleft()  # Este frame sai da previsão
+        start = time.perf_counter()
+        
+        if self.progressive:
+            # Cada preview é exibido; eventos processados na pausa podem
+            # disparar uma navegação nova que abandona os passes restantes
+            for fractal_image in self.generate_fractal_progressive():
+                self._display(fractal_image, pause=0.001)
+            self._record_frame(time.perf_counter() - start)
+            return
         
         fractal_image = self.generate_fractal_smooth()
-        self.im.set_array(fractal_image)
-        self.fig.canvas.draw_idle()
-        plt.pause(0.01)  # Pequena pausa para fluidez
+        self._display(fractal_image)
+        self._record_frame(time.perf_counter() - start)
+    
+    @_serialized
+    def _display(self, frame, pause=0.01):
+        """Leva o frame para a tela (blitting ou redesenho completo + pausa)"""
+        with self.metrics.stage('display'):
+            self.presenter.present(frame, pause)
+        self._keep_frame(frame)
+    
+    def _keep_frame(self, frame):
+        """Guarda o frame exibido e a view dele: ponto de partida das transições"""
+        if self.last_frame is None or self.last_frame.shape != frame.shape:
+            self.last_frame = np.empty_like(frame)
+        np.copyto(self.last_frame, frame)
+        self.last_view = (self.zoom, *self.center_hp)
+    
+    def toggle_antialias(self, event):
+        """Liga/desliga o antialias por estimativa de distância"""
+        self.antialias = not self.antialias
+        # Com antialias a interpolação bilinear só borraria o frame
+        self.im.set_interpolation('nearest' if self.antialias else 'bilinear')
+        self._display(self.generate_fractal_smooth(), pause=0)
     
     def toggle_auto_zoom(self, event):
         """Toggle animação automática"""
@@ -353,43 +1779,91 @@ class VideoSmoothFractalGenerator:
         if self.auto_zoom:
             self.start_animation()
         else:
-            if self.animation_timer:
-                self.animation_timer.cancel()
+            self.stop_animation()
     
     def start_animation(self):
-        """Inicia animação suave automática"""
+        """Inicia animação suave automática: timer da GUI + thread de render"""
         if not self.auto_zoom:
             return
+        self.animation_run = run = object()
+        self.clock.reset()
+        _start_kernel_thread(self._animation_loop, run)
+        
+        if self.frame_timer is None:
+            # Timer do próprio backend: o callback roda na thread da GUI
+            self.frame_timer = self.fig.canvas.new_timer(interval=max(1, int(1000 / self.target_fps)))
+            self.frame_timer.add_callback(self._present_frame)
+        self.frame_timer.start()
+    
+    def stop_animation(self):
+        """Para o relógio da animação (a thread de render sai no próximo passo)"""
+        self.auto_zoom = False
+        self.animation_run = None
+        if self.frame_timer is not None:
+            self.frame_timer.stop()
+    
+    def _animation_loop(self, run):
+        """Thread de render: estado do instante atual, publicado no buffer duplo"""
+        while self.auto_zoom and run is self.animation_run and not _exiting.is_set():
+            steps = self.clock.due_steps()
+            if steps == 0:
+                time.sleep(self.clock.wait_time())
+                continue
+            if steps > 1:
+                self.metrics.count('skipped_frames', steps - 1)
+            self.animation_stride = steps
+            for _ in range(steps):
+                self._advance_animation()
+            
+            start = time.perf_counter()
+            try:
+                frame = self.generate_fractal_smooth()
+            except Exception as e:
+                print(f"⚠️ Animação interrompida: {e}")
+                self.auto_zoom = False
+                return
+            self.frames.publish(frame, start)
+    
+    @_serialized
+    def _present_frame(self):
+        """Callback do timer da GUI: apresenta o frame mais novo, se houver"""
+        start = time.perf_counter()
+        with self.frames.front() as (frame, requested):
+            if frame is None:
+                return
+            self.im.set_data(frame)  # O matplotlib copia o array
         
+        if start - self._fps_shown >= 0.5:
+            self._fps_shown = start
+            stats = self.clock.stats()
+            self.fps_text.set_text(f"🎯 {stats['achieved_fps']:.1f} / {stats['target_fps']} FPS | "
+                                   f"{stats['skipped_frames']} passos pulados")
+        self.presenter.redraw(pause=0)
+        now = time.perf_counter()
+        self.metrics.observe('display_ms', (now - start) * 1000.0)
+        self.clock.present(now)
+        self._record_frame(now - requested)
+    
+    def _advance_animation(self):
+        """Um passo da animação automática"""
         # Zoom automático suave
-        if self.zoom > 100:
+        if self.zoom > self._auto_zoom_limit():
             self.zoom_direction = -1
         elif self.zoom < 2:
             self.zoom_direction = 1
             # Muda para um ponto interessante aleatório
-            self.target_x, self.target_y = random.choice(self.interesting_points)
-        
-        # Movimento suave em direção ao target
-        dx = (self.target_x - self.center_x) * 0.05
-        dy = (self.target_y - self.center_y) * 0.05
+            self.target_x, self.target_y, self.target_depth = random.choice(self.interesting_points)
         
-        self.center_x += dx
-        self.center_y += dy
-        
-        # Zoom suave
-        if self.zoom_direction > 0:
-            self.zoom *= 1.05
-        else:
-            self.zoom *= 0.95
+        # Movimento rumo ao target e zoom suave (a mesma conta prevê os
+        # próximos frames para o pré-render)
+        self.zoom, cx, cy = self._animation_step(self.zoom, *self.center_hp, self.zoom_direction)
+        self._set_center(cx, cy)
         
-        # Atualiza frame
-        fractal_image = self.generate_fractal_smooth()
-        self.im.set_array(fractal_image)
-        self.fig.canvas.draw_idle()
-        
-        # Próximo frame
-        self.animation_timer = threading.Timer(0.033, self.start_animation)  # ~30 FPS
-        self.animation_timer.start()
+        if self.deep_zoom:
+            new_iter = self._iterations_for_zoom(self.zoom)
+            if new_iter != self.max_iter:
+                self.max_iter = new_iter
+                self.generate_colormap()
     
     def on_click(self, event):
         """Click suave com transição"""
@@ -397,38 +1871,43 @@ class VideoSmoothFractalGenerator:
             return
         
         range_size = 4.0 / self.zoom
-        new_x = self.center_x - range_size/2 + (event.xdata / self.width) * range_size
-        new_y = self.center_y - range_size/2 + ((self.height - event.ydata) / self.height) * range_size
+        # Deslocamento relativo em float; o centro absoluto fica em alta precisão
+        off_x = (event.xdata / self.width - 0.5) * range_size
+        off_y = ((self.height - event.ydata) / self.height - 0.5) * range_size
+        start_x, start_y = self.center_hp
+        self.click_moves.append((time.time(), off_x / range_size, off_y / range_size))
         
         # Transição suave para novo centro
         steps = 6
-        for i in range(steps):
-            t = (i + 1) / steps
-            interp_x = self.center_x + (new_x - self.center_x) * t
-            interp_y = self.center_y + (new_y - self.center_y) * t
-            self._smooth_update(self.zoom, interp_x, interp_y)
+        path = [(self.zoom, *offset_center(start_x, start_y, off_x * (i + 1) / steps,
+                                           off_y * (i + 1) / steps, self.zoom))
+                for i in range(steps)]
+        self._transition(path)
     
     def new_fractal(self, event):
         """Novo fractal com transição"""
         print("🎬 Novo fractal suave...")
         
         # Para animação
-        if self.auto_zoom:
-            self.auto_zoom = False
-            if self.animation_timer:
-                self.animation_timer.cancel()
+        self.stop_animation()
         
-        # Limpa cache
+        # Limpa cache e descarta o pré-render do fractal anterior
         self.frame_cache.clear()
+        self.scheduler.close()
         
-        # Novo fractal
+        # Novo fractal (a interface e o presenter continuam os mesmos)
+        presenter = self.presenter
         self.__init__()
-        fractal_image = self.generate_fractal_smooth()
-        self.im.set_array(fractal_image)
-        self.fig.canvas.draw_idle()
+        self.presenter = presenter
+        self._display(self.generate_fractal_smooth(), pause=0)
     
     def show(self):
         """Interface de vídeo suave"""
+        # matplotlib só é carregado pela interface (o render em lote é headless)
+        import matplotlib.pyplot as plt
+        from matplotlib.widgets import Button
+        from display import BlitPresenter
+        
         print("🎬 Iniciando modo vídeo suave...")
         
         plt.style.use('dark_background')
@@ -437,9 +1916,16 @@ class VideoSmoothFractalGenerator:
                          fontsize=18, color='white')
         
         # Primeira renderização
+        first_start = time.perf_counter()
         fractal_image = self.generate_fractal_smooth()
+        now = time.perf_counter()
+        hits, misses = kernel_cache_stats()
+        print(f"⏱️ Startup: primeiro frame {(now - first_start)*1000:.0f}ms, "
+              f"{(now - self.startup_time)*1000:.0f}ms desde o início | "
+              f"kernels do cache em disco: {hits}, compilados: {misses}")
         self.im = self.ax.imshow(fractal_image, extent=[0, self.width, 0, self.height], 
-                                interpolation='bilinear')  # Interpolação para suavidade
+                                interpolation='nearest' if self.antialias else 'bilinear')
+        self._keep_frame(fractal_image)
         self.ax.set_xticks([])
         self.ax.set_yticks([])
         
@@ -457,6 +1943,7 @@ class VideoSmoothFractalGenerator:
             ('Zoom +', self.smooth_zoom_in),
             ('Zoom -', self.smooth_zoom_out), 
             ('Auto', self.toggle_auto_zoom),
+            ('AA', self.toggle_antialias),
             ('Novo', self.new_fractal)
         ]
         
@@ -475,6 +1962,11 @@ class VideoSmoothFractalGenerator:
             f'🎯 {self.max_iter} iter',
             '🧵 Multi-thread cache',
             '💾 Smart pre-loading',
+            '🔬 Deep zoom (perturbação)',
+            '🧩 Subdivisão Mariani-Silver',
+            '🗺️ Cache de tiles (quadtree)',
+            '✨ Antialias na borda (AA)',
+            '🪞 Simetria (eixo real / origem)',
             '',
             '🎮 CONTROLES:',
             '• Click = Navegar suave',
@@ -488,17 +1980,25 @@ class VideoSmoothFractalGenerator:
             weight = 'bold' if any(x in text for x in ['🎬', '⚡', '🎮', '🚀']) else 'normal'
             size = 11 if weight == 'bold' else 9
             color = 'cyan' if weight == 'bold' else 'white'
-            self.fig.text(0.02, 0.65 - i*0.032, text, fontsize=size, 
+            self.fig.text(0.02, 0.59 - i*0.032, text, fontsize=size, 
                          weight=weight, color=color)
         
+        # FPS medido contra o alvo (atualizado pelo relógio da animação)
+        self.fps_text = self.fig.text(0.55, 0.02, f'🎯 alvo {self.target_fps} FPS',
+                                      ha='center', fontsize=10, color='cyan')
+        self.presenter = BlitPresenter(self.fig, self.ax, self.im, overlays=[self.fps_text],
+                                       blit=self.blit)
+        
         plt.tight_layout()
         plt.show()
+        
+        print(self.metrics.summary())
+        if self.metrics_path:
+            self.export_metrics(self.metrics_path)
     
     def __del__(self):
         """Cleanup ao destruir"""
         self.cache_thread_running = False
-        if hasattr(self, 'animation_timer') and self.animation_timer:
-            self.animation_timer.cancel()
 
 if __name__ == "__main__":
     print("🎬" * 25)
@@ -519,6 +2019,8 @@ if __name__ == "__main__":
     
     try:
         fractal_gen = VideoSmoothFractalGenerator()
+        # Opcional: caminho do snapshot de métricas (.json ou texto do Prometheus)
+        fractal_gen.metrics_path = sys.argv[1] if len(sys.argv) > 1 else None
         fractal_gen.show()
     except ImportError as e:
         print(f"\n❌ Para performance máxima instale:")
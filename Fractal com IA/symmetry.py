@@ -0,0 +1,71 @@
+import numpy as np
+
+# Simetria de cada tipo (ids de FRACTAL_KINDS): Mandelbrot e Tricorn são
+# simétricos em relação ao eixo real, o Julia em relação à origem (z -> -z).
+# O Burning Ship não tem simetria (o |·| quebra a conjugação)
+SYMMETRY = {0: 'axis', 1: 'point', 3: 'axis'}
+
+
+def _mirror_span(start, tile, origin, size):
+    """Índices no canvas do espelho de [start, start + tile), ou None fora dele
+
+    O índice i do canvas é o ponto global origin + i da grade; o espelho do
+    ponto k é -k, ou seja, o índice -2·origin - i.
+    """
+    src = -2 * origin - np.arange(start, start + tile)
+    if src.min() < 0 or src.max() >= size:
+        return None
+    return src
+
+
+def tile_mirror_plan(kind, missing, tile, row0, col0):
+    """Tiles que faltam e podem sair do espelho de outros tiles do canvas
+
+    O pixel (i, j) do canvas de tiles fica em ((col0 + j)·s, (row0 + i)·s):
+    a grade é simétrica em relação à origem e o espelho de cada pixel cai
+    numa coordenada exatamente negada, então o espelhamento dá os mesmos
+    valores do render. Espelham os tiles inteiros acima do eixo (linhas
+    globais < 0) cujo espelho está todo no canvas; as fontes ficam abaixo
+    do eixo, já prontas ou renderizadas antes. Retorna a máscara dos tiles
+    espelhados, ou None se não houver nenhum.
+    """
+    mode = SYMMETRY.get(kind)
+    if mode is None:
+        return None
+    nty, ntx = missing.shape
+    mirrored = np.zeros_like(missing)
+    for ty, tx in np.argwhere(missing):
+        if row0 + (ty + 1) * tile > 0:
+            continue  # Tile toca o eixo ou fica abaixo dele
+        if _mirror_span(ty * tile, tile, row0, nty * tile) is None:
+            continue
+        if mode == 'point' and _mirror_span(tx * tile, tile, col0, ntx * tile) is None:
+            continue
+        mirrored[ty, tx] = True
+    return mirrored if mirrored.any() else None
+
+
+def mirror_tiles(canvas, mirrored, tile, row0, col0, kind, state=None):
+    """Preenche os tiles marcados em `mirrored` com o espelho dos pixels fonte
+
+    Com state (zr, zi, n por pixel, ver resume_point) o estado também é
+    espelhado: órbitas em andamento (n >= 0) conjugam z no eixo real e
+    trocam o sinal de z no Julia; os marcadores são copiados como estão.
+    """
+    point = SYMMETRY[kind] == 'point'
+    h, w = canvas.shape
+    for ty, tx in np.argwhere(mirrored):
+        rows = slice(ty * tile, (ty + 1) * tile)
+        cols = slice(tx * tile, (tx + 1) * tile)
+        src_rows = _mirror_span(ty * tile, tile, row0, h)[:, None]
+        src_cols = (_mirror_span(tx * tile, tile, col0, w) if point
+                    else np.arange(tx * tile, (tx + 1) * tile))[None, :]
+        canvas[rows, cols] = canvas[src_rows, src_cols]
+        if state is not None:
+            block = state[src_rows, src_cols]
+            orbit = block[:, :, 2] >= 0
+            np.negative(block[:, :, 1], out=block[:, :, 1], where=orbit)
+            if point:
+                np.negative(block[:, :, 0], out=block[:, :, 0], where=orbit)
+            state[rows, cols] = block
+    return canvas
@@ -0,0 +1,193 @@
+import bisect
+import json
+import threading
+import time
+
+# Orçamento de um frame a 30 FPS; frames acima dele contam como perdidos
+FRAME_BUDGET = 0.033
+
+# Limites superiores dos buckets dos histogramas (latências em ms)
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 33, 50, 100, 200, 500, 1000, 5000)
+ITERATION_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 5000)
+
+
+class Histogram:
+    """Histograma de buckets fixos (cumulativo na exportação, como no Prometheus)"""
+
+    def __init__(self, bounds=LATENCY_BUCKETS_MS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)  # O último é o +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q):
+        """Quantil aproximado por interpolação linear dentro do bucket"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                lo = self.bounds[i - 1] if i else 0.0
+                hi = self.bounds[i] if i < len(self.bounds) else self.bounds[-1]
+                return lo + (hi - lo) * (rank - seen) / n
+            seen += n
+        return float(self.bounds[-1])
+
+    def cumulative(self):
+        """[(limite, contagem acumulada)], terminando em ('+Inf', total)"""
+        total, buckets = 0, []
+        for bound, n in zip(self.bounds + ('+Inf',), self.counts):
+            total += n
+            buckets.append((bound, total))
+        return buckets
+
+    def snapshot(self):
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'mean': self.sum / self.count if self.count else 0.0,
+            'p50': self.quantile(0.50),
+            'p95': self.quantile(0.95),
+            'p99': self.quantile(0.99),
+            'buckets': {str(bound): n for bound, n in self.cumulative()},
+        }
+
+
+class _NullTimer:
+    """Timer das métricas desligadas: não mede nada"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _StageTimer:
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.observe(f'{self.name}_ms', (time.perf_counter() - self.start) * 1000.0)
+        return False
+
+
+class Metrics:
+    """Contadores, histogramas e coletores de gauges, exportáveis em JSON ou Prometheus
+
+    Com enabled=False cada chamada vira um retorno imediato (stage devolve
+    um timer vazio compartilhado), então a instrumentação pode ficar no
+    caminho quente. Coletores (add_collector) são funções sem argumentos que
+    devolvem {nome: valor}; só rodam na exportação, então estatísticas que
+    já existem em outros objetos (caches, fila de pré-render) não custam
+    nada por frame.
+    """
+
+    def __init__(self, enabled=True, budget=FRAME_BUDGET, prefix='fractal'):
+        self.enabled = enabled
+        self.budget = budget
+        self.prefix = prefix
+        self.start = time.time()
+        self.counters = {}
+        self.histograms = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def count(self, name, n=1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def observe(self, name, value, bounds=LATENCY_BUCKETS_MS):
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram(bounds)
+            histogram.observe(value)
+
+    def stage(self, name):
+        """with metrics.stage('iterate'): ... -> histograma iterate_ms"""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _StageTimer(self, name)
+
+    def frame(self, seconds):
+        """Registra um frame exibido (do pedido até a tela) e se estourou o orçamento"""
+        if not self.enabled:
+            return
+        self.observe('frame_ms', seconds * 1000.0)
+        self.count('frames')
+        if seconds > self.budget:
+            self.count('dropped_frames')
+
+    def add_collector(self, collector):
+        self._collectors.append(collector)
+
+    def snapshot(self):
+        """Estado atual: contadores, histogramas (com percentis) e gauges dos coletores"""
+        gauges = {}
+        for collector in self._collectors:
+            gauges.update(collector())
+        with self._lock:
+            return {
+                'uptime_s': time.time() - self.start,
+                'frame_budget_ms': self.budget * 1000.0,
+                'counters': dict(self.counters),
+                'histograms': {name: h.snapshot() for name, h in self.histograms.items()},
+                'gauges': gauges,
+            }
+
+    def to_json(self):
+        return json.dumps(self.snapshot(), indent=2, sort_keys=True)
+
+    def to_prometheus(self):
+        """Formato texto de exposição do Prometheus"""
+        snapshot = self.snapshot()
+        p = self.prefix
+        lines = [f'# TYPE {p}_uptime_seconds gauge', f'{p}_uptime_seconds {snapshot["uptime_s"]:.3f}']
+        for name, value in sorted(snapshot['counters'].items()):
+            lines += [f'# TYPE {p}_{name}_total counter', f'{p}_{name}_total {value}']
+        for name, value in sorted(snapshot['gauges'].items()):
+            lines += [f'# TYPE {p}_{name} gauge', f'{p}_{name} {float(value)}']
+        with self._lock:
+            histograms = [(name, h.cumulative(), h.sum, h.count)
+                          for name, h in sorted(self.histograms.items())]
+        for name, buckets, total, count in histograms:
+            lines.append(f'# TYPE {p}_{name} histogram')
+            lines += [f'{p}_{name}_bucket{{le="{bound}"}} {n}' for bound, n in buckets]
+            lines += [f'{p}_{name}_sum {total}', f'{p}_{name}_count {count}']
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path):
+        """Grava um snapshot: JSON se o arquivo termina em .json, senão Prometheus"""
+        text = self.to_json() if path.endswith('.json') else self.to_prometheus()
+        with open(path, 'w') as f:
+            f.write(text)
+
+    def summary(self):
+        """Uma linha para o terminal: frames, percentis e frames perdidos"""
+        with self._lock:
+            frames = self.histograms.get('frame_ms')
+            dropped = self.counters.get('dropped_frames', 0)
+            if frames is None:
+                return "📊 Nenhum frame medido"
+            return (f"📊 {frames.count} frames | p50 {frames.quantile(0.5):.1f}ms | "
+                    f"p95 {frames.quantile(0.95):.1f}ms | perdidos {dropped} "
+                    f"({dropped / frames.count:.0%} acima de {self.budget*1000:.0f}ms)")
@@ -0,0 +1,314 @@
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal, localcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from batch_render import _init_worker, encode_png, render_frame_rgb
+from deep_zoom import FRACTAL_KINDS
+from render_cache import RenderCache
+from scriptSuperOtimizado import iterations_for_zoom
+
+TILE_SIZE = 256
+# Nível z cobre o quadrado [-2, 2]² com 2^z x 2^z tiles (mesma origem da quadtree do gerador)
+MAX_LEVEL = 60
+# Entra nas chaves, nos ETags e nos caminhos do cache em disco: mudar a
+# renderização exige incrementar, senão os clientes ficam com tiles velhos
+TILE_VERSION = 1
+CACHE_CONTROL = 'public, max-age=86400'
+DEFAULT_JULIA_C = (-0.8, 0.156)
+
+VIEWER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tile_viewer.html')
+TILE_PATH = re.compile(r'^/(\w+)/(\d+)/(\d+)/(\d+)\.png$')
+
+
+def tile_center(z, x, y):
+    """Centro exato (Decimal) do tile; y cresce para baixo como nos mapas"""
+    with localcontext() as ctx:
+        ctx.prec = 100  # 4 / 2^z é exato em decimal para z <= MAX_LEVEL
+        span = Decimal(4) / Decimal(2 ** z)
+        return (Decimal(-2) + (x + Decimal('0.5')) * span,
+                Decimal(2) - (y + Decimal('0.5')) * span)
+
+
+def tile_job(fractal_type, z, x, y, color_scheme=0, julia_c=DEFAULT_JULIA_C, max_iter=None,
+             antialias=False):
+    """Pedido de render (formato do batch_render) de um tile"""
+    cx, cy = tile_center(z, x, y)
+    zoom = float(2 ** z)  # A janela do frame cobre 4/zoom = o lado do tile
+    return {
+        'index': 0,
+        'fractal_type': fractal_type,
+        'color_scheme': color_scheme,
+        'julia_c': julia_c,
+        'center': (str(cx), str(cy)),
+        'zoom': zoom,
+        'max_iter': max_iter or iterations_for_zoom(zoom),
+        'width': TILE_SIZE,
+        'height': TILE_SIZE,
+        'interior': False,
+        'antialias': antialias,
+    }
+
+
+def render_tile(job):
+    """Executado nos workers: PNG do tile (linha 0 no topo, como nos mapas)"""
+    return encode_png(np.ascontiguousarray(render_frame_rgb(job)[::-1]))
+
+
+class TileStats:
+    """Contadores e latências do servidor (thread-safe)"""
+
+    def __init__(self, window=1000):
+        self.start = time.time()
+        self.counts = {name: 0 for name in
+                       ('requests', 'not_modified', 'memory_hits', 'disk_hits', 'rendered',
+                        'coalesced', 'errors')}
+        self.latency = deque(maxlen=window)  # Segundos por tile servido
+        self.render_latency = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def count(self, name):
+        with self._lock:
+            self.counts[name] += 1
+
+    def record(self, seconds, rendered=False):
+        with self._lock:
+            self.latency.append(seconds)
+            if rendered:
+                self.render_latency.append(seconds)
+
+    @staticmethod
+    def _percentiles(values):
+        if not values:
+            return {'p50_ms': 0.0, 'p95_ms': 0.0, 'p99_ms': 0.0}
+        p50, p95, p99 = np.percentile(np.array(values) * 1000.0, (50, 95, 99))
+        return {'p50_ms': p50, 'p95_ms': p95, 'p99_ms': p99}
+
+    def snapshot(self):
+        """Contadores, vazão (por segundo desde o início) e percentis de latência"""
+        with self._lock:
+            elapsed = time.time() - self.start
+            return {
+                **self.counts,
+                'uptime_s': elapsed,
+                'requests_per_s': self.counts['requests'] / elapsed if elapsed else 0.0,
+                'tiles_rendered_per_s': self.counts['rendered'] / elapsed if elapsed else 0.0,
+                'latency': self._percentiles(list(self.latency)),
+                'render_latency': self._percentiles(list(self.render_latency)),
+            }
+
+
+class TileServer:
+    """Tiles XYZ dos fractais: cache em memória (LRU), cache em disco e pool de workers
+
+    Pedidos simultâneos do mesmo tile esperam o mesmo render.
+    """
+
+    def __init__(self, cache_dir='tiles', memory_bytes=64 * 1024**2, workers=None,
+                 numba_threads=1):
+        self.cache_dir = cache_dir
+        self.memory = RenderCache(max_bytes=memory_bytes, compact=None)
+        self.pool = ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1,
+                                        initializer=_init_worker, initargs=(numba_threads,))
+        self.stats = TileStats()
+        self._in_flight = {}  # chave -> Future do render em andamento
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def tile_key(fractal_type, z, x, y, color_scheme, julia_c, max_iter, antialias):
+        """Chave do tile: tudo que muda os pixels (e a versão do render)"""
+        c = julia_c if fractal_type == 'julia' else None
+        return (TILE_VERSION, fractal_type, z, x, y, color_scheme, c, max_iter, antialias)
+
+    @staticmethod
+    def etag(key):
+        return '"' + hashlib.sha1(repr(key).encode()).hexdigest()[:20] + '"'
+
+    def _disk_path(self, key):
+        """tiles/<versão>/<tipo>/<hash dos parâmetros>/<z>/<x>/<y>.png"""
+        version, fractal_type, z, x, y = key[:5]
+        params = hashlib.sha1(repr(key[5:]).encode()).hexdigest()[:12]
+        return os.path.join(self.cache_dir, f'v{version}', fractal_type, params,
+                            str(z), str(x), f'{y}.png')
+
+    def _read_disk(self, key):
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._disk_path(key), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _write_disk(self, key, data):
+        """Grava via arquivo temporário: leitores nunca veem um PNG pela metade"""
+        if not self.cache_dir:
+            return
+        path = self._disk_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def get_tile(self, key, job):
+        """PNG do tile: memória, disco ou render (coalescido). Retorna (bytes, origem)"""
+        data = self.memory.get(key)
+        if data is not None:
+            self.stats.count('memory_hits')
+            return data, 'memory'
+        data = self._read_disk(key)
+        if data is not None:
+            self.stats.count('disk_hits')
+            self.memory.put(key, data)
+            return data, 'disk'
+
+        with self._lock:
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = self._in_flight[key] = self.pool.submit(render_tile, job)
+        if not owner:
+            self.stats.count('coalesced')
+            return future.result(), 'coalesced'
+
+        try:
+            data = future.result()
+            self.memory.put(key, data)
+            self._write_disk(key, data)
+            self.stats.count('rendered')
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+        return data, 'rendered'
+
+    def close(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _parse_tile_request(path, query):
+    """(chave, job) do pedido, ou None se o tile não existir"""
+    match = TILE_PATH.match(path)
+    if match is None:
+        return None
+    fractal_type = match.group(1)
+    z, x, y = (int(v) for v in match.groups()[1:])
+    if fractal_type not in FRACTAL_KINDS or z > MAX_LEVEL or x >= 2 ** z or y >= 2 ** z:
+        return None
+
+    params = parse_qs(query)
+    color_scheme = int(params.get('scheme', ['0'])[0]) % 5
+    julia_c = DEFAULT_JULIA_C
+    if 'c' in params:
+        re_c, im_c = params['c'][0].split(',')
+        julia_c = (float(re_c), float(im_c))
+    max_iter = int(params['iter'][0]) if 'iter' in params else None
+    antialias = params.get('aa', ['0'])[0] not in ('0', '', 'false')
+
+    job = tile_job(fractal_type, z, x, y, color_scheme, julia_c, max_iter, antialias)
+    key = TileServer.tile_key(fractal_type, z, x, y, color_scheme, julia_c, job['max_iter'],
+                              antialias)
+    return key, job
+
+
+class TileRequestHandler(BaseHTTPRequestHandler):
+    """/{tipo}/{z}/{x}/{y}.png, /stats (JSON) e / (visualizador)"""
+
+    server_version = 'FractalTiles/1'
+    tiles = None  # TileServer, definido por serve()
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path == '/stats':
+            stats = self.tiles.stats.snapshot()
+            stats['memory_cache'] = self.tiles.memory.stats()
+            return self._send(200, 'application/json', json.dumps(stats, indent=2).encode())
+        if url.path in ('/', '/index.html'):
+            with open(VIEWER_PATH, 'rb') as f:
+                return self._send(200, 'text/html; charset=utf-8', f.read())
+
+        start = time.perf_counter()
+        try:
+            request = _parse_tile_request(url.path, url.query)
+        except ValueError:
+            request = None
+        if request is None:
+            return self._send(404, 'text/plain', b'tile inexistente\n')
+        key, job = request
+        self.tiles.stats.count('requests')
+
+        etag = self.tiles.etag(key)
+        if etag in self.headers.get('If-None-Match', ''):
+            self.tiles.stats.count('not_modified')
+            self.tiles.stats.record(time.perf_counter() - start)
+            return self._send(304, None, b'', etag)
+        try:
+            data, source = self.tiles.get_tile(key, job)
+        except Exception as e:
+            self.tiles.stats.count('errors')
+            return self._send(500, 'text/plain', f'erro no render: {e}\n'.encode())
+        self.tiles.stats.record(time.perf_counter() - start, rendered=source == 'rendered')
+        self._send(200, 'image/png', data, etag, source)
+
+    def _send(self, status, content_type, body, etag=None, source=None):
+        self.send_response(status)
+        if content_type:
+            self.send_header('Content-Type', content_type)
+        if etag:
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', CACHE_CONTROL)
+        if source:
+            self.send_header('X-Tile-Source', source)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Um log por tile afogaria o terminal; use /stats
+
+
+def serve(host='127.0.0.1', port=8000, **options):
+    """Sobe o servidor até Ctrl+C"""
+    tiles = TileServer(**options)
+    handler = type('Handler', (TileRequestHandler,), {'tiles': tiles})
+    httpd = ThreadingHTTPServer((host, port), handler)
+    httpd.daemon_threads = True
+    print(f"🗺️ Tiles em http://{host}:{port}/ (estatísticas em /stats)", file=sys.stderr)
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Finalizando servidor de tiles...", file=sys.stderr)
+    finally:
+        httpd.server_close()
+        tiles.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servidor local de tiles XYZ dos fractais")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--cache-dir', default='tiles',
+                        help="cache de tiles em disco ('' desliga)")
+    parser.add_argument('--memory-mb', type=int, default=64, help="orçamento do cache em memória")
+    parser.add_argument('-j', '--workers', type=int, default=None, help="processos de render")
+    parser.add_argument('--numba-threads', type=int, default=1,
+                        help="threads do numba por processo")
+    args = parser.parse_args(argv)
+    serve(args.host, args.port, cache_dir=args.cache_dir,
+          memory_bytes=args.memory_mb * 1024**2, workers=args.workers,
+          numba_threads=args.numba_threads)
+
+
+if __name__ == "__main__":
+    main()